@@ -41,24 +41,69 @@ import sys
 if sys.version_info < (3, 0):
     raise RuntimeError("This library requires python 3")
 
-# Just import the basic user API
-from .api import (get_basis, lookup_basis_by_role, get_metadata, get_reference_data, get_all_basis_names,
-                  get_references, get_basis_family, filter_basis_sets, get_families, get_family_notes, get_basis_notes,
-                  has_basis_notes, has_family_notes, get_roles, get_formats, version, get_data_dir)
+# The user API is exported here, but the modules implementing it are only
+# imported when first used. This keeps "import basis_set_exchange" (and
+# therefore the bse command line) fast, since many of these modules pull in
+# large dependencies (jsonschema, numpy) or many format modules.
+_lazy_attributes = {
+    'api': ['get_basis', 'get_aux_bases', 'lookup_basis_by_role', 'get_metadata', 'get_reference_data', 'get_all_basis_names',
+            'get_references', 'get_basis_family', 'filter_basis_sets', 'get_families', 'get_family_notes',
+            'get_basis_notes', 'has_basis_notes', 'has_family_notes', 'get_roles', 'get_formats', 'get_data_dir'],
+    'readers': ['read_formatted_basis_file', 'read_formatted_basis_str', 'get_reader_formats'],
+    'writers': ['write_formatted_basis_file', 'write_formatted_basis_str', 'get_writer_formats'],
+    'convert': ['convert_formatted_basis_file', 'convert_formatted_basis_str'],
+    'refconverters': ['get_reference_formats'],
+    'validator': ['validate_file', 'validate_data'],
+    'bundle': ['create_bundle', 'get_archive_types'],
+}
 
-from .readers import read_formatted_basis_file, read_formatted_basis_str, get_reader_formats
-from .writers import write_formatted_basis_file, write_formatted_basis_str, get_writer_formats
-from .convert import convert_formatted_basis_file, convert_formatted_basis_str
-from .refconverters import get_reference_formats
-from .validator import validate_file, validate_data
+# Maps attribute name -> name of the module it comes from
+_lazy_attribute_map = {attr: mod for mod, attrs in _lazy_attributes.items() for attr in attrs}
 
-from .bundle import create_bundle, get_archive_types
+# All submodules that may be accessed as attributes (ie, basis_set_exchange.manip)
+_submodules = {
+    'api', 'auxgen', 'bundle', 'compose', 'convert', 'curate', 'fileio', 'ints', 'lut', 'manip', 'memo', 'misc',
+    'notes', 'printing', 'readers', 'references', 'refconverters', 'skel', 'sort', 'transform', 'validator',
+    'writers'
+}
+
+__all__ = sorted(_lazy_attribute_map) + ['get_version', 'version']
+
+
+def __getattr__(name):
+    import importlib
+
+    if name in _lazy_attribute_map:
+        module = importlib.import_module('.' + _lazy_attribute_map[name], __name__)
+        value = getattr(module, name)
+    elif name in _submodules:
+        value = importlib.import_module('.' + name, __name__)
+    elif name == '__version__':
+        value = get_version()
+    else:
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+    # Store it so that __getattr__ is not called again
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attribute_map) | _submodules | {'__version__'})
+
+
+_version_str = None
 
-from importlib.metadata import version as _version
-__version__ = _version("basis_set_exchange")
 
 def get_version():
-    return __version__
+    global _version_str
+
+    if _version_str is None:
+        from importlib.metadata import version as _version
+        _version_str = _version("basis_set_exchange")
+
+    return _version_str
+
 
 def version():
-    return __version__
\ No newline at end of file
+    return get_version()
@@ -49,6 +49,8 @@ from . import notes
 from . import refconverters
 from . import references
 from . import sort
+from . import tracing
+from . import transform
 from . import misc
 from . import lut
 
@@ -86,6 +88,29 @@ def _get_basis_metadata(name, data_dir):
     return metadata[tr_name]
 
 
+def _get_basis_version(name, version, data_dir):
+    '''Get metadata for a single basis set, and the version to use
+
+    If version is None, the latest version is used. If the basis or
+    the version doesn't exist, an exception is raised.
+
+    Returns the metadata and the version (as a string)
+    '''
+
+    bs_data = _get_basis_metadata(name, data_dir)
+
+    # If version is not specified, use the latest
+    if version is None:
+        version = bs_data['latest_version']
+    else:
+        version = str(version)  # Version may be an int
+
+    if version not in bs_data['versions']:
+        raise KeyError("Version {} does not exist for basis {}".format(version, name))
+
+    return bs_data, version
+
+
 def _header_string(basis_dict):
     '''Creates a header with information about a basis set
 
@@ -113,7 +138,8 @@ def _header_string(basis_dict):
 # order matching the legacy integer aliases: ``0`` -> ``None`` (orbital
 # basis), then 1..5 index into this tuple.  The ``cholesky-*`` entries pass
 # the suffix straight through to :func:`auxgen.cholesky_aux_basis` and
-# require the optional ``auxgen`` runtime stack (numpy + wignernj/sympy).
+# require numpy (plus wignernj or sympy for Gaunt coefficients beyond the
+# precomputed table store, ie l > auxgen.gaunt.store_lmax).
 _GET_AUX_MODES = (
     'autoaux',             # Stoychev/Auer/Neese 2017
     'autoabs',             # Auto-ABS Coulomb-fitting
@@ -257,8 +283,10 @@ def get_basis(name,
         ``1`` (autoaux), ``2`` (autoabs), ``3`` (cholesky-small), ``4``
         (cholesky-large), ``5`` (cholesky-verylarge) are also accepted.
 
-        The Cholesky modes require ``numpy`` at runtime, plus either
-        ``wignernj`` (preferred) or ``sympy`` for the Gaunt evaluator.
+        The Cholesky modes require ``numpy`` at runtime. ``wignernj``
+        (preferred) or ``sympy`` is only needed for Gaunt coefficients
+        beyond the precomputed table store (``l`` above
+        ``auxgen.gaunt.store_lmax``, 7 by default).
     data_dir : str
         Data directory with all the basis set information. By default,
         it is in the 'data' subdirectory of this project.
@@ -271,21 +299,25 @@ def get_basis(name,
 
     '''
 
-    data_dir = fix_data_dir(data_dir)
-    bs_data = _get_basis_metadata(name, data_dir)
+    with tracing.stage('get_basis', basis=name, fmt=fmt):
+        return _get_basis(name, elements, version, fmt, uncontract_general, uncontract_spdf, uncontract_segmented,
+                          remove_free_primitives, make_general, optimize_general, augment_diffuse, augment_steep,
+                          get_aux, data_dir, header)
 
-    # If version is not specified, use the latest
-    if version is None:
-        version = bs_data['latest_version']
-    else:
-        version = str(version)  # Version may be an int
 
-    if version not in bs_data['versions']:
-        raise KeyError("Version {} does not exist for basis {}".format(version, name))
+def _get_basis(name, elements, version, fmt, uncontract_general, uncontract_spdf, uncontract_segmented,
+               remove_free_primitives, make_general, optimize_general, augment_diffuse, augment_steep, get_aux,
+               data_dir, header):
+    '''Implementation of :func:`get_basis`, run within its tracing stage'''
+
+    data_dir = fix_data_dir(data_dir)
+    with tracing.stage('metadata'):
+        bs_data, version = _get_basis_version(name, version, data_dir)
 
     # Compose the entire basis set (all elements)
     file_relpath = bs_data['versions'][version]['file_relpath']
-    basis_dict = compose.compose_table_basis(file_relpath, data_dir)
+    with tracing.stage('compose_table_basis'):
+        basis_dict = compose.compose_table_basis(file_relpath, data_dir)
 
     # Set the name (from the global metadata)
     # Only the list of all names will be returned from compose_table_basis
@@ -318,78 +350,131 @@ def get_basis(name,
     # Note that from now on, the pipleline is going to modify basis_dict. That is ok,
     # since we are returned a unique instance from compose_table_basis
 
-    needs_pruning = False
-
-    if remove_free_primitives:
-        basis_dict = manip.remove_free_primitives(basis_dict, False)
-        needs_pruning = True
+    # The requested manipulations, and the ones needed by the output format,
+    # are collected into a plan that is applied in a single pass. The format
+    # manipulations must be done last, so they can only be part of the same
+    # pass if no augmentation or auxiliary basis is requested.
+    plan = transform.create_plan(remove_free_primitives=remove_free_primitives,
+                                 optimize_general=optimize_general,
+                                 uncontract_general=uncontract_general,
+                                 uncontract_spdf=uncontract_spdf,
+                                 uncontract_segmented=uncontract_segmented,
+                                 make_general=make_general)
+    writer_plan = writers.get_writer_plan(fmt) if fmt is not None else []
 
-    if optimize_general:
-        basis_dict = manip.optimize_general(basis_dict, False)
-        needs_pruning = True
-
-    # uncontract_segmented implies uncontract_general
-    if uncontract_segmented:
-        basis_dict = manip.uncontract_segmented(basis_dict, False)
-        needs_pruning = True
-
-    elif uncontract_general:
-        basis_dict = manip.uncontract_general(basis_dict, False)
-        needs_pruning = True
-
-    if uncontract_spdf:
-        basis_dict = manip.uncontract_spdf(basis_dict, 0, False)
-        needs_pruning = True
-
-    if make_general:
-        basis_dict = manip.make_general(basis_dict, False, False)
-        needs_pruning = True
+    aux_mode = _normalize_get_aux(get_aux)
+    if augment_diffuse <= 0 and augment_steep <= 0 and aux_mode is None:
+        plan += writer_plan
+        writer_plan = []
 
-    # Remove dead and duplicate shells
-    if needs_pruning:
-        basis_dict = manip.prune_basis(basis_dict, False)
+    if plan:
+        with tracing.stage('transform'):
+            basis_dict = transform.apply_plan(basis_dict, plan, use_copy=False)
 
     # Augment
     if augment_diffuse > 0:
-        basis_dict = manip.geometric_augmentation(basis_dict,
-                                                  augment_diffuse,
-                                                  use_copy=False,
-                                                  as_component=False,
-                                                  steep=False)
+        with tracing.stage('augment_diffuse'):
+            basis_dict = manip.geometric_augmentation(basis_dict,
+                                                      augment_diffuse,
+                                                      use_copy=False,
+                                                      as_component=False,
+                                                      steep=False)
     if augment_steep > 0:
-        basis_dict = manip.geometric_augmentation(basis_dict,
-                                                  augment_steep,
-                                                  use_copy=False,
-                                                  as_component=False,
-                                                  steep=True)
+        with tracing.stage('augment_steep'):
+            basis_dict = manip.geometric_augmentation(basis_dict,
+                                                      augment_steep,
+                                                      use_copy=False,
+                                                      as_component=False,
+                                                      steep=True)
         # Need to sort to get added steep functions first
-        basis_dict = sort.sort_basis(basis_dict)
+        with tracing.stage('sort'):
+            basis_dict = sort.sort_basis(basis_dict)
     # Re-make general
     if (augment_diffuse > 0 or augment_steep > 0) and make_general:
-        basis_dict = manip.make_general(basis_dict, False, False)
+        with tracing.stage('make_general'):
+            basis_dict = manip.make_general(basis_dict, False, False)
 
     # Did we actually want an auxiliary basis set?
-    aux_mode = _normalize_get_aux(get_aux)
-    if aux_mode == 'autoaux':
-        basis_dict = manip.autoaux_basis(basis_dict)
-    elif aux_mode == 'autoabs':
-        basis_dict = manip.autoabs_basis(basis_dict)
-    elif aux_mode is not None and aux_mode.startswith(_CHOLESKY_PREFIX):
-        # Lazy import: auxgen pulls in numpy (plus wignernj or sympy for
-        # the Gaunt evaluator) -- none are core runtime deps.
-        from .auxgen.auxgen import cholesky_aux_basis
-        basis_dict = cholesky_aux_basis(basis_dict, aux_mode[len(_CHOLESKY_PREFIX):])
+    if aux_mode is not None:
+        with tracing.stage('aux', mode=aux_mode):
+            if aux_mode == 'autoaux':
+                basis_dict = manip.autoaux_basis(basis_dict)
+            elif aux_mode == 'autoabs':
+                basis_dict = manip.autoabs_basis(basis_dict)
+            elif aux_mode.startswith(_CHOLESKY_PREFIX):
+                # Lazy import: auxgen pulls in numpy (plus wignernj or sympy for
+                # Gaunt coefficients beyond the table store) -- none are core
+                # runtime deps.
+                from .auxgen.auxgen import cholesky_aux_basis
+                basis_dict = cholesky_aux_basis(basis_dict, aux_mode[len(_CHOLESKY_PREFIX):])
 
     # If fmt is not specified, return as a python dict
     if fmt is None:
         return basis_dict
 
     if header:
-        header_str = _header_string(basis_dict)
+        with tracing.stage('header'):
+            header_str = _header_string(basis_dict)
     else:
         header_str = None
 
-    return writers.write_formatted_basis_str(basis_dict, fmt, header_str)
+    if writer_plan:
+        with tracing.stage('transform'):
+            basis_dict = transform.apply_plan(basis_dict, writer_plan, use_copy=False)
+    with tracing.stage('write') as record:
+        basis_str = writers.write_formatted_basis_str(basis_dict, fmt, header_str, normalized=True)
+        if record is not None:
+            record['chars'] = len(basis_str)
+    return basis_str
+
+
+def get_aux_bases(names=None, family=None, get_aux='autoaux', elements=None, data_dir=None, nprocs=None):
+    '''Generate automatic auxiliary basis sets for many orbital basis sets at once
+
+    The orbital basis sets are given by name, or all the orbital basis sets
+    of a family are used. The auxiliary basis sets for all the elements of all the
+    basis sets are generated in parallel. The result for each basis set is the same as
+    from :func:`get_basis` with the same `get_aux`.
+
+    Parameters
+    ----------
+    names : list of str
+        Names of the orbital basis sets
+    family : str
+        Use all the orbital basis sets of this family (instead of `names`)
+    get_aux : str
+        Type of auxiliary basis set to generate ('autoaux' or 'autoabs')
+    elements : str or list
+        List of elements to get the auxiliary basis sets for (see :func:`get_basis`).
+        If a family is given, only basis sets that contain all these elements are used.
+    data_dir : str
+        Data directory with all the basis set information. By default,
+        it is in the 'data' subdirectory of this project.
+    nprocs : int
+        Number of worker processes to use. If None, the number of CPUs is used.
+
+    Returns
+    -------
+    dict
+        Auxiliary basis set dictionaries, keyed by the name of the orbital basis set
+        (its display name if `family` is given)
+    '''
+
+    if (names is None) == (family is None):
+        raise RuntimeError("Exactly one of names or family must be given")
+
+    aux_mode = _normalize_get_aux(get_aux)
+    if aux_mode not in ('autoaux', 'autoabs'):
+        raise ValueError("get_aux must be 'autoaux' or 'autoabs' for get_aux_bases; got {}".format(get_aux))
+
+    data_dir = fix_data_dir(data_dir)
+    if family is not None:
+        metadata = filter_basis_sets(family=family, role='orbital', elements=elements, data_dir=data_dir)
+        names = sorted(v['display_name'] for v in metadata.values())
+
+    orbital_bases = [get_basis(name, elements=elements, data_dir=data_dir) for name in names]
+    aux_bases = manip.auto_aux_bases(orbital_bases, aux_mode, nprocs=nprocs)
+    return dict(zip(names, aux_bases))
 
 
 def lookup_basis_by_role(primary_basis, role, data_dir=None):
@@ -539,16 +624,101 @@ def get_references(basis_name, elements=None, version=None, fmt=None, data_dir=N
         dictionary. Otherwise, it will be a string.
     '''
 
+    with tracing.stage('get_references', basis=basis_name, fmt=fmt):
+        return _get_references(basis_name, elements, version, fmt, data_dir)
+
+
+def _get_references(basis_name, elements, version, fmt, data_dir):
+    '''Implementation of :func:`get_references`, run within its tracing stage'''
+
     data_dir = fix_data_dir(data_dir)
-    basis_dict = get_basis(basis_name, elements=elements, version=version, data_dir=data_dir)
+    with tracing.stage('metadata'):
+        bs_data, version = _get_basis_version(basis_name, version, data_dir)
+    ver_data = bs_data['versions'][version]
 
-    all_ref_data = get_reference_data(data_dir)
-    ref_data = references.compact_references(basis_dict, all_ref_data)
+    # Handle the element list in the same way as get_basis
+    if elements is not None:
+        elements = misc.expand_elements(elements, True)
+
+    if elements:
+        for el in elements:
+            if el not in ver_data['elements']:
+                elsym = lut.element_sym_from_Z(el)
+                raise KeyError("Element {} (Z={}) not found in basis {} version {}".format(
+                    elsym, el, basis_name, version))
+        elements = tuple(sorted(set(elements), key=int))
+    else:
+        elements = None
+
+    with tracing.stage('compose_table_references'):
+        ref_data = _compact_table_references(ver_data['file_relpath'], elements, data_dir)
 
     if fmt is None:
         return ref_data
 
-    return refconverters.convert_references(ref_data, fmt)
+    with tracing.stage('convert_references'):
+        _load_rendered_references(data_dir)
+        return refconverters.convert_references(ref_data, fmt)
+
+
+# Data directories whose precomputed rendered references have been looked for
+_rendered_references_loaded = set()
+
+
+def _load_rendered_references(data_dir):
+    '''Use precomputed rendered references from a data directory, if available
+
+    The RENDERED_REFERENCES.json file is optional
+    (see :func:`basis_set_exchange.curate.create_rendered_references_file`).
+    It is only used if it was created with the same version of the library,
+    and only once per data directory.
+    '''
+
+    if data_dir in _rendered_references_loaded:
+        return
+    _rendered_references_loaded.add(data_dir)
+
+    rendered_path = os.path.join(data_dir, 'RENDERED_REFERENCES.json')
+    if not os.path.isfile(rendered_path):
+        return
+
+    rendered = fileio.read_rendered_references(rendered_path)
+    if rendered.get('library_version') != version():
+        return
+
+    refconverters.load_rendered_references(rendered['formats'], get_reference_data(data_dir))
+
+
+@memo.BSEMemoize
+def _table_reference_groups(file_relpath, data_dir):
+    '''Obtain the elements of a table basis, grouped by their references
+
+    Only the reference information is read (see :func:`compose.compose_table_references`),
+    rather than composing the entire basis set. See :func:`references.group_references`
+    for the returned data.
+    '''
+
+    element_refs = compose.compose_table_references(file_relpath, data_dir)
+    sorted_el = sorted(element_refs.items(), key=lambda x: int(x[0]))
+    return references.group_references(sorted_el)
+
+
+@memo.BSEMemoize
+def _compact_table_references(file_relpath, elements, data_dir):
+    '''Obtain the compacted references of a table basis
+
+    The result is cached for each table file and set of elements. Subsets of
+    elements are handled by filtering the grouping of all the elements of the basis.
+
+    If elements is None, all elements of the basis are included. Otherwise, it must
+    be a tuple of elements (Z numbers as str) that exist in the basis.
+    '''
+
+    groups = _table_reference_groups(file_relpath, data_dir)
+    if elements is not None:
+        groups = references.filter_reference_groups(groups, elements)
+
+    return references.expand_reference_groups(groups, get_reference_data(data_dir))
 
 
 def get_basis_family(basis_name, data_dir=None):
@@ -40,12 +40,13 @@ provided -- the STO variant lives in
 :mod:`basis_set_exchange.auxgen.sto`.
 
 The implementation is single-center / per-element.  Radial integrals
-use closed forms in pure Python; the only optional dependency outside
-``numpy`` is the real-spherical Gaunt evaluator in
-:mod:`basis_set_exchange.auxgen.gaunt`, which prefers ``wignernj``
-(exact integer arithmetic) but falls back to ``sympy.physics.wigner``
-when ``wignernj`` is unavailable.  Both are lazy-imported on first
-call.  ``numpy`` is required everywhere in the subpackage; none of
+use closed forms in pure Python.  Gaunt tables up to
+``gaunt.store_lmax`` come from a precomputed store (see
+:mod:`basis_set_exchange.auxgen.gaunt`), which is built with ``wignernj``
+when available and by quadrature otherwise.  Only larger ``l`` need the
+real-spherical Gaunt evaluator, which prefers ``wignernj`` (exact integer
+arithmetic) but falls back to ``sympy.physics.wigner`` when ``wignernj``
+is unavailable.  Both are lazy-imported on first call.  ``numpy`` is required everywhere in the subpackage; none of
 these are runtime dependencies of the base ``basis_set_exchange``
 package.
 """
@@ -61,9 +61,13 @@ Sect. 2.1).  The pruning step (``prune_lmax``) drops shells above an
 eq 9).
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
 from .. import skel, lut, compose
+from . import cache, profiling, twoel
 from .pivchol import pivoted_cholesky
 from .products import (
     decontract_primitives,
@@ -92,16 +96,19 @@ def _sort_by_offdiag_norm(S):
     return list(np.argsort(norms))
 
 
-def _pivot_with_order(S, order, tol):
+def _pivot_with_order(S, order, tol, max_rank=None):
     """Apply a specific permutation to S, run pivoted Cholesky, and
     translate the pivots back to the original indices.
+
+    With ``max_rank``, the decomposition is stopped after that many
+    pivots (see :func:`~basis_set_exchange.auxgen.pivchol.pivoted_cholesky`).
     """
     Sp = S[np.ix_(order, order)]
-    pivots, _ = pivoted_cholesky(Sp, tol=tol)
+    pivots, _ = pivoted_cholesky(Sp, tol=tol, max_rank=max_rank)
     return [order[p] for p in pivots]
 
 
-def _most_compact_pivot(S, tol, n_random=100, seed=0):
+def _most_compact_pivot(S, tol, n_random=100, seed=0, nthreads=None):
     """Run pivoted Cholesky on S under several orderings and return the
     most compact pivot list, matching ERKALE's
     ``cholesky_pick_exponents`` (Lehtola, J. Chem. Theory Comput. 17,
@@ -118,11 +125,18 @@ def _most_compact_pivot(S, tol, n_random=100, seed=0):
       3. **Random shuffles** -- ``n_random`` independent permutations
          (paper Note Added in Proof).
 
-    The smallest pivot set across all orderings is returned.  The
+    The smallest pivot set across all orderings is returned (the first
+    one, in the order above, if several are equally small).  The
     candidate metric has unit diagonal so the first-pivot choice is
     degenerate; different orderings update the residuals differently
     and yield different rank-revealing sequences.
 
+    The orderings after the linear one are evaluated in waves of
+    ``nthreads`` in a thread pool.  Each decomposition is cut off (via
+    ``max_rank``) as soon as it has more pivots than the best set found
+    in the previous waves, so it cannot win.  The result does not
+    depend on ``nthreads``.
+
     Parameters
     ----------
     S : numpy.ndarray
@@ -134,6 +148,9 @@ def _most_compact_pivot(S, tol, n_random=100, seed=0):
         the linear ordering and the off-diagonal-norm presort.
     seed : int
         Seed for the random shuffles, for reproducibility.
+    nthreads : int, optional
+        Number of orderings to evaluate concurrently.  Defaults to the
+        number of CPUs.
 
     Returns
     -------
@@ -155,18 +172,37 @@ def _most_compact_pivot(S, tol, n_random=100, seed=0):
         rng.shuffle(perm)
         orders.append(perm)
 
-    best = None
-    best_pivots = None
-    for order in orders:
-        pivots = _pivot_with_order(S, order, tol)
-        k = len(pivots)
-        if best is None or k < best:
-            best = k
-            best_pivots = pivots
-            if best == 0:
-                break
+    # The linear ordering gives the first bound
+    best_pivots = _pivot_with_order(S, orders[0], tol)
+
+    if nthreads is None:
+        nthreads = os.cpu_count() or 1
+    nthreads = max(1, min(nthreads, len(orders) - 1))
+
+    executor = ThreadPoolExecutor(max_workers=nthreads) if nthreads > 1 else None
+    try:
+        start = 1
+        while start < len(orders) and best_pivots:
+            wave = orders[start:start + nthreads]
+            start += len(wave)
+
+            # One pivot more than the best is enough to know that an
+            # ordering is worse; a run that stops earlier is exact.
+            max_rank = len(best_pivots) + 1
+            if executor is None:
+                results = [_pivot_with_order(S, order, tol, max_rank) for order in wave]
+            else:
+                results = executor.map(lambda order: _pivot_with_order(S, order, tol, max_rank), wave)
+
+            # Keep the first of the smallest, in the order of the orderings
+            for pivots in results:
+                if len(pivots) < len(best_pivots):
+                    best_pivots = pivots
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
-    return best_pivots if best_pivots is not None else []
+    return best_pivots
 
 
 # ---------------------------------------------------------------------------
@@ -183,10 +219,21 @@ def _reduced_pair_screen(primitives, threshold):
     shell_pairs = orbital_shell_pairs(primitives)
     if not shell_pairs:
         return []
-    keep = coupled_shell_pair_screen(shell_pairs, threshold)
+    with profiling.stage('screen', size=len(shell_pairs)) as record:
+        keep = coupled_shell_pair_screen(shell_pairs, threshold)
+        if record is not None:
+            record['pivots'] = len(keep)
     return [shell_pairs[i] for i in keep]
 
 
+def _candidate_pool(primitives, scheme, threshold, mapping):
+    """Per-L candidate pool of the ``'basic'`` or ``'reduced'`` scheme"""
+    if scheme == 'reduced':
+        sel = _reduced_pair_screen(primitives, threshold)
+        return candidate_pool_from_shell_pairs(sel, mapping=mapping)
+    return candidate_pool_from_primitives(primitives, mapping=mapping)
+
+
 # ---------------------------------------------------------------------------
 # Basis dict assembly
 # ---------------------------------------------------------------------------
@@ -241,20 +288,31 @@ def _select_per_L(pool, threshold, n_random=100, seed=0):
     ``n_random = 0`` reproduces the paper's published algorithm.
 
     Returns ``{L: [alpha_eff, ...]}`` containing only the selected
-    candidates, sorted decreasing.
+    candidates, sorted decreasing.  The selection of each L block is
+    reused from the intermediate cache (:mod:`.cache`) when the same
+    candidates were decomposed before.
     """
     out = {}
     for L, alphas in pool.items():
         if not alphas:
             continue
-        S = normalized_metric(L, alphas)
-        sel = _most_compact_pivot(S, tol=threshold, n_random=n_random,
-                                  seed=seed + 1000 * L)
-        if sel:
-            out[L] = sorted((alphas[i] for i in sel), reverse=True)
+        with profiling.stage('select', L=L, size=len(alphas), n_random=n_random) as record:
+            selected = cache.cached('select', (L, alphas, threshold, n_random, seed + 1000 * L),
+                                    lambda: _select_L(L, alphas, threshold, n_random, seed + 1000 * L))
+            if record is not None:
+                record['pivots'] = len(selected)
+        if selected:
+            out[L] = selected
     return out
 
 
+def _select_L(L, alphas, threshold, n_random, seed):
+    """Selected candidates of a single L block (see :func:`_select_per_L`)"""
+    S = normalized_metric(L, alphas)
+    sel = _most_compact_pivot(S, tol=threshold, n_random=n_random, seed=seed)
+    return sorted((alphas[i] for i in sel), reverse=True)
+
+
 # Standard accuracy presets of Lehtola, J. Chem. Theory Comput. 19, 6242
 # (2023) [https://doi.org/10.1021/acs.jctc.3c00670]: the (epsilon, l_inc)
 # pairs defining the verylarge, large, and small auxiliary basis sets.
@@ -342,6 +400,13 @@ def generate_auxiliary_basis_for_element(element_basis,
     -------
     dict
         ``{'electron_shells': [...]}`` (no element-level metadata).
+
+    Notes
+    -----
+    The candidate pool, the per-L selections and the per-L contractions
+    are kept in a content-addressed cache (:mod:`basis_set_exchange.auxgen.cache`)
+    keyed by the exact primitives and parameters, so elements sharing
+    primitive sets between basis sets are not recomputed.
     """
     if size is not None:
         if size not in _SIZE_PRESETS:
@@ -359,13 +424,17 @@ def generate_auxiliary_basis_for_element(element_basis,
     if not primitives:
         return {'electron_shells': []}
 
-    if scheme == 'reduced':
-        sel = _reduced_pair_screen(primitives, threshold)
-        pool = candidate_pool_from_shell_pairs(sel, mapping=mapping)
-    elif scheme == 'basic':
-        pool = candidate_pool_from_primitives(primitives, mapping=mapping)
-    else:
+    if scheme not in ('basic', 'reduced'):
         raise ValueError("scheme must be 'basic' or 'reduced'")
+    pool_key = (scheme, primitives, threshold, mapping)
+    if scheme == 'reduced':
+        # The pre-screen neglects metric entries below the screening tolerance
+        pool_key += (twoel.metric_screen_tol,)
+    with profiling.stage('pool', primitives=len(primitives)) as record:
+        pool = cache.cached('pool', pool_key,
+                            lambda: _candidate_pool(primitives, scheme, threshold, mapping))
+        if record is not None:
+            record['size'] = sum(len(alphas) for alphas in pool.values())
 
     per_L_alphas = _select_per_L(pool, threshold, n_random=n_random, seed=seed)
 
@@ -383,8 +452,15 @@ def generate_auxiliary_basis_for_element(element_basis,
         from .contract import contract_aux, orbital_aos
         # The contraction fits products of the contracted orbital basis
         # functions, not the decontracted primitives used for selection.
-        contractions = contract_aux(orbital_aos(element_basis), per_L_alphas,
-                                    contract_threshold=contract_threshold)
+        aos = orbital_aos(element_basis)
+        contractions = {}
+        for L, alphas in per_L_alphas.items():
+            with profiling.stage('contract', L=L, size=len(alphas), aos=len(aos)) as record:
+                contractions.update(cache.cached(
+                    'contract', (aos, L, alphas, contract_threshold),
+                    lambda: contract_aux(aos, {L: alphas}, contract_threshold=contract_threshold)))
+                if record is not None:
+                    record['contractions'] = len(contractions[L][1])
         shells = _contracted_shells(contractions)
     else:
         shells = _primitive_shells(per_L_alphas)
@@ -404,6 +480,19 @@ def _default_lmax_occ(z):
     return 3
 
 
+def _shells_key(element_basis):
+    """The parts of an element's electron shells that the generated
+    auxiliary basis depends on"""
+    return [(sh.get('function_type', 'gto'), sh['angular_momentum'], sh['exponents'], sh['coefficients'])
+            for sh in element_basis.get('electron_shells', [])]
+
+
+def _settings_key():
+    """The module-level settings that the generated auxiliary basis
+    depends on, besides the arguments"""
+    return {'metric_screen_tol': twoel.metric_screen_tol}
+
+
 def generate_auxiliary_basis(orbital_basis,
                              elements=None,
                              threshold=1.0e-7,
@@ -422,7 +511,8 @@ def generate_auxiliary_basis(orbital_basis,
     """Generate an auxiliary basis (per element) from a BSE orbital basis.
 
     See :func:`generate_auxiliary_basis_for_element` for the meaning of
-    the algorithmic parameters.
+    the algorithmic parameters.  Per-stage timings and counters can be
+    collected by running it inside :func:`.profiling.profile`.
     """
     component = skel.create_skel('component')
     component['description'] = description or 'Auxiliary basis generated by basis_set_exchange.auxgen'
@@ -449,21 +539,28 @@ def generate_auxiliary_basis(orbital_basis,
         # A size preset forces prune_lmax on, so lmax_occ must be supplied
         # whenever a preset is selected as well.
         needs_lmax_occ = prune_lmax or size is not None
-        out = generate_auxiliary_basis_for_element(
-            eb,
-            threshold=threshold,
-            scheme=scheme,
-            n_random=n_random,
-            seed=seed,
-            mapping=mapping,
-            collapse_contractions=collapse_contractions,
-            size=size,
-            contract=contract,
-            contract_threshold=contract_threshold,
-            prune_lmax=prune_lmax,
-            linc=linc,
-            lmax_occ=_default_lmax_occ(z) if needs_lmax_occ else None,
-        )
+        params = dict(threshold=threshold,
+                      scheme=scheme,
+                      n_random=n_random,
+                      seed=seed,
+                      mapping=mapping,
+                      collapse_contractions=collapse_contractions,
+                      size=size,
+                      contract=contract,
+                      contract_threshold=contract_threshold,
+                      prune_lmax=prune_lmax,
+                      linc=linc,
+                      lmax_occ=_default_lmax_occ(z) if needs_lmax_occ else None)
+        with profiling.element(z), profiling.stage('element'):
+            if cache.result_cache_enabled:
+                # The result only depends on the shells, the parameters and
+                # the settings, so it is shared by all basis sets containing
+                # this element
+                out = cache.cached('element', (_shells_key(eb), params, _settings_key()),
+                                   lambda: generate_auxiliary_basis_for_element(eb, **params),
+                                   persistent=True)
+            else:
+                out = generate_auxiliary_basis_for_element(eb, **params)
         component['elements'][key] = out
 
     return component
@@ -0,0 +1,291 @@
+# Copyright (c) 2026 Susi Lehtola
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived
+# from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Content-addressed cache of the results of the auxiliary basis generation.
+
+Each stage of :func:`~basis_set_exchange.auxgen.auxgen.generate_auxiliary_basis_for_element`
+(candidate pool, per-L pivot selection, per-L contraction) is keyed by a
+hash of its exact inputs -- the primitive exponents, contraction
+weights and algorithm parameters -- rather than by basis set or element
+name.  Basis sets sharing primitive sets (for example a family and its
+augmented variants, or the same element in different requests) therefore
+reuse each other's work.
+
+Results are kept in memory (at most :data:`max_memory_entries` of them)
+and, if :data:`disk_cache_enabled` is set, also saved to and looked up
+in :func:`cache_dir`, so they can be shared between processes and runs.
+The complete per-element results of
+:func:`~basis_set_exchange.auxgen.auxgen.generate_auxiliary_basis` are
+always stored on disk (unless :data:`result_cache_enabled` is unset).
+The on-disk cache is limited to :data:`max_disk_bytes`; the least
+recently used entries are removed first.
+
+Keys include the library version and a hash of the source code of this
+package, so results are never reused across code changes.
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .. import misc
+from . import profiling
+
+# If set to False, intermediates are neither looked up nor stored
+cache_enabled = True
+
+# If set to True, intermediates are also stored on disk (in cache_dir())
+disk_cache_enabled = False
+
+# If set to False, whole per-element results are neither looked up nor
+# stored (the intermediates are still cached as configured above)
+result_cache_enabled = True
+
+# Maximum number of intermediates kept in memory (least recently used
+# are dropped first)
+max_memory_entries = 4096
+
+# Maximum total size (in bytes) of the on-disk cache. Once it is exceeded,
+# the least recently used entries are removed until it is down to three
+# quarters of this
+max_disk_bytes = 1024**3
+
+# Bumped whenever the stored results of a stage change meaning
+_cache_format = 1
+
+_lock = threading.Lock()
+_memory = OrderedDict()
+_stats = {}
+
+# Size of the on-disk cache as seen by this process, per cache directory
+_disk_usage = {}
+
+
+def cache_dir():
+    """Directory of the on-disk intermediate cache (``auxgen`` in
+    :func:`basis_set_exchange.misc.cache_dir`)."""
+    return os.path.join(misc.cache_dir(), 'auxgen')
+
+
+def _canonical(obj):
+    """Convert ``obj`` to nested tuples of plain values with a stable
+    pickle representation (arrays by dtype, shape and raw bytes)."""
+    if isinstance(obj, np.ndarray):
+        return ('ndarray', obj.dtype.str, obj.shape, np.ascontiguousarray(obj).tobytes())
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (list, tuple)):
+        return tuple(_canonical(x) for x in obj)
+    if isinstance(obj, dict):
+        return ('dict', tuple(sorted((_canonical(k), _canonical(v)) for k, v in obj.items())))
+    return obj
+
+
+@functools.lru_cache(maxsize=None)
+def _code_fingerprint():
+    """Hash of the source files of this package"""
+    h = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(here)):
+        if name.endswith('.py'):
+            with open(os.path.join(here, name), 'rb') as f:
+                h.update(name.encode() + b'\0' + f.read())
+    return h.hexdigest()
+
+
+def content_key(stage, *parts):
+    """Hash identifying the result of ``stage`` computed from ``parts``"""
+    from .. import get_version
+    data = pickle.dumps((_cache_format, get_version(), _code_fingerprint(), stage, _canonical(parts)),
+                        protocol=4)
+    return hashlib.sha256(data).hexdigest()
+
+
+def _count(stage, what):
+    counts = _stats.setdefault(stage, {'hits': 0, 'disk_hits': 0, 'misses': 0})
+    counts[what] += 1
+
+
+def _disk_path(key):
+    return os.path.join(cache_dir(), key[:2], key + '.pickle')
+
+
+def cached(stage, parts, compute, persistent=False):
+    """Return the result of ``compute()``, reusing a cached result for
+    the same ``stage`` and ``parts`` if there is one
+
+    Parameters
+    ----------
+    stage : str
+        Name of the pipeline stage (also used for the statistics)
+    parts : tuple
+        Everything the result depends on
+    compute : callable
+        Called without arguments to compute the result on a cache miss.
+        The result must be picklable.
+    persistent : bool
+        If True, the result is stored on disk even if
+        :data:`disk_cache_enabled` is not set
+    """
+    if not cache_enabled:
+        return compute()
+    use_disk = disk_cache_enabled or persistent
+
+    key = content_key(stage, *parts)
+    with _lock:
+        data = _memory.get(key)
+        if data is not None:
+            _memory.move_to_end(key)
+            _count(stage, 'hits')
+            profiling.cache_outcome('hit')
+            return pickle.loads(data)
+
+    if use_disk:
+        path = _disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            ret = pickle.loads(data)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+        else:
+            # The modification time orders the entries for eviction
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            with _lock:
+                _count(stage, 'disk_hits')
+                _store_memory(key, data)
+            profiling.cache_outcome('disk_hit')
+            return ret
+
+    ret = compute()
+    data = pickle.dumps(ret, protocol=4)
+    with _lock:
+        _count(stage, 'misses')
+        _store_memory(key, data)
+    profiling.cache_outcome('miss')
+
+    if use_disk:
+        path = _disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+        else:
+            _account_disk(len(data))
+
+    return ret
+
+
+def _store_memory(key, data):
+    _memory[key] = data
+    _memory.move_to_end(key)
+    while len(_memory) > max_memory_entries:
+        _memory.popitem(last=False)
+
+
+def _disk_entries(directory):
+    """``(mtime, size, path)`` of every entry of the on-disk cache in ``directory``"""
+    entries = []
+    for root, _dirs, files in os.walk(directory):
+        for name in files:
+            if not name.endswith('.pickle'):
+                continue
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+    return entries
+
+
+def _account_disk(nbytes):
+    """Record ``nbytes`` newly written to the on-disk cache, and evict the
+    least recently used entries if it is now larger than
+    :data:`max_disk_bytes`"""
+    directory = cache_dir()
+    with _lock:
+        if directory not in _disk_usage:
+            # The first scan already includes the new entry
+            _disk_usage[directory] = sum(e[1] for e in _disk_entries(directory))
+        else:
+            _disk_usage[directory] += nbytes
+        if _disk_usage[directory] <= max_disk_bytes:
+            return
+
+        entries = sorted(_disk_entries(directory))
+        total = sum(e[1] for e in entries)
+        target = 3 * max_disk_bytes // 4
+        for _mtime, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        _disk_usage[directory] = total
+
+
+def disk_usage():
+    """Total size (in bytes) of the on-disk cache"""
+    return sum(e[1] for e in _disk_entries(cache_dir()))
+
+
+def statistics():
+    """Hits (in memory and on disk) and misses per stage since the last
+    :func:`clear`, as ``{stage: {'hits': ..., 'disk_hits': ..., 'misses': ...}}``"""
+    with _lock:
+        return {stage: dict(counts) for stage, counts in _stats.items()}
+
+
+def clear(disk=False):
+    """Drop all in-memory intermediates and reset the statistics.  With
+    ``disk=True`` the on-disk cache is removed as well."""
+    with _lock:
+        _memory.clear()
+        _stats.clear()
+        _disk_usage.clear()
+    if disk:
+        import shutil
+        shutil.rmtree(cache_dir(), ignore_errors=True)
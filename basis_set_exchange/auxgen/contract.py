@@ -76,8 +76,8 @@ from math import pi
 from .. import ints
 from .gaunt import coupling_lvals, gaunt_table
 from .products import _split_sp
-from .radial import gto_norm_array
-from .twoel import _aux_radial_vector, primitive_aux_metric
+from .radial import gto_norm_array, radial_integral_batch
+from .twoel import primitive_aux_metric
 
 
 def orbital_aos(element_basis):
@@ -127,6 +127,24 @@ def orbital_aos(element_basis):
     return aos
 
 
+def _aos_by_l(aos):
+    """Group contracted AOs by angular momentum as coefficient matrices
+    ``{l: (exps, C)}`` over the distinct primitive exponents at that
+    ``l``, with ``C[mu, i]`` the weight of exponent ``exps[i]`` in AO
+    ``mu`` (zero where the AO does not contain it)."""
+    by_l = {}
+    for (l, exps, weights) in aos:
+        by_l.setdefault(l, []).append((exps, weights))
+    out = {}
+    for l, members in by_l.items():
+        all_exps = np.unique(np.concatenate([e for (e, _w) in members]))
+        C = np.zeros((len(members), all_exps.size), dtype=float)
+        for mu, (exps, weights) in enumerate(members):
+            np.add.at(C[mu], np.searchsorted(all_exps, exps), weights)
+        out[l] = (all_exps, C)
+    return out
+
+
 def _W_block(aos, L, alphas_P):
     """Build the m=0 subblock of W at angular momentum L,
 
@@ -144,36 +162,41 @@ def _W_block(aos, L, alphas_P):
 
     (``w`` already folds in the primitive norms), and the angular factor
     is the M = 0 Gaunt slice.
+
+    The AOs are batched per angular momentum pair ``(l_mu, l_nu)``: the
+    radial integrals over all primitive pairs and aux exponents are one
+    kernel call, the contraction to the AO pairs is two matrix products
+    giving the kernel matrix ``K[(mu, nu), P]``, and the block adds
+    ``gsq K^T K`` with ``gsq`` the summed squared Gaunt coefficients.
     """
     nP = len(alphas_P)
     if nP == 0:
         return np.zeros((0, 0), dtype=float)
     aP = np.asarray(alphas_P, dtype=float)
     NP = gto_norm_array(L, aP)
+    pref = (4.0 * pi / (2 * L + 1)) * NP
 
+    by_l = _aos_by_l(aos)
     W = np.zeros((nP, nP), dtype=float)
-    for (la, ea, wa) in aos:
-        for (lb, eb, wb) in aos:
+    for la, (ea, Ca) in by_l.items():
+        for lb, (eb, Cb) in by_l.items():
             if L not in coupling_lvals(la, lb):
                 continue
-            # The M = 0 Gaunt slice; the radial/aux factor kern_P is the
-            # same for every (ma, mb) cell, so the sum over (ma, mb) of the
-            # rank-1 updates g^2 (kern kern^T) collapses to a single update
-            # weighted by the sum of squared Gaunt coefficients.
+            # The M = 0 Gaunt slice; the radial/aux factor is the same for
+            # every (ma, mb) cell, so the sum over (ma, mb) of the rank-1
+            # updates collapses to a single update weighted by the sum of
+            # squared Gaunt coefficients.
             g_mab = gaunt_table(la, lb, L)[:, :, L]
             gsq = float(np.sum(g_mab * g_mab))
             if gsq == 0.0:
                 continue
 
-            # Contraction-weighted radial column over P.
-            n_ab = la + lb
-            rad = np.zeros(nP, dtype=float)
-            for ai, wi in zip(ea, wa):
-                for aj, wj in zip(eb, wb):
-                    rad += (wi * wj) * _aux_radial_vector(L, n_ab, ai + aj, aP)
-            kern_P = (4.0 * pi / (2 * L + 1)) * NP * rad
-
-            W += gsq * np.outer(kern_P, kern_P)
+            # R[i, j, P] over primitive pairs, contracted to K[mu, nu, P]
+            R = radial_integral_batch(L, la + lb, L, (ea[:, None] + eb[None, :])[:, :, None],
+                                      aP[None, None, :])
+            K = (Ca @ R.reshape(ea.size, -1)).reshape(-1, eb.size, nP)
+            K = np.matmul(Cb, K).reshape(-1, nP) * pref
+            W += gsq * (K.T @ K)
 
     return W
 
@@ -45,18 +45,35 @@ harmonic convention and produce identical numerical values.
 
 Selection rules: ``l1 + l2 + l3`` even, ``|l1 - l2| <= l3 <= l1 + l2``
 (and analogous permutations).  Results are cached.
+
+Tables with ``l1, l2 <= store_lmax`` are served from a precomputed store:
+one flat float64 array holding every :func:`gaunt_table` slab, saved as a
+``.npy`` file in :func:`store_dir` the first time it is needed and
+memory-mapped (no parsing) by later processes.  The store is assembled
+from ``wignernj`` when it is available; otherwise it is evaluated by
+vectorized Gauss-Legendre quadrature over the sphere (exact up to
+round-off), so startup no longer depends on either optional backend.
+:func:`build_store` can be used to generate the file ahead of time.
 """
 
+import os
+import math
 from functools import lru_cache
 
 import numpy as np
 
+from .. import misc
+
 try:
     import wignernj as _wignernj  # https://pypi.org/project/wignernj/
     _HAVE_WIGNERNJ = True
 except ImportError:
     _HAVE_WIGNERNJ = False
 
+#: Largest ``l1``, ``l2`` in the precomputed table store (``l3`` then runs
+#: up to ``2 * store_lmax``).  Set to -1 to disable the store.
+store_lmax = 7
+
 
 def _real_gaunt_wignernj(l1, m1, l2, m2, l3, m3):
     return _wignernj.gaunt_real(l1, m1, l2, m2, l3, m3)
@@ -67,23 +84,37 @@ def _real_gaunt_sympy(l1, m1, l2, m2, l3, m3):
     return float(_sym_real_gaunt(l1, l2, l3, m1, m2, m3))
 
 
-@lru_cache(maxsize=None)
-def real_gaunt(l1, m1, l2, m2, l3, m3):
-    """Real-spherical Gaunt coefficient as a float.
-
-    Returns 0.0 when selection rules are violated.  Cached.
-    """
+def _selection_rules_ok(l1, m1, l2, m2, l3, m3):
     if abs(m1) > l1 or abs(m2) > l2 or abs(m3) > l3:
-        return 0.0
+        return False
     if (l1 + l2 + l3) % 2 != 0:
-        return 0.0
+        return False
     if l3 < abs(l1 - l2) or l3 > l1 + l2:
+        return False
+    return True
+
+
+def _real_gaunt_backend(l1, m1, l2, m2, l3, m3):
+    if not _selection_rules_ok(l1, m1, l2, m2, l3, m3):
         return 0.0
     if _HAVE_WIGNERNJ:
         return _real_gaunt_wignernj(l1, m1, l2, m2, l3, m3)
     return _real_gaunt_sympy(l1, m1, l2, m2, l3, m3)
 
 
+@lru_cache(maxsize=None)
+def real_gaunt(l1, m1, l2, m2, l3, m3):
+    """Real-spherical Gaunt coefficient as a float.
+
+    Returns 0.0 when selection rules are violated.  Cached.
+    """
+    if not _selection_rules_ok(l1, m1, l2, m2, l3, m3):
+        return 0.0
+    if max(l1, l2) <= store_lmax:
+        return float(gaunt_table(l1, l2, l3)[m1 + l1, m2 + l2, m3 + l3])
+    return _real_gaunt_backend(l1, m1, l2, m2, l3, m3)
+
+
 @lru_cache(maxsize=None)
 def gaunt_table(la, lb, L):
     """Dense table ``G[ma_idx, mb_idx, M_idx]`` of real-Gaunt
@@ -97,11 +128,17 @@ def gaunt_table(la, lb, L):
     stored dense so it can be contracted with numpy ``einsum`` directly.
     Cached.
     """
-    g = np.zeros((2*la + 1, 2*lb + 1, 2*L + 1), dtype=float)
+    shape = (2*la + 1, 2*lb + 1, 2*L + 1)
+    if max(la, lb) <= store_lmax and L in coupling_lvals(la, lb):
+        values, offsets = _load_store(store_lmax)
+        off = offsets[(la, lb, L)]
+        return np.array(values[off:off + shape[0] * shape[1] * shape[2]]).reshape(shape)
+
+    g = np.zeros(shape, dtype=float)
     for ma in range(-la, la + 1):
         for mb in range(-lb, lb + 1):
             for M in range(-L, L + 1):
-                v = real_gaunt(la, ma, lb, mb, L, M)
+                v = _real_gaunt_backend(la, ma, lb, mb, L, M)
                 if v != 0.0:
                     g[ma + la, mb + lb, M + L] = v
     return g
@@ -113,3 +150,184 @@ def coupling_lvals(l1, l2):
     real-Gaunt parity rule l1+l2+L even.
     """
     return tuple(range(abs(l1 - l2), l1 + l2 + 1, 2))
+
+
+# ---------------------------------------------------------------------------
+# Precomputed table store
+# ---------------------------------------------------------------------------
+
+def store_dir():
+    """Directory holding the precomputed Gaunt table store (the
+    library cache directory, :func:`basis_set_exchange.misc.cache_dir`).
+    """
+    return misc.cache_dir()
+
+
+def _store_path(lmax, kind, directory=None):
+    if directory is None:
+        directory = store_dir()
+    return os.path.join(directory, 'gaunt_l{}_{}.npy'.format(lmax, kind))
+
+
+def _store_layout(lmax):
+    """Offsets ``{(l1, l2, l3): offset}`` of each :func:`gaunt_table`
+    slab in the flat store array, and the total size of the array.
+    Slabs are stored C-ordered, ``l1`` outermost and ``l3`` innermost.
+    """
+    offsets = {}
+    size = 0
+    for l1 in range(lmax + 1):
+        for l2 in range(lmax + 1):
+            for l3 in coupling_lvals(l1, l2):
+                offsets[(l1, l2, l3)] = size
+                size += (2*l1 + 1) * (2*l2 + 1) * (2*l3 + 1)
+    return offsets, size
+
+
+def _m_selection_mask(l1, l2, l3):
+    """Boolean ``(2 l1 + 1, 2 l2 + 1, 2 l3 + 1)`` mask of the entries not
+    excluded by the real-harmonic m rules: ``|m3|`` is ``|m1| + |m2|`` or
+    ``||m1| - |m2||``, and an even number of the ``m`` are negative
+    (an odd number of sine factors integrates to zero over ``phi``).
+    """
+    m1 = np.arange(-l1, l1 + 1)[:, None, None]
+    m2 = np.arange(-l2, l2 + 1)[None, :, None]
+    m3 = np.arange(-l3, l3 + 1)[None, None, :]
+    a1, a2, a3 = np.abs(m1), np.abs(m2), np.abs(m3)
+    nneg = (m1 < 0).astype(int) + (m2 < 0) + (m3 < 0)
+    return ((a3 == a1 + a2) | (a3 == np.abs(a1 - a2))) & (nneg % 2 == 0)
+
+
+def _assemble_exact(lmax):
+    """Store array from the exact backend, evaluated only at the entries
+    allowed by :func:`_m_selection_mask`."""
+    offsets, size = _store_layout(lmax)
+    values = np.zeros(size, dtype=float)
+    for (l1, l2, l3), off in offsets.items():
+        shape = (2*l1 + 1, 2*l2 + 1, 2*l3 + 1)
+        g = np.zeros(shape, dtype=float)
+        for i1, i2, i3 in zip(*np.nonzero(_m_selection_mask(l1, l2, l3))):
+            g[i1, i2, i3] = _real_gaunt_backend(l1, int(i1) - l1, l2, int(i2) - l2, l3, int(i3) - l3)
+        values[off:off + g.size] = g.ravel()
+    return values
+
+
+def _real_harmonics(lmax, x, phi):
+    """Real spherical harmonics (Condon-Shortley phase) on the points
+    ``(cos(theta), phi) = (x, phi)``.  Returns a list whose entry ``l``
+    has shape ``(2 l + 1, npoints)``, indexed by ``m + l``.
+    """
+    s = np.sqrt(1.0 - x * x)
+    P = np.zeros((lmax + 1, lmax + 1, x.size))
+    P[0, 0] = 1.0
+    for m in range(1, lmax + 1):
+        P[m, m] = -(2*m - 1) * s * P[m - 1, m - 1]
+    for m in range(lmax):
+        P[m + 1, m] = (2*m + 1) * x * P[m, m]
+    for m in range(lmax + 1):
+        for l in range(m + 2, lmax + 1):
+            P[l, m] = ((2*l - 1) * x * P[l - 1, m] - (l + m - 1) * P[l - 2, m]) / (l - m)
+
+    S = []
+    for l in range(lmax + 1):
+        S_l = np.empty((2*l + 1, x.size))
+        S_l[l] = math.sqrt((2*l + 1) / (4.0 * math.pi)) * P[l, 0]
+        for m in range(1, l + 1):
+            N = math.sqrt(2.0 * (2*l + 1) / (4.0 * math.pi) * math.factorial(l - m) / math.factorial(l + m))
+            S_l[l + m] = N * P[l, m] * np.cos(m * phi)
+            S_l[l - m] = N * P[l, m] * np.sin(m * phi)
+        S.append(S_l)
+    return S
+
+
+def _assemble_quadrature(lmax):
+    """Store array by quadrature over the sphere: Gauss-Legendre in
+    ``cos(theta)`` and the trapezoidal rule in ``phi``, both exact for
+    the polynomial degree ``4 lmax`` of the triple products.  Entries
+    excluded by the selection rules are set to exactly zero."""
+    offsets, size = _store_layout(lmax)
+    degree = 4 * lmax
+    x, wx = np.polynomial.legendre.leggauss(degree // 2 + 1)
+    nphi = degree + 1
+    phi = 2.0 * math.pi * np.arange(nphi) / nphi
+    x = np.repeat(x, nphi)
+    w = np.repeat(wx, nphi) * (2.0 * math.pi / nphi)
+    phi = np.tile(phi, degree // 2 + 1)
+    S = _real_harmonics(2 * lmax, x, phi)
+
+    values = np.zeros(size, dtype=float)
+    for (l1, l2, l3), off in offsets.items():
+        g = np.einsum('ap,bp,cp->abc', S[l1] * w, S[l2], S[l3])
+        g[~_m_selection_mask(l1, l2, l3) | (np.abs(g) < 1.0e-12)] = 0.0
+        values[off:off + g.size] = g.ravel()
+    return values
+
+
+def _assemble_store(lmax):
+    """Assemble the store array, exactly if ``wignernj`` is available.
+    Returns the kind of store and the flat array."""
+    if _HAVE_WIGNERNJ:
+        return 'exact', _assemble_exact(lmax)
+    return 'quadrature', _assemble_quadrature(lmax)
+
+
+def _save_store(values, lmax, kind, directory):
+    """Save an assembled store array, returning the path of the file."""
+    # Write to a temporary file and rename, so concurrent processes never
+    # see a partial store
+    path = _store_path(lmax, kind, directory)
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(tmp_path, 'wb') as f:
+        np.save(f, values)
+    os.replace(tmp_path, path)
+    return path
+
+
+def build_store(lmax=None, directory=None):
+    """Build the Gaunt table store and save it.
+
+    Parameters
+    ----------
+    lmax : int, optional
+        Largest ``l1``, ``l2`` in the store (default :data:`store_lmax`)
+    directory : str, optional
+        Where to save the store (default :func:`store_dir`)
+
+    Returns
+    -------
+    str
+        Path of the saved ``.npy`` file
+    """
+    if lmax is None:
+        lmax = store_lmax
+    if directory is None:
+        directory = store_dir()
+    kind, values = _assemble_store(lmax)
+    return _save_store(values, lmax, kind, directory)
+
+
+@lru_cache(maxsize=None)
+def _load_store(lmax):
+    """Memory-mapped store array and its layout, building (and, where
+    possible, saving) it on first use.  An exact store is preferred; a
+    quadrature store is only used when ``wignernj`` is unavailable."""
+    offsets, size = _store_layout(lmax)
+    kinds = ['exact'] if _HAVE_WIGNERNJ else ['exact', 'quadrature']
+    for kind in kinds:
+        path = _store_path(lmax, kind)
+        if os.path.isfile(path):
+            try:
+                values = np.load(path, mmap_mode='r')
+            except (OSError, ValueError):
+                continue
+            if values.shape == (size, ):
+                return values, offsets
+
+    kind, values = _assemble_store(lmax)
+    try:
+        path = _save_store(values, lmax, kind, store_dir())
+    except OSError:
+        # Cache directory is not writable; keep the store in memory
+        return values, offsets
+    return np.load(path, mmap_mode='r'), offsets
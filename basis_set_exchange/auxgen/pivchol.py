@@ -40,9 +40,11 @@ convention of ERKALE's ``ERIchol::fill`` and
 ``cholesky_pick_exponents``; for normalized unit-diagonal metrics this
 also equals the relative-to-initial-max tolerance).
 
-A single inner kernel is shared between the plain pivoted Cholesky
+The inner kernels are shared between the plain pivoted Cholesky
 (:func:`pivoted_cholesky`) and the shell-pair-driven variant
-(:func:`block_pivoted_cholesky`).  They differ only in pivot
+(:func:`block_pivoted_cholesky`).  Large matrices are decomposed with a
+blocked, left-looking kernel that updates the columns of each panel of
+pivots with matrix-matrix products.  They differ only in pivot
 *selection*: the plain version picks the index with the largest
 residual diagonal at every step; the block version, after each such
 greedy pick, additionally processes every remaining member of the
@@ -55,6 +57,22 @@ belongs to.
 
 import numpy as np
 
+# Matrices at least this large are decomposed with the blocked kernel
+# (:func:`_pivoted_cholesky_blocked`) by default; for smaller ones, the
+# unblocked kernel is as fast.
+_blocked_min_size = 1024
+_default_block_size = 32
+
+
+def _run_kernel(A, tol, next_pivot, max_rank, block_size):
+    """Run the unblocked or the blocked kernel, depending on ``block_size``
+    (``None`` picks automatically from the size of ``A``)."""
+    if block_size is None:
+        block_size = _default_block_size if A.shape[0] >= _blocked_min_size else 1
+    if block_size > 1:
+        return _pivoted_cholesky_blocked(A, tol, next_pivot, max_rank=max_rank, block_size=block_size)
+    return _pivoted_cholesky_core(A, tol, next_pivot, max_rank=max_rank)
+
 
 def _pivoted_cholesky_core(A, tol, next_pivot, max_rank=None):
     """Inner kernel: run pivoted Cholesky on ``A`` with drop tolerance
@@ -120,6 +138,83 @@ def _pivoted_cholesky_core(A, tol, next_pivot, max_rank=None):
     return pivots, L_factor[:, :m].copy()
 
 
+def _pivoted_cholesky_blocked(A, tol, next_pivot, max_rank=None, block_size=32):
+    """Blocked, left-looking variant of :func:`_pivoted_cholesky_core`.
+
+    The pivots are chosen in panels of ``block_size``.  At the start of
+    each panel, the unprocessed indices with the largest residual
+    diagonals are taken as the likely pivots of the panel, and their
+    columns are updated against all the previous panels with a single
+    matrix-matrix product.  Inside the panel, ``next_pivot`` chooses
+    the pivots exactly as in the unblocked kernel, and only the (short)
+    update against the current panel is done per pivot.  A pivot that
+    was not among the likely ones (for example, the other members of a
+    block in :func:`block_pivoted_cholesky`) is updated with a
+    matrix-vector product instead.
+
+    The pivots and the factor are the same as those of the unblocked
+    kernel, up to rounding.
+    """
+    n = A.shape[0]
+    cap = n if max_rank is None else min(max_rank, n)
+
+    diag = np.diag(A).astype(float).copy()
+    L_factor = np.empty((n, cap), dtype=float)
+    done = np.zeros(n, dtype=bool)
+    pivots = []
+    m = 0
+
+    finished = False
+    while m < cap and not finished:
+        start = m
+        nb = min(block_size, cap - m)
+
+        # Likely pivots of this panel, and their columns updated
+        # against the previous panels
+        masked = np.where(done, -np.inf, diag)
+        if nb < n:
+            likely = np.argpartition(-masked, nb - 1)[:nb]
+        else:
+            likely = np.arange(n)
+        panel = A[:, likely].astype(float)
+        if start > 0:
+            panel -= L_factor[:, :start] @ L_factor[likely, :start].T
+        slot = {int(j): k for k, j in enumerate(likely)}
+
+        for _ in range(nb):
+            i = next_pivot(diag, done)
+            if i is None:
+                finished = True
+                break
+
+            k = slot.get(i)
+            if k is not None:
+                col = panel[:, k]
+            elif start > 0:
+                col = A[:, i] - L_factor[:, :start] @ L_factor[i, :start]
+            else:
+                col = A[:, i].astype(float).copy()
+            if m > start:
+                col = col - L_factor[:, start:m] @ L_factor[i, start:m]
+
+            piv_val = diag[i]
+            if piv_val <= 0.0:
+                col = np.zeros(n)
+            else:
+                col = col / np.sqrt(piv_val)
+
+            diag -= col * col
+            diag[i] = 0.0
+            done[i] = True
+            L_factor[:, m] = col
+            m += 1
+            pivots.append(i)
+
+    if m == 0:
+        return pivots, np.zeros((n, 0), dtype=float)
+    return pivots, L_factor[:, :m].copy()
+
+
 # ---------------------------------------------------------------------------
 # Pivot-selection strategies
 # ---------------------------------------------------------------------------
@@ -175,11 +270,15 @@ def _make_block_picker(tol, block_members, block_of):
 # Public entry points
 # ---------------------------------------------------------------------------
 
-def pivoted_cholesky(A, tol=1.0e-6, max_rank=None):
+def pivoted_cholesky(A, tol=1.0e-6, max_rank=None, block_size=None):
     """Pivoted Cholesky with drop tolerance.
 
     Stops when the maximum residual diagonal is at or below ``tol``.
 
+    ``block_size`` selects the blocked kernel with panels of that size
+    (1 selects the unblocked kernel); by default, the blocked kernel is
+    used for large matrices.  Both give the same pivots up to rounding.
+
     Returns
     -------
     pivots : list of int
@@ -195,10 +294,10 @@ def pivoted_cholesky(A, tol=1.0e-6, max_rank=None):
     if np.diag(A).max() <= 0.0:
         return [], np.zeros((n, 0), dtype=float)
 
-    return _pivoted_cholesky_core(A, tol, _make_greedy_picker(tol), max_rank=max_rank)
+    return _run_kernel(A, tol, _make_greedy_picker(tol), max_rank, block_size)
 
 
-def block_pivoted_cholesky(A, block_of, tol=1.0e-6):
+def block_pivoted_cholesky(A, block_of, tol=1.0e-6, block_size=None):
     """Shell-pair-driven pivoted Cholesky (ERKALE convention).
 
     At each step:
@@ -221,6 +320,8 @@ def block_pivoted_cholesky(A, block_of, tol=1.0e-6):
         selected together.
     tol : float
         Absolute drop tolerance on the residual diagonal.
+    block_size : int, optional
+        Panel size of the blocked kernel (see :func:`pivoted_cholesky`).
 
     Returns
     -------
@@ -241,5 +342,4 @@ def block_pivoted_cholesky(A, block_of, tol=1.0e-6):
     for i, b in enumerate(block_of):
         block_members.setdefault(b, []).append(i)
 
-    return _pivoted_cholesky_core(A, tol,
-                                  _make_block_picker(tol, block_members, block_of))
+    return _run_kernel(A, tol, _make_block_picker(tol, block_members, block_of), None, block_size)
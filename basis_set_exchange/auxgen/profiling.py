@@ -0,0 +1,171 @@
+# Copyright (c) 2026 Susi Lehtola
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived
+# from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Per-stage timings and counters of the auxiliary basis generation.
+
+Instrumentation is off unless a :func:`profile` context is active::
+
+    from basis_set_exchange.auxgen import profiling
+
+    with profiling.profile() as report:
+        aux = bse.get_basis('cc-pVTZ', elements='C-Ne', get_aux='cholesky-large')
+    print(report.format())
+
+While active, every stage of the pipeline adds one record (a dict) to the
+report: ``'stage'`` (``'element'``, ``'pool'``, ``'screen'``, ``'select'``
+or ``'contract'``), ``'element'`` (Z, when known), ``'L'`` (for per-L
+stages), ``'seconds'`` (wall time), stage-specific counters such as
+``'size'`` (matrix dimension) and ``'pivots'``, and ``'cache'`` (``'hit'``,
+``'disk_hit'`` or ``'miss'``) for stages served by
+:mod:`basis_set_exchange.auxgen.cache`.  A ``callback`` passed to
+:func:`profile` is called with each record as it is completed.
+
+The stages are :func:`basis_set_exchange.tracing.stage` stages, so the
+records also have the records of the stages run within them under
+``'stages'``, and they appear within the ``'aux'`` stage of a
+:func:`basis_set_exchange.tracing.trace` of
+:func:`~basis_set_exchange.api.get_basis`.
+"""
+
+import contextlib
+import contextvars
+
+from .. import tracing
+
+_element = contextvars.ContextVar('auxgen_profile_element', default=None)
+
+
+class ProfileReport(tracing.TraceReport):
+    '''Records of the stages run while a :func:`profile` context was active'''
+
+    def finish(self, record, parent):
+        # Only the auxgen stages are kept, and those are added by stage()
+        pass
+
+    def stage_totals(self):
+        '''Totals per stage
+
+        Returns
+        -------
+        dict
+            ``{stage: {'calls': int, 'seconds': float, 'hits': int, 'disk_hits': int, 'misses': int}}``
+            where the last three count the cache outcomes of the stage
+        '''
+        totals = {}
+        for r in self.records:
+            t = totals.setdefault(r['stage'], {'calls': 0, 'seconds': 0.0, 'hits': 0, 'disk_hits': 0, 'misses': 0})
+            t['calls'] += 1
+            t['seconds'] += r['seconds']
+            if 'cache' in r:
+                t[{'hit': 'hits', 'disk_hit': 'disk_hits', 'miss': 'misses'}[r['cache']]] += 1
+        return totals
+
+    def format(self):
+        '''Human-readable summary: totals per stage, then per element and L'''
+        lines = ['{:10} {:>7} {:>11} {:>7} {:>9} {:>7}'.format('stage', 'calls', 'seconds', 'hits', 'disk hits',
+                                                                  'misses')]
+        for stage, t in self.stage_totals().items():
+            lines.append('{:10} {:7d} {:11.4f} {:7d} {:9d} {:7d}'.format(stage, t['calls'], t['seconds'], t['hits'],
+                                                                          t['disk_hits'], t['misses']))
+
+        lines.append('')
+        lines.append('{:>7} {:10} {:>3} {:>11}  {}'.format('element', 'stage', 'L', 'seconds', 'counters'))
+        for r in self.records:
+            counters = ', '.join('{}={}'.format(k, v) for k, v in r.items()
+                                 if k not in ('stage', 'element', 'L', 'seconds', 'stages'))
+            lines.append('{:>7} {:10} {:>3} {:11.4f}  {}'.format('' if r['element'] is None else r['element'],
+                                                                 r['stage'], '' if r['L'] is None else r['L'],
+                                                                 r['seconds'], counters).rstrip())
+        return '\n'.join(lines)
+
+
+def _profile_report():
+    '''The report of the innermost active :func:`profile` context, or ``None``'''
+    for report in reversed(tracing.active_reports()):
+        if isinstance(report, ProfileReport):
+            return report
+    return None
+
+
+@contextlib.contextmanager
+def profile(callback=None):
+    '''Collect the stage records of auxgen runs in the enclosed block
+
+    Parameters
+    ----------
+    callback : callable, optional
+        Called with each record (a dict) when its stage completes
+
+    Yields
+    ------
+    ProfileReport
+        The report the records are added to
+    '''
+    with tracing.collect(ProfileReport(callback)) as report:
+        yield report
+
+
+def enabled():
+    '''Whether a :func:`profile` context is active'''
+    return _profile_report() is not None
+
+
+@contextlib.contextmanager
+def element(Z):
+    '''Attribute the records in the enclosed block to element ``Z``'''
+    token = _element.set(Z)
+    try:
+        yield
+    finally:
+        _element.reset(token)
+
+
+@contextlib.contextmanager
+def stage(name, L=None, **counters):
+    '''Time the enclosed block as stage ``name``
+
+    Yields the record being built (a dict, or ``None`` when neither
+    profiling nor tracing is on), so counters known only at the end of the
+    stage can be added to it.
+    '''
+    report = _profile_report()
+    record = None
+    try:
+        with tracing.stage(name, element=_element.get(), L=L, **counters) as record:
+            yield record
+    finally:
+        if report is not None and record is not None:
+            report.add(record)
+
+
+def cache_outcome(outcome):
+    '''Note the cache outcome (``'hit'``, ``'disk_hit'`` or ``'miss'``) on the innermost open stage'''
+    tracing.annotate(cache=outcome)
@@ -88,6 +88,14 @@ def _binomial(n, k):
     return gamma(n + 1.0) / (gamma(n - k + 1.0) * gamma(k + 1.0))
 
 
+@lru_cache(maxsize=None)
+def _Enk_coefficients(n, k):
+    """Binomial coefficients ``(C(n, 0), ..., C(n, k - 1))`` and
+    ``C(n, k)`` entering :func:`_Enk`, precomputed once per ``(n, k)``.
+    """
+    return tuple(_binomial(n, j) for j in range(k)), _binomial(n, k)
+
+
 def _Enk(n, k, x):
     """Evaluate
 
@@ -100,15 +108,15 @@ def _Enk(n, k, x):
         if _HAVE_NUMPY and isinstance(x, _np.ndarray):
             return _np.zeros_like(x, dtype=float)
         return 0.0
-    cnk = _binomial(n, k)
+    coeffs, cnk = _Enk_coefficients(n, k)
     if _HAVE_NUMPY and isinstance(x, _np.ndarray):
         num = _np.zeros_like(x, dtype=float)
-        for j in range(k):
-            num = num + _binomial(n, j) * x**j
+        for j, c in enumerate(coeffs):
+            num = num + c * x**j
         return num / (cnk * x**k)
     num = 0.0
-    for j in range(k):
-        num += _binomial(n, j) * x**j
+    for j, c in enumerate(coeffs):
+        num += c * x**j
     return num / (cnk * x**k)
 
 
@@ -161,6 +169,55 @@ def radial_integral(L, LA, LB, alpha, beta):
     return _radial_scalar_cached(L, LA, LB, float(alpha), float(beta))
 
 
+def _gto_radial_kernel(L, LA, LB, alpha, beta):
+    if L > LA or L > LB or (LA + L) % 2 or (LB + L) % 2:
+        return _np.zeros(_np.broadcast_shapes(_np.shape(alpha), _np.shape(beta)), dtype=float)
+    return _Rmnv(LA + 2, LB + 2, L, alpha, beta)
+
+
+def batch_evaluate(kernel, orders, alpha, beta):
+    """Evaluate a closed-form radial kernel over many integer orders in one call.
+
+    ``orders`` is a tuple of integer arguments (scalars or arrays, e.g.
+    ``(L, LA, LB)``) and ``alpha``, ``beta`` are exponent arrays; all of
+    them are broadcast against each other.  ``kernel(*orders, alpha,
+    beta)`` is called once per distinct combination of the orders, with
+    scalar orders and the matching 1-D slices of the exponents, and the
+    results are scattered back into the broadcast shape.  When all
+    orders are scalars this is a single kernel call over the full
+    exponent grid.
+    """
+    alpha = _np.asarray(alpha, dtype=float)
+    beta = _np.asarray(beta, dtype=float)
+    if all(_np.ndim(o) == 0 for o in orders):
+        return kernel(*(int(o) for o in orders), alpha, beta)
+
+    arrays = _np.broadcast_arrays(*(_np.asarray(o, dtype=int) for o in orders), alpha, beta)
+    int_arrays = [a.ravel() for a in arrays[:-2]]
+    alpha = arrays[-2].ravel()
+    beta = arrays[-1].ravel()
+    out = _np.empty(alpha.size, dtype=float)
+    keys, inverse = _np.unique(_np.stack(int_arrays), axis=1, return_inverse=True)
+    inverse = inverse.ravel()
+    for ikey in range(keys.shape[1]):
+        idx = _np.flatnonzero(inverse == ikey)
+        out[idx] = kernel(*(int(k) for k in keys[:, ikey]), alpha[idx], beta[idx])
+    return out.reshape(arrays[-1].shape)
+
+
+def radial_integral_batch(L, LA, LB, alpha, beta):
+    """Vectorized :func:`radial_integral` over arrays of all arguments.
+
+    ``L``, ``LA``, ``LB`` may be integer arrays and ``alpha``, ``beta``
+    float arrays; they are broadcast against each other, so for example
+    ``radial_integral_batch(L, n_ab[:, None], L, alpha_ab[:, None],
+    alpha_P[None, :])`` gives the full ``(alpha_ab x alpha_P)`` grid.
+    Entries violating the selection rules are 0.  See
+    :func:`batch_evaluate`.
+    """
+    return batch_evaluate(_gto_radial_kernel, (L, LA, LB), alpha, beta)
+
+
 def precompute_radial(L_max):
     """Compatibility shim with previous sympy-based interface.  The
     closed-form evaluator does not need to be warmed up, so this is a
@@ -69,7 +69,9 @@ candidate pool and per-L selection are angular-momentum-resolved
 exactly as in the GTO path.
 """
 
+import os
 import sys
+import concurrent.futures
 from math import gamma, sqrt, pi
 
 # Support both ``python -m basis_set_exchange.auxgen.sto`` and the bare
@@ -77,7 +79,6 @@ from math import gamma, sqrt, pi
 # relative imports below would fail, so we put the package root on
 # ``sys.path`` and fix up ``__package__`` first.
 if __name__ == '__main__' and __package__ in (None, ''):
-    import os
     _here = os.path.dirname(os.path.abspath(__file__))
     sys.path.insert(0, os.path.abspath(os.path.join(_here, '..', '..')))
     __package__ = 'basis_set_exchange.auxgen'
@@ -86,7 +87,7 @@ import numpy as np
 
 from .. import lut
 from .gaunt import coupling_lvals, gaunt_table
-from .radial import _Enk
+from .radial import _Enk, batch_evaluate
 from .products import _shellpair_L_range, orbital_shell_pairs
 from .twoel import _iter_nonzero_gaunt, coupled_shell_pair_screen
 
@@ -133,6 +134,14 @@ def sto_radial_coulomb(m, n, v, x, y):
                  + _Enk(half, m - v - 1, x / y)))
 
 
+def sto_radial_coulomb_batch(m, n, v, x, y):
+    """Vectorized :func:`sto_radial_coulomb` over arrays of all
+    arguments (broadcast against each other); see
+    :func:`~basis_set_exchange.auxgen.radial.batch_evaluate`.
+    """
+    return batch_evaluate(sto_radial_coulomb, (m, n, v), x, y)
+
+
 # ---------------------------------------------------------------------------
 # One-electron one-centre matrix elements (Pitzer/openorbital STO forms)
 # ---------------------------------------------------------------------------
@@ -145,35 +154,58 @@ def sto_radial_coulomb(m, n, v, x, y):
 # sto_norm(n, zeta) for either index to obtain matrix elements in the
 # normalised basis.
 
+def _gamma_int(n):
+    """``Gamma(n)`` for a positive integer ``n`` or an integer array."""
+    if np.ndim(n) == 0:
+        return gamma(n)
+    n = np.asarray(n, dtype=int)
+    table = np.array([gamma(k) for k in range(1, int(n.max()) + 1)])
+    return table[n - 1]
+
+
 def _Vn(n, x):
     """Pitzer helper ``V_n(x) = Gamma(n + 1) / x^(n + 1)`` (the radial
-    integral ``int_0^inf r^n e^(-x r) dr``).
+    integral ``int_0^inf r^n e^(-x r) dr``).  ``n`` and ``x`` may be
+    broadcast-compatible integer / float arrays.
     """
-    return gamma(n + 1) / x ** (n + 1)
+    return _gamma_int(n + 1) / x ** (n + 1)
 
 
 def _Wn(n, x):
     """Pitzer helper ``W_n(x) = (n - 1) / x`` (logarithmic-derivative
-    helper in the kinetic-energy expression).
+    helper in the kinetic-energy expression).  Accepts arrays.
     """
     return (n - 1) / x
 
 
+def _sto_item_arrays(items):
+    """Split ``[(n, zeta), ...]`` into an integer ``n`` and a float
+    ``zeta`` array.
+    """
+    n = np.asarray([int(n) for (n, _z) in items], dtype=int)
+    z = np.asarray([float(z) for (_n, z) in items], dtype=float)
+    return n, z
+
+
+def _symmetrize_upper(M):
+    """Mirror the upper triangle of ``M`` so the result is exactly
+    symmetric (the pair kernels are only symmetric up to rounding).
+    """
+    M = np.triu(M)
+    return M + np.triu(M, 1).T
+
+
 def sto_overlap_matrix(items):
     """``S_ij = <chi_i | chi_j>`` over un-normalised STO primitives
     ``chi = r^(n - 1) e^(-zeta r) Y_LM``.  Angular-momentum independent
     (the Y_LM ON-condition only requires the bra/ket share L,M, which is
     the caller's responsibility); ``items`` is ``[(n, zeta), ...]``.
     """
-    n_items = len(items)
-    S = np.zeros((n_items, n_items), dtype=float)
-    for i, (ni, zi) in enumerate(items):
-        for j in range(i, n_items):
-            nj, zj = items[j]
-            # Openorbital STOBasis::overlap, Pitzer p. 244.
-            v = _Vn(ni + nj, zi + zj)
-            S[i, j] = S[j, i] = v
-    return S
+    if not items:
+        return np.zeros((0, 0), dtype=float)
+    n, z = _sto_item_arrays(items)
+    # Openorbital STOBasis::overlap, Pitzer p. 244.
+    return _symmetrize_upper(_Vn(n[:, None] + n[None, :], z[:, None] + z[None, :]))
 
 
 def sto_nuclear_attraction_matrix(items):
@@ -182,15 +214,11 @@ def sto_nuclear_attraction_matrix(items):
     ``-Z`` for the physical nuclear-attraction matrix at nuclear charge
     ``Z``).
     """
-    n_items = len(items)
-    V = np.zeros((n_items, n_items), dtype=float)
-    for i, (ni, zi) in enumerate(items):
-        for j in range(i, n_items):
-            nj, zj = items[j]
-            # Openorbital STOBasis::nuclear_attraction, Pitzer p. 244.
-            v = _Vn(ni + nj - 1, zi + zj)
-            V[i, j] = V[j, i] = v
-    return V
+    if not items:
+        return np.zeros((0, 0), dtype=float)
+    n, z = _sto_item_arrays(items)
+    # Openorbital STOBasis::nuclear_attraction, Pitzer p. 244.
+    return _symmetrize_upper(_Vn(n[:, None] + n[None, :] - 1, z[:, None] + z[None, :]))
 
 
 def sto_kinetic_matrix(L, items):
@@ -206,21 +234,19 @@ def sto_kinetic_matrix(L, items):
 
     with ``z = zeta_i + zeta_j``.
     """
-    n_items = len(items)
-    T = np.zeros((n_items, n_items), dtype=float)
-    for i, (ni, zi) in enumerate(items):
-        Wi = _Wn(ni - L, zi)
-        for j in range(i, n_items):
-            nj, zj = items[j]
-            Wj = _Wn(nj - L, zj)
-            z = zi + zj
-            t = 0.5 * zi * zj * (
-                Wi * Wj * _Vn(ni + nj - 2, z)
-                - (Wi + Wj) * _Vn(ni + nj - 1, z)
-                + _Vn(ni + nj, z)
-            )
-            T[i, j] = T[j, i] = t
-    return T
+    if not items:
+        return np.zeros((0, 0), dtype=float)
+    n, z = _sto_item_arrays(items)
+    W = _Wn(n - L, z)
+    Wi, Wj = W[:, None], W[None, :]
+    nn = n[:, None] + n[None, :]
+    zz = z[:, None] + z[None, :]
+    T = 0.5 * z[:, None] * z[None, :] * (
+        Wi * Wj * _Vn(nn - 2, zz)
+        - (Wi + Wj) * _Vn(nn - 1, zz)
+        + _Vn(nn, zz)
+    )
+    return _symmetrize_upper(T)
 
 
 # ---------------------------------------------------------------------------
@@ -240,18 +266,12 @@ def sto_aux_metric_overlap_norm(L, items):
     n_items = len(items)
     if n_items == 0:
         return np.zeros((0, 0), dtype=float)
-    M = np.zeros((n_items, n_items), dtype=float)
+    n_P, z_P = _sto_item_arrays(items)
+    N_P = np.array([sto_norm(na, za) for (na, za) in items], dtype=float)
     fourpi_2Lp1 = 4.0 * pi / (2 * L + 1)
-    for i, (na, za) in enumerate(items):
-        Na = sto_norm(na, za)
-        for j in range(i, n_items):
-            nb, zb = items[j]
-            Nb = sto_norm(nb, zb)
-            rad = sto_radial_coulomb(na + 1, nb + 1, L, float(za), float(zb))
-            v = Na * Nb * fourpi_2Lp1 * rad
-            M[i, j] = v
-            M[j, i] = v
-    return M
+    rad = sto_radial_coulomb_batch(n_P[:, None] + 1, n_P[None, :] + 1, L,
+                                   z_P[:, None], z_P[None, :])
+    return _symmetrize_upper(N_P[:, None] * N_P[None, :] * fourpi_2Lp1 * rad)
 
 
 def _coulomb_rescale_factors(V_overlap):
@@ -436,71 +456,78 @@ def sto_orbital_aux_projection(L, primitives, items):
     n_aux = len(items)
     if n_aux == 0:
         return np.zeros((0, 0)), np.zeros((0, 0), dtype=float)
-    a_aux_n = np.asarray([na for (na, _z) in items], dtype=int)
-    a_aux_z = np.asarray([float(z) for (_n, z) in items], dtype=float)
+    a_aux_n, a_aux_z = _sto_item_arrays(items)
     # Overlap-normalisation constants on the aux side; we will rescale to
     # the Coulomb-normalised convention at the end so the returned
     # V satisfies (P|P) = 1 and J is consistent with it.
     N_aux_overlap = np.array([sto_norm(na, za) for (na, za) in items],
                              dtype=float)
 
-    rows = []
-    fourpi_2Lp1 = 4.0 * pi / (2 * L + 1)
-
-    for (la, n_a, za) in primitives:
-        Na = sto_norm(n_a, za)
-        for (lb, n_b, zb) in primitives:
-            if L not in coupling_lvals(la, lb):
-                continue
-            Nb = sto_norm(n_b, zb)
-            base = Na * Nb * fourpi_2Lp1
-
-            rad_vec = np.fromiter(
-                (sto_radial_coulomb(n_a + n_b, int(nP) + 1, L,
-                                    float(za + zb), float(zP))
-                 for (nP, zP) in zip(a_aux_n, a_aux_z)),
-                dtype=float, count=n_aux,
-            )
-            # J_overlap = (orbital overlap-norm) * (aux overlap-norm) * radial.
-            kern_P = base * N_aux_overlap * rad_vec
-
-            G = gaunt_table(la, lb, L)
-            for g, _ima, _imb, _iM in _iter_nonzero_gaunt(G, la, lb, L):
-                rows.append(g * kern_P)
+    n_ab, z_ab, N_ab, pair_idx, gfac = _sto_pair_channels(L, primitives)
+    rows = None
+    if pair_idx.size:
+        fourpi_2Lp1 = 4.0 * pi / (2 * L + 1)
+        # One radial kernel call over the (orbital pair x aux) grid.
+        rad = sto_radial_coulomb_batch(n_ab[:, None], a_aux_n[None, :] + 1, L,
+                                       z_ab[:, None], a_aux_z[None, :])
+        # J_overlap = (orbital overlap-norm) * (aux overlap-norm) * radial.
+        kern = (N_ab * fourpi_2Lp1)[:, None] * N_aux_overlap[None, :] * rad
+        rows = gfac[:, None] * kern[pair_idx]
 
     V_overlap = sto_aux_metric_overlap_norm(L, items)
     s = _coulomb_rescale_factors(V_overlap)         # 1 / sqrt((P|P)_overlap)
     V_coul = V_overlap * np.outer(s, s)             # unit-diagonal Coulomb metric
-    if rows:
+    if rows is not None:
         # Each row already carries the orbital and aux overlap-norms; rescaling
         # the aux column by ``s`` puts the aux index into the Coulomb-normalised
         # convention so V_coul and J_coul are consistent.
-        J_coul = np.vstack(rows) * s[None, :]
+        J_coul = rows * s[None, :]
     else:
         J_coul = np.zeros((0, n_aux), dtype=float)
     return V_coul, J_coul
 
 
-def _sto_orbital_diag_exact(L, primitives):
-    """Per-row exact ``(chi_r chi_s | chi_r chi_s)_{L, M}`` matching the
-    row order produced by :func:`sto_orbital_aux_projection`.  Each row
-    corresponds to one ``(la, m_a, lb, m_b, M)`` channel.
+def _sto_pair_channels(L, primitives):
+    """Orbital primitive pairs ``(a, b)`` coupling to ``L`` and their
+    m-resolved channels, in the row order of
+    :func:`sto_orbital_aux_projection`.
+
+    Returns ``(n_ab, z_ab, N_ab, pair_idx, gfac)``: per pair the summed
+    principal quantum number ``n_a + n_b``, exponent ``z_a + z_b`` and
+    norm product ``N_a N_b``, and per channel row the index of its pair
+    and its Gaunt coefficient.
     """
-    out = []
-    fourpi_2Lp1 = 4.0 * pi / (2 * L + 1)
+    n_ab, z_ab, N_ab, pair_idx, gfac = [], [], [], [], []
     for (la, n_a, za) in primitives:
         Na = sto_norm(n_a, za)
         for (lb, n_b, zb) in primitives:
             if L not in coupling_lvals(la, lb):
                 continue
-            Nb = sto_norm(n_b, zb)
-            R_diag = sto_radial_coulomb(n_a + n_b, n_a + n_b, L,
-                                        float(za + zb), float(za + zb))
             G = gaunt_table(la, lb, L)
-            base = fourpi_2Lp1 * (Na * Nb) ** 2 * R_diag
+            ipair = len(n_ab)
+            n_ab.append(n_a + n_b)
+            z_ab.append(float(za + zb))
+            N_ab.append(Na * sto_norm(n_b, zb))
             for g, _ima, _imb, _iM in _iter_nonzero_gaunt(G, la, lb, L):
-                out.append(base * g * g)
-    return np.asarray(out, dtype=float)
+                pair_idx.append(ipair)
+                gfac.append(g)
+    return (np.asarray(n_ab, dtype=int), np.asarray(z_ab, dtype=float),
+            np.asarray(N_ab, dtype=float), np.asarray(pair_idx, dtype=int),
+            np.asarray(gfac, dtype=float))
+
+
+def _sto_orbital_diag_exact(L, primitives):
+    """Per-row exact ``(chi_r chi_s | chi_r chi_s)_{L, M}`` matching the
+    row order produced by :func:`sto_orbital_aux_projection`.  Each row
+    corresponds to one ``(la, m_a, lb, m_b, M)`` channel.
+    """
+    n_ab, z_ab, N_ab, pair_idx, gfac = _sto_pair_channels(L, primitives)
+    if pair_idx.size == 0:
+        return np.zeros(0, dtype=float)
+    fourpi_2Lp1 = 4.0 * pi / (2 * L + 1)
+    R_diag = sto_radial_coulomb_batch(n_ab, n_ab, L, z_ab, z_ab)
+    base = fourpi_2Lp1 * N_ab ** 2 * R_diag
+    return base[pair_idx] * gfac * gfac
 
 
 def sto_diagonal_ri_error(sto_orbital_basis, sto_aux_basis):
@@ -870,6 +897,89 @@ def _element_z_from_title(title):
         return None
 
 
+def _adf_library_task(task):
+    """Worker for :func:`generate_sto_auxiliary_library`: regenerate the
+    FIT block of one ADF file.  Returns ``None`` for files without BASIS
+    shells (so non-basis files in a library directory are skipped).
+    """
+    from .auxgen import _default_lmax_occ
+
+    in_path, out_path, kwargs = task
+    parsed = read_adf_basis(in_path)
+    if not parsed['orbital']:
+        return None
+    kwargs = dict(kwargs)
+    if kwargs.get('prune_lmax') and kwargs.get('lmax_occ') is None:
+        z = _element_z_from_title(parsed['title'])
+        if z is None:
+            raise ValueError("prune_lmax needs lmax_occ (could not infer element Z "
+                             "from title %r of %s)" % (parsed['title'], in_path))
+        kwargs['lmax_occ'] = _default_lmax_occ(z)
+    new_fit = generate_sto_auxiliary_basis(parsed['orbital'], **kwargs)
+    write_adf_basis(out_path, parsed, new_fit)
+    return parsed, new_fit
+
+
+def generate_sto_auxiliary_library(directory, output_dir=None, nprocs=None,
+                                   **kwargs):
+    """Regenerate the FIT block of every ADF basis file in ``directory``.
+
+    The files are processed in ``nprocs`` worker processes; each one is
+    read with :func:`read_adf_basis`, given a new FIT block by
+    :func:`generate_sto_auxiliary_basis` and written with
+    :func:`write_adf_basis`.  Files without BASIS shells and
+    subdirectories are skipped.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of ADF per-element basis files (e.g. one basis type
+        of ``atomicdata/ZORA``)
+    output_dir : str, optional
+        Directory to write the regenerated files to, under their
+        original names.  By default each file is written next to its
+        input as ``<input>.new``.
+    nprocs : int, optional
+        Number of worker processes.  If None, the number of CPUs is
+        used; if 1, everything is done in the current process.
+    **kwargs
+        Passed to :func:`generate_sto_auxiliary_basis`.  With
+        ``prune_lmax=True`` and no ``lmax_occ``, ``lmax_occ`` is
+        inferred per file from the element in its title.
+
+    Returns
+    -------
+    dict
+        ``{filename: (parsed, new_fit)}`` for every processed file,
+        where ``parsed`` is the :func:`read_adf_basis` dict of the input
+        and ``new_fit`` the regenerated ``{L: [(n, zeta), ...]}``.
+    """
+    names = sorted(f for f in os.listdir(directory)
+                   if os.path.isfile(os.path.join(directory, f)) and not f.endswith('.new'))
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    tasks = []
+    for name in names:
+        in_path = os.path.join(directory, name)
+        if output_dir is None:
+            out_path = in_path + '.new'
+        else:
+            out_path = os.path.join(output_dir, name)
+        tasks.append((in_path, out_path, kwargs))
+
+    if nprocs is None:
+        nprocs = os.cpu_count() or 1
+    nprocs = min(nprocs, len(tasks))
+
+    if nprocs > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=nprocs) as executor:
+            results = list(executor.map(_adf_library_task, tasks))
+    else:
+        results = [_adf_library_task(t) for t in tasks]
+
+    return {name: res for name, res in zip(names, results) if res is not None}
+
+
 # ---------------------------------------------------------------------------
 # main() driver: read ADF basis, regenerate FIT, benchmark RI error
 # ---------------------------------------------------------------------------
@@ -887,14 +997,17 @@ def main(argv=None):
     """Command-line driver: read an ADF per-element basis file, regenerate
     its FIT (auxiliary) basis with the pivoted-Cholesky procedure, save
     the new file, and report the diagonal RI error of the old and new
-    fit bases for comparison.
+    fit bases for comparison.  If the input is a directory, every basis
+    file in it is processed in parallel
+    (:func:`generate_sto_auxiliary_library`) and the output argument
+    names an output directory.
 
     Usage::
 
         python -m basis_set_exchange.auxgen.sto input.adf [output.adf]
             [--threshold TAU] [--scheme {basic,reduced}]
             [--prune-lmax] [--linc INT] [--lmax-occ INT]
-            [--no-benchmark-old]
+            [--no-benchmark] [--nprocs INT]
     """
     import argparse
 
@@ -906,9 +1019,11 @@ def main(argv=None):
             "Lehtola JCTC 17, 6886 (2021).  Reports the diagonal RI "
             "error of the old and new fits for comparison."),
     )
-    p.add_argument('input', help='ADF input basis file (contains BASIS + FIT)')
+    p.add_argument('input', help='ADF input basis file (contains BASIS + FIT), '
+                                 'or a directory of them')
     p.add_argument('output', nargs='?', default=None,
-                   help='Output ADF file (default: <input>.new)')
+                   help='Output ADF file, or output directory if the input is '
+                        'a directory (default: <input>.new)')
     p.add_argument('--threshold', type=float, default=1.0e-7,
                    help='Pivoted-Cholesky drop tolerance (default 1e-7)')
     p.add_argument('--scheme', choices=['basic', 'reduced'],
@@ -935,10 +1050,31 @@ def main(argv=None):
     p.add_argument('--no-benchmark', action='store_true',
                    help='Skip the diagonal-RI-error benchmark for both '
                         'the old and the new FIT blocks')
+    p.add_argument('--nprocs', type=int, default=None,
+                   help='Worker processes when the input is a directory '
+                        '(default: number of CPUs)')
     args = p.parse_args(argv)
 
     from .auxgen import _default_lmax_occ
 
+    gen_kwargs = dict(threshold=args.threshold, scheme=args.scheme, n_random=args.n_random,
+                      seed=args.seed, prune_lmax=args.prune_lmax, lmax_occ=args.lmax_occ,
+                      linc=args.linc, compact=args.compact)
+
+    if os.path.isdir(args.input):
+        results = generate_sto_auxiliary_library(args.input, output_dir=args.output,
+                                                 nprocs=args.nprocs, **gen_kwargs)
+        if not results:
+            print("error: no ADF basis files found in %s" % args.input,
+                  file=sys.stderr)
+            return 1
+        for name, (parsed, new_fit) in results.items():
+            line = "%-24s %-24s new FIT: %s" % (name, parsed['title'], _format_basis_summary(new_fit))
+            if not args.no_benchmark:
+                line += "  RI error: %.6e" % sto_diagonal_ri_error(parsed['orbital'], new_fit)
+            print(line)
+        return 0
+
     parsed = read_adf_basis(args.input)
     orbital = parsed['orbital']
     old_fit = parsed['fit']
@@ -957,17 +1093,8 @@ def main(argv=None):
             return 1
         lmax_occ = _default_lmax_occ(z)
 
-    new_fit = generate_sto_auxiliary_basis(
-        orbital,
-        threshold=args.threshold,
-        scheme=args.scheme,
-        n_random=args.n_random,
-        seed=args.seed,
-        prune_lmax=args.prune_lmax,
-        lmax_occ=lmax_occ,
-        linc=args.linc,
-        compact=args.compact,
-    )
+    gen_kwargs['lmax_occ'] = lmax_occ
+    new_fit = generate_sto_auxiliary_basis(orbital, **gen_kwargs)
 
     out_path = args.output or (args.input + '.new')
     write_adf_basis(out_path, parsed, new_fit)
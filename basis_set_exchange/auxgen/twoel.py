@@ -72,7 +72,20 @@ import numpy as np
 from math import pi
 
 from .gaunt import real_gaunt, coupling_lvals, gaunt_table
-from .radial import radial_integral, gto_norm, gto_norm_array
+from .radial import radial_integral, radial_integral_batch, gto_norm, gto_norm_array
+
+#: Memory ceiling (in bytes) for the dense per-L metric blocks of
+#: :func:`coupled_shell_pair_screen`; larger problems generate the metric
+#: columns on demand instead.  Can be overridden per call with
+#: ``max_memory``.
+max_metric_memory = 4 * 1024**3
+
+#: Screening tolerance of :func:`coupled_shell_pair_screen`: metric entries
+#: whose Schwarz-normalised coupling ``|A(P, Q)| / sqrt(A(P, P) A(Q, Q))``
+#: is below it are treated as zero and never evaluated.  0 disables the
+#: screening (the exact dense or on-demand paths are used instead).  Can be
+#: overridden per call with ``screen_tol``.
+metric_screen_tol = 1.0e-10
 
 
 def _angular_weight_table(la, lb, L):
@@ -87,11 +100,12 @@ def _angular_weight_table(la, lb, L):
 
 
 def coupled_shell_pair_screen(shell_pairs, threshold,
-                              norm_fn=None, radial_fn=None):
+                              norm_fn=None, radial_fn=None, max_memory=None,
+                              screen_tol=None):
     """Coupled-basis pivoted-Cholesky pre-screen of orbital shell-pairs.
 
-    Bit-for-bit equivalent to the dense reference formulation
-    (:func:`primitive_product_pairs` + :func:`product_metric` +
+    With ``screen_tol=0``, bit-for-bit equivalent to the dense reference
+    formulation (:func:`primitive_product_pairs` + :func:`product_metric` +
     :func:`~basis_set_exchange.auxgen.pivchol.block_pivoted_cholesky`)
     without ever materialising the dense ``N_m_pair x N_m_pair`` metric.
     Peak memory drops from ``O(N_m_pair^2)`` to
@@ -120,6 +134,23 @@ def coupled_shell_pair_screen(shell_pairs, threshold,
     is bit-for-bit identical to the dense reference at every step
     (regression-tested).
 
+    Screening.  One-centre Coulomb integrals are homogeneous in the
+    exponents, so the Schwarz-normalised coupling
+    ``c(P, Q) = |A_L(P, Q)| / sqrt(A_L(P, P) A_L(Q, Q))`` of two
+    candidates depends only on their radial powers and the ratio of
+    their exponents, and it decays as the ratio moves away from one.  By
+    default (``screen_tol > 0``) the screen tabulates ``c`` once per pair
+    of radial powers, keeps only the exponent window where
+    ``c >= screen_tol``, and generates the ``A_L`` columns on demand
+    (as in the memory-bounded mode below), evaluating only the band of
+    candidates inside the window; blocks with an empty window are never
+    formed.  Dropping entries below ``screen_tol`` times their Schwarz
+    bound perturbs the residual diagonals by ``O(screen_tol)`` relative to
+    the diagonals themselves, so the pivot sequence is that of the
+    unscreened algorithm except where two competing residual diagonals
+    (or a residual diagonal and ``threshold``) agree to within that
+    relative margin.
+
     Algorithm.  Build one ``A_L`` block per required L.  At each step:
 
       1.  For every unselected pair ``P`` compute
@@ -143,6 +174,19 @@ def coupled_shell_pair_screen(shell_pairs, threshold,
         Absolute residual-diagonal drop tolerance.
     norm_fn, radial_fn
         Radial-family closures forwarded to :func:`coupled_L_metric`.
+    max_memory : int, optional
+        Memory ceiling (in bytes) for the dense ``A_L`` blocks.  When the
+        blocks and their downdate buffers would exceed it, the screen
+        switches to a memory-bounded mode that generates the columns of
+        ``A_L`` on demand as pivots are selected and keeps only the
+        Cholesky vectors, so peak memory is ``O(N_shell_pair(L) x rank)``.
+        The selection agrees with the dense path up to round-off.
+        Defaults to the module-level :data:`max_metric_memory`.  Only
+        used when the screening is disabled.
+    screen_tol : float, optional
+        Schwarz-normalised coupling below which metric entries are
+        neglected (see above); 0 disables the screening.  Defaults to the
+        module-level :data:`metric_screen_tol`.
 
     Returns
     -------
@@ -170,21 +214,36 @@ def coupled_shell_pair_screen(shell_pairs, threshold,
     # A_L: L-block Coulomb metric with the ``4 pi / (2 L + 1)`` prefactor
     # stripped (it is folded into ``w_L`` below).  ``loc_of[L][i]`` is
     # pair ``i``'s L-local index (-1 for non-members).
-    A = {}
+    members_of = {}
     loc_of = {}
     groups_at_L = {}                # L -> list of (la, lb) keys coupling to L
-    outer_buf = {}                  # L -> preallocated rank-1 downdate buffer
     for L in all_Ls:
         members = np.asarray([i for i in range(n) if L in coupling_of[i]],
                              dtype=np.int64)
         loc = np.full(n, -1, dtype=np.int64)
         loc[members] = np.arange(members.size)
-        raw = coupled_L_metric(L, [shell_pairs[i] for i in members],
-                               norm_fn=norm_fn, radial_fn=radial_fn)
-        A[L] = raw * (2 * L + 1) / (4.0 * pi)
+        members_of[L] = members
         loc_of[L] = loc
         groups_at_L[L] = [k for k in ang_groups if L in coupling_lvals(*k)]
-        outer_buf[L] = np.empty_like(A[L])
+
+    # Screened on-demand columns by default.  Without screening, dense
+    # blocks (plus their rank-1 downdate buffers) when they fit in the
+    # memory ceiling, otherwise unscreened columns generated on demand.
+    if screen_tol is None:
+        screen_tol = metric_screen_tol
+    if max_memory is None:
+        max_memory = max_metric_memory
+    dense_bytes = sum(2 * 8 * m.size**2 for m in members_of.values())
+    if screen_tol > 0.0:
+        metric_kwargs = {'screen_tol': screen_tol}
+        metric_type = _ScreenedCoupledMetric
+    else:
+        metric_kwargs = {}
+        metric_type = _DenseCoupledMetric if dense_bytes <= max_memory else _OnDemandCoupledMetric
+    A = {}
+    for L in all_Ls:
+        A[L] = metric_type(L, [shell_pairs[i] for i in members_of[L]],
+                           norm_fn=norm_fn, radial_fn=radial_fn, **metric_kwargs)
 
     # Per-(la, lb, L) angular weight tables (small; cached inline).
     w_by_labL = {}
@@ -201,7 +260,7 @@ def coupled_shell_pair_screen(shell_pairs, threshold,
         dg = np.zeros((gis.size, 2 * la + 1, 2 * lb + 1), dtype=float)
         for L in coupling_lvals(la, lb):
             locs = loc_of[L][gis]                # (n_group,) L-local indices
-            diag_L = A[L][locs, locs]            # (n_group,)
+            diag_L = A[L].diagonal()[locs]       # (n_group,)
             dg += diag_L[:, None, None] * w_by_labL[(la, lb, L)][None, :, :]
         d_by_ang[(la, lb)] = dg
         D[gis] = dg.reshape(gis.size, -1).max(axis=1)
@@ -220,15 +279,9 @@ def coupled_shell_pair_screen(shell_pairs, threshold,
         # resulting L-local diagonal change into d[Q] group-by-group and
         # vectorised.
         for L in coupling_of[i_star]:
-            loc_star = int(loc_of[L][i_star])
-            piv = float(A[L][loc_star, loc_star])
-            if piv <= 0.0:
+            delta_local = A[L].downdate(int(loc_of[L][i_star]))
+            if delta_local is None:
                 continue
-            col = A[L][:, loc_star].copy()
-            col_scaled = col / piv
-            np.multiply.outer(col_scaled, col, out=outer_buf[L])
-            A[L] -= outer_buf[L]
-            delta_local = col * col_scaled        # (n_local_L,)
 
             for key in groups_at_L[L]:
                 gis = ang_groups[key]             # (n_group,)
@@ -353,18 +406,6 @@ def normalized_metric(L, alphas):
 # Three-index orbital-product / aux projection (test-suite use).
 # ---------------------------------------------------------------------------
 
-def _aux_radial_vector(L, n_ab, alpha_ab, aux_alphas):
-    """One-center Coulomb radial integrals ``R_L(n_ab, L; alpha_ab,
-    alpha_P)`` for every ``alpha_P`` in ``aux_alphas`` (the orbital-pair
-    radial power ``n_ab`` and combined exponent ``alpha_ab`` fixed).
-    Shared helper used by :func:`_W_block` and :func:`orbital_aux_projection`.
-    """
-    return np.fromiter(
-        (radial_integral(L, n_ab, L, alpha_ab, float(p)) for p in aux_alphas),
-        dtype=float, count=len(aux_alphas),
-    )
-
-
 def orbital_aux_projection(L, primitives, alphas):
     """Three-index projection of orbital product densities onto a set
     of aux primitives at angular momentum ``L``.
@@ -415,21 +456,24 @@ def orbital_aux_projection(L, primitives, alphas):
     rows = []
     fourpi_2Lp1 = 4.0 * pi / (2 * L + 1)
 
-    for la, n_a, aa in primitives:
-        Na = gto_norm(n_a, aa)
-        for lb, n_b, ab in primitives:
-            if L not in coupling_lvals(la, lb):
-                continue
-            Nb = gto_norm(n_b, ab)
-            base = Na * Nb * fourpi_2Lp1
-
-            # Radial vector over aux: depends on (n_a+n_b, alpha_a+alpha_b, alpha_P).
-            kern_P = base * N_aux * _aux_radial_vector(L, n_a + n_b, aa + ab, a_aux)
-
-            # Gaunt slab for this shell-pair at this L: (2la+1, 2lb+1, 2L+1).
-            G = gaunt_table(la, lb, L)
-            for g, _ima, _imb, _iM in _iter_nonzero_gaunt(G, la, lb, L):
-                rows.append(g * kern_P)
+    pairs = [(la, n_a, aa, lb, n_b, ab)
+             for la, n_a, aa in primitives
+             for lb, n_b, ab in primitives
+             if L in coupling_lvals(la, lb)]
+    if pairs:
+        # Radial grid over (pair, aux): depends on (n_a+n_b, alpha_a+alpha_b, alpha_P).
+        n_ab = np.asarray([n_a + n_b for (_la, n_a, _aa, _lb, n_b, _ab) in pairs], dtype=int)
+        a_ab = np.asarray([aa + ab for (_la, _na, aa, _lb, _nb, ab) in pairs], dtype=float)
+        rad = radial_integral_batch(L, n_ab[:, None], L, a_ab[:, None], a_aux[None, :])
+
+    for k, (la, n_a, aa, lb, n_b, ab) in enumerate(pairs):
+        base = gto_norm(n_a, aa) * gto_norm(n_b, ab) * fourpi_2Lp1
+        kern_P = base * N_aux * rad[k]
+
+        # Gaunt slab for this shell-pair at this L: (2la+1, 2lb+1, 2L+1).
+        G = gaunt_table(la, lb, L)
+        for g, _ima, _imb, _iM in _iter_nonzero_gaunt(G, la, lb, L):
+            rows.append(g * kern_P)
 
     if rows:
         J = np.vstack(rows)
@@ -443,6 +487,31 @@ def orbital_aux_projection(L, primitives, alphas):
 # ---------------------------------------------------------------------------
 
 
+def _coupled_L_candidates(shell_pairs, norm_fn):
+    """Per-candidate data shared by the coupled-L metric builders: the
+    product norms ``N_a N_b``, radial powers ``n_a + n_b`` and exponents
+    ``alpha_a + alpha_b`` of each shell-pair, and the candidate positions
+    grouped by radial power (``{n_ab: positions}``, ascending ``n_ab``).
+    """
+    n = len(shell_pairs)
+    norms = np.fromiter(
+        (norm_fn(na, aa) * norm_fn(nb, ab_)
+         for (_la, na, aa, _lb, nb, ab_) in shell_pairs),
+        dtype=float, count=n,
+    )
+    n_abs = np.fromiter(
+        (na + nb for (_la, na, _aa, _lb, nb, _ab) in shell_pairs),
+        dtype=int, count=n,
+    )
+    a_abs = np.fromiter(
+        (aa + ab_ for (_la, _na, aa, _lb, _nb, ab_) in shell_pairs),
+        dtype=float, count=n,
+    )
+    pos_by_n = {u: np.flatnonzero(n_abs == u)
+                for u in sorted(set(int(x) for x in n_abs))}
+    return norms, n_abs, a_abs, pos_by_n
+
+
 def coupled_L_metric(L, shell_pairs, norm_fn=None, radial_fn=None):
     """One-per-shell-pair Coulomb metric at coupled channel ``L``.
 
@@ -486,19 +555,7 @@ def coupled_L_metric(L, shell_pairs, norm_fn=None, radial_fn=None):
     if n == 0:
         return M
     pref = 4.0 * pi / (2 * L + 1)
-    norms = np.fromiter(
-        (norm_fn(na, aa) * norm_fn(nb, ab_)
-         for (_la, na, aa, _lb, nb, ab_) in shell_pairs),
-        dtype=float, count=n,
-    )
-    n_abs = np.fromiter(
-        (na + nb for (_la, na, _aa, _lb, nb, _ab) in shell_pairs),
-        dtype=int, count=n,
-    )
-    a_abs = np.fromiter(
-        (aa + ab_ for (_la, _na, aa, _lb, _nb, ab_) in shell_pairs),
-        dtype=float, count=n,
-    )
+    norms, n_abs, a_abs, pos_by_n = _coupled_L_candidates(shell_pairs, norm_fn)
     # ``radial_fn(L, n_ab, n_cd, ...)`` takes the two radial-power
     # arguments as scalars (they steer selection rules and the closed-form
     # kn / km evaluation), but broadcasts naturally over its exponent
@@ -506,18 +563,10 @@ def coupled_L_metric(L, shell_pairs, norm_fn=None, radial_fn=None):
     # ``(alpha_ab, alpha_cd)`` grid inside each ``(n_ab, n_cd)`` block --
     # unique radial powers are ``O(l_max^2)`` at most, so a small number
     # of grouped calls replaces the ``O(n^2)`` scalar loop.
-    unique_n = sorted(set(int(x) for x in n_abs))
-    pos_by_n = {u: np.flatnonzero(n_abs == u) for u in unique_n}
-    for u in unique_n:
-        idx_u = pos_by_n[u]
-        if idx_u.size == 0:
-            continue
+    for u, idx_u in pos_by_n.items():
         a_u = a_abs[idx_u]
         norm_u = norms[idx_u]
-        for v in unique_n:
-            idx_v = pos_by_n[v]
-            if idx_v.size == 0:
-                continue
+        for v, idx_v in pos_by_n.items():
             a_v = a_abs[idx_v]
             norm_v = norms[idx_v]
             R = radial_fn(L, u, v, a_u[:, None], a_v[None, :])
@@ -526,6 +575,171 @@ def coupled_L_metric(L, shell_pairs, norm_fn=None, radial_fn=None):
     return M
 
 
+class _DenseCoupledMetric:
+    """Residual of one ``A_L`` block of :func:`coupled_shell_pair_screen`,
+    held as a dense matrix and downdated in place (the reference path).
+    """
+
+    def __init__(self, L, shell_pairs, norm_fn=None, radial_fn=None):
+        raw = coupled_L_metric(L, shell_pairs,
+                               norm_fn=norm_fn, radial_fn=radial_fn)
+        self.A = raw * (2 * L + 1) / (4.0 * pi)
+        self.outer_buf = np.empty_like(self.A)
+
+    def diagonal(self):
+        """Residual diagonal (only read before the first downdate)."""
+        return self.A.diagonal()
+
+    def downdate(self, j):
+        """Rank-1 Cholesky downdate at local index ``j``.  Returns the
+        change of the residual diagonal, or ``None`` when the pivot is
+        not positive (no downdate is made)."""
+        piv = float(self.A[j, j])
+        if piv <= 0.0:
+            return None
+        col = self.A[:, j].copy()
+        col_scaled = col / piv
+        np.multiply.outer(col_scaled, col, out=self.outer_buf)
+        self.A -= self.outer_buf
+        return col * col_scaled
+
+
+class _OnDemandCoupledMetric:
+    """Memory-bounded counterpart of :class:`_DenseCoupledMetric`.
+
+    Only the diagonal of ``A_L`` is built up front.  A column is
+    generated from the radial closures when its candidate is picked as a
+    pivot, and the residual column follows from the Cholesky vectors
+    ``V`` of the earlier pivots, ``A_L[:, j] - V V[j]^T``.  Memory is
+    ``O(n x rank)`` rather than ``O(n^2)``.
+    """
+
+    def __init__(self, L, shell_pairs, norm_fn=None, radial_fn=None):
+        if norm_fn is None:
+            norm_fn = gto_norm
+        if radial_fn is None:
+            radial_fn = radial_integral
+        self.L = L
+        self.radial_fn = radial_fn
+        self.norms, self.n_abs, self.a_abs, self.pos_by_n = \
+            _coupled_L_candidates(shell_pairs, norm_fn)
+        n = len(shell_pairs)
+        self.diag = np.empty(n, dtype=float)
+        for u, idx_u in self.pos_by_n.items():
+            a_u = self.a_abs[idx_u][:, None]
+            norm_u = self.norms[idx_u][:, None]
+            R = radial_fn(L, u, u, a_u, a_u)
+            self.diag[idx_u] = self._scale(norm_u * norm_u, R)[:, 0]
+        self.vectors = np.empty((n, min(n, 16)), dtype=float)
+        self.rank = 0
+
+    def _scale(self, norm_prod, R):
+        # Same operation order as coupled_L_metric followed by the
+        # prefactor stripping of _DenseCoupledMetric.
+        raw = (4.0 * pi / (2 * self.L + 1)) * norm_prod * R
+        return raw * (2 * self.L + 1) / (4.0 * pi)
+
+    def _column(self, j):
+        col = np.empty(self.diag.size, dtype=float)
+        v = int(self.n_abs[j])
+        a_j = self.a_abs[j:j + 1][None, :]
+        norm_j = self.norms[j:j + 1][None, :]
+        for u, idx_u in self.pos_by_n.items():
+            R = self.radial_fn(self.L, u, v, self.a_abs[idx_u][:, None], a_j)
+            col[idx_u] = self._scale(self.norms[idx_u][:, None] * norm_j, R)[:, 0]
+        return col
+
+    def diagonal(self):
+        """Diagonal of ``A_L`` (only read before the first downdate)."""
+        return self.diag
+
+    def downdate(self, j):
+        """Rank-1 Cholesky downdate at local index ``j``.  Returns the
+        change of the residual diagonal, or ``None`` when the pivot is
+        not positive (no downdate is made)."""
+        col = self._column(j)
+        if self.rank:
+            V = self.vectors[:, :self.rank]
+            col -= V @ V[j]
+        piv = float(col[j])
+        if piv <= 0.0:
+            return None
+        vec = col / np.sqrt(piv)
+        if self.rank == self.vectors.shape[1]:
+            grown = np.empty((self.vectors.shape[0], 2 * self.rank), dtype=float)
+            grown[:, :self.rank] = self.vectors
+            self.vectors = grown
+        self.vectors[:, self.rank] = vec
+        self.rank += 1
+        return vec * vec
+
+
+class _ScreenedCoupledMetric(_OnDemandCoupledMetric):
+    """:class:`_OnDemandCoupledMetric` with exponent-window screening.
+
+    For every pair of radial powers ``(u, v)`` the Schwarz-normalised
+    coupling ``c(t) = |A_L(P, Q)| / sqrt(A_L(P, P) A_L(Q, Q))`` is a
+    function of the exponent ratio ``t = alpha_P / alpha_Q`` alone.  It
+    is tabulated on a logarithmic grid spanning the ratios present, and
+    the window ``[t_lo, t_hi]`` with ``c >= screen_tol`` (widened by one
+    grid step on either side) is kept.  Candidates are sorted by exponent
+    within each radial power, so a column only evaluates the contiguous
+    band of each group inside the window; the other entries are zero.
+    """
+
+    #: Grid spacing (in decades of the exponent ratio) of the window tables
+    _window_step = 0.05
+
+    def __init__(self, L, shell_pairs, norm_fn=None, radial_fn=None, screen_tol=metric_screen_tol):
+        super().__init__(L, shell_pairs, norm_fn=norm_fn, radial_fn=radial_fn)
+        # Exponent-sorted positions of each radial-power group
+        self.sorted_by_n = {}
+        for u, idx_u in self.pos_by_n.items():
+            order = np.argsort(self.a_abs[idx_u], kind='stable')
+            self.sorted_by_n[u] = (idx_u[order], self.a_abs[idx_u][order])
+        self.windows = {}
+        if self.a_abs.size:
+            log_a = np.log10(self.a_abs)
+            span = log_a.max() - log_a.min() + 2 * self._window_step
+            log_t = np.arange(-span, span + self._window_step, self._window_step)
+            for u in self.pos_by_n:
+                for v in self.pos_by_n:
+                    self.windows[(u, v)] = self._window(u, v, log_t, screen_tol)
+
+    def _window(self, u, v, log_t, screen_tol):
+        """Exponent-ratio window ``(t_lo, t_hi)`` of the ``(u, v)`` block, or
+        ``None`` if every entry is negligible."""
+        t = 10.0**log_t
+        one = np.ones_like(t)
+        with np.errstate(all='ignore'):
+            c = np.abs(self.radial_fn(self.L, u, v, t, one))
+            c = c / np.sqrt(self.radial_fn(self.L, u, u, t, t) * self.radial_fn(self.L, v, v, one, one))
+        # Non-finite values (over/underflow at extreme ratios) are kept
+        keep = np.flatnonzero(~(c < screen_tol))
+        if keep.size == 0:
+            return None
+        step = 10.0**self._window_step
+        return t[keep[0]] / step, t[keep[-1]] * step
+
+    def _column(self, j):
+        col = np.zeros(self.diag.size, dtype=float)
+        v = int(self.n_abs[j])
+        a_j = float(self.a_abs[j])
+        norm_j = self.norms[j]
+        for u, (idx_u, a_u) in self.sorted_by_n.items():
+            window = self.windows[(u, v)]
+            if window is None:
+                continue
+            lo = np.searchsorted(a_u, window[0] * a_j, side='left')
+            hi = np.searchsorted(a_u, window[1] * a_j, side='right')
+            if lo == hi:
+                continue
+            band = idx_u[lo:hi]
+            R = self.radial_fn(self.L, u, v, a_u[lo:hi][:, None], np.full((1, 1), a_j))
+            col[band] = self._scale(self.norms[band][:, None] * norm_j, R)[:, 0]
+        return col
+
+
 # ---------------------------------------------------------------------------
 # Shell-pair-vectorised four-index Coulomb metric (dense; reference).
 # ---------------------------------------------------------------------------
@@ -31,5 +31,16 @@
 # it enables autocompletion
 # PYTHON_ARGCOMPLETE_OK
 
-from .bse_cli import run_bse_cli
-from .bsecurate_cli import run_bsecurate_cli
+# The command line modules are only imported when the corresponding
+# program is run, so that bse does not import all of the curation
+# functionality (and vice versa)
+
+
+def run_bse_cli():
+    from .bse_cli import run_bse_cli
+    return run_bse_cli()
+
+
+def run_bsecurate_cli():
+    from .bsecurate_cli import run_bsecurate_cli
+    return run_bsecurate_cli()
@@ -38,6 +38,7 @@ from basis_set_exchange import get_version
 from basis_set_exchange.api import _normalize_get_aux
 from basis_set_exchange.cli.bse_handlers import bse_cli_handle_subcmd
 from basis_set_exchange.cli.check import cli_check_normalize_args
+from basis_set_exchange.cli.server import forward_to_server
 from basis_set_exchange.cli.complete import (cli_case_insensitive_validator, cli_family_completer, cli_role_completer,
                                              cli_bsname_completer, cli_write_fmt_completer, cli_read_fmt_completer,
                                              cli_reffmt_completer)
@@ -160,8 +161,8 @@ def run_bse_cli():
                       help='Instead of the orbital basis, return an automatically formed auxiliary basis. '
                            'MODE is one of: none (default), autoaux, autoabs, cholesky-small, '
                            'cholesky-large, cholesky-verylarge. The legacy integer aliases '
-                           '0-5 are still accepted. The cholesky-* modes need numpy plus '
-                           'wignernj or sympy.')
+                           '0-5 are still accepted. The cholesky-* modes need numpy (plus '
+                           'wignernj or sympy for angular momenta beyond the Gaunt table store).')
 
     # get-refs subcommand
     subp = subparsers.add_parser('get-refs', help='Output references for a basis set')
@@ -284,6 +285,9 @@ def run_bse_cli():
                            'the JCTC 2023 paper (default: on; use --no-prune-lmax to keep them)')
     subp.add_argument('--linc', type=int, default=1,
                       help='Increment parameter l_inc in the pruning rule (default 1)')
+    subp.add_argument('--profile', action='store_true',
+                      help='Print wall time, matrix sizes, pivot counts and cache hits of each stage, '
+                           'per element and per L')
 
     #################################
     # Creating bundles
@@ -294,6 +298,18 @@ def run_bse_cli():
     subp.add_argument('bundle_file', help='Bundle/Archive file to create')
     subp.add_argument('--archive-type', help='Override the type of archive to create (zip or tbz)')
 
+    #################################
+    # Warm-cache server
+    #################################
+    subp = subparsers.add_parser('serve',
+                                 help='Run a server that keeps basis set data in memory. While it is running, '
+                                 'other bse commands are forwarded to it')
+    subp.add_argument('--socket', metavar='PATH', default=None,
+                      help='Unix socket to listen on (default: $BSE_SERVER_SOCKET, or a per-user socket in '
+                           '$XDG_RUNTIME_DIR or the temporary directory)')
+    subp.add_argument('--cache-size', type=int, default=1024,
+                      help='Maximum number of formatted outputs to keep in memory (default 1024)')
+
     #############################
     # DONE WITH SUBCOMMANDS
     #############################
@@ -304,11 +320,16 @@ def run_bse_cli():
     # Now parse and handle the args
     args = parser.parse_args()
 
-    # Check and make sure basis sets, roles, etc, are valid
-    args = cli_check_normalize_args(args)
+    # If a server is running, let it handle the request. Otherwise,
+    # output is None and we handle it here
+    output = forward_to_server(args)
+
+    if output is None:
+        # Check and make sure basis sets, roles, etc, are valid
+        args = cli_check_normalize_args(args)
 
-    # Actually generate the output
-    output = bse_cli_handle_subcmd(args)
+        # Actually generate the output
+        output = bse_cli_handle_subcmd(args)
 
     with args.output:
         args.output.write(output + '\n')
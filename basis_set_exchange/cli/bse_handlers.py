@@ -32,9 +32,12 @@
 Handlers for command line subcommands
 '''
 
-from .. import api, bundle, readers, writers, refconverters, convert, manip
+import contextlib
+
+from .. import api, readers, writers, refconverters, convert, manip
 from ..misc import compact_elements
 from .common import format_columns
+from .server import run_server
 
 
 def _bse_cli_list_basis_sets(args):
@@ -238,6 +241,8 @@ def _bse_cli_convert_basis(args):
 
 def _bse_cli_create_bundle(args):
     '''Handles the create-bundle subcommand'''
+    from .. import bundle
+
     bundle.create_bundle(args.bundle_file, args.fmt, args.reffmt, args.archive_type, args.data_dir)
     return "Created " + args.bundle_file
 
@@ -275,26 +280,27 @@ def _bse_cli_autoabs_basis(args):
 def _bse_cli_autogen_aux(args):
     '''Handles the autogen-aux subcommand (Lehtola JCTC 2021/2023 procedure).'''
 
-    from basis_set_exchange.auxgen import generate_auxiliary_basis
+    from basis_set_exchange.auxgen import generate_auxiliary_basis, profiling
 
     orbital_basis_dict = readers.read_formatted_basis_file(args.input_file, args.in_fmt)
     orbital_basis_dict.setdefault('revision_description', '')
     orbital_basis_dict.setdefault('version', '')
 
-    aux = generate_auxiliary_basis(
-        orbital_basis_dict,
-        threshold=args.threshold,
-        scheme=args.scheme,
-        n_random=args.n_random,
-        seed=args.seed,
-        mapping=args.mapping,
-        collapse_contractions=args.collapse_contractions,
-        size=args.size,
-        contract=args.contract,
-        contract_threshold=args.contract_threshold,
-        prune_lmax=args.prune_lmax,
-        linc=args.linc,
-    )
+    with profiling.profile() if args.profile else contextlib.nullcontext() as report:
+        aux = generate_auxiliary_basis(
+            orbital_basis_dict,
+            threshold=args.threshold,
+            scheme=args.scheme,
+            n_random=args.n_random,
+            seed=args.seed,
+            mapping=args.mapping,
+            collapse_contractions=args.collapse_contractions,
+            size=args.size,
+            contract=args.contract,
+            contract_threshold=args.contract_threshold,
+            prune_lmax=args.prune_lmax,
+            linc=args.linc,
+        )
     # The writer requires the same metadata fields the reader leaves behind.
     aux.setdefault('revision_description', '')
     aux.setdefault('version', '')
@@ -302,8 +308,16 @@ def _bse_cli_autogen_aux(args):
     aux.setdefault('function_types', ['gto_spherical'])
 
     writers.write_formatted_basis_file(aux, args.output_file, args.out_fmt)
-    return "Orbital basis {} -> auxgen basis {} (scheme={}, tau={})".format(
-        args.input_file, args.output_file, args.scheme, args.threshold)
+    ret = "Orbital basis {} -> auxgen basis {} (scheme={}, tau={})".format(args.input_file, args.output_file,
+                                                                           args.scheme, args.threshold)
+    if report is not None:
+        ret += '\n\n' + report.format()
+    return ret
+
+
+def _bse_cli_serve(args):
+    '''Handles the serve subcommand'''
+    return run_server(args.socket, args.cache_size)
 
 
 def bse_cli_handle_subcmd(args):
@@ -329,6 +343,7 @@ def bse_cli_handle_subcmd(args):
         'autoaux-basis': _bse_cli_autoaux_basis,
         'autoabs-basis': _bse_cli_autoabs_basis,
         'autogen-aux': _bse_cli_autogen_aux,
+        'serve': _bse_cli_serve,
     }
 
     return handler_map[args.subcmd](args)
@@ -33,7 +33,7 @@ Completers & validators for argcomplete
 '''
 
 import os
-from .. import api, writers, readers
+from .. import api, fileio, writers, readers
 
 
 def _fix_datadir(data_dir):
@@ -45,6 +45,31 @@ def _fix_datadir(data_dir):
     return data_dir
 
 
+def _completion_index(data_dir=None):
+    '''Read the COMPLETION.json index of a data directory
+
+    argcomplete runs in a new process for every TAB press, so reading this small
+    file is much faster than reading all the metadata. If the index does not exist
+    (or can't be read), None is returned and the completers fall back to the api.
+    '''
+
+    data_dir = api.fix_data_dir(data_dir)
+
+    try:
+        return fileio.read_completion_index(os.path.join(data_dir, 'COMPLETION.json'))
+    except (OSError, RuntimeError):
+        return None
+
+
+def _complete_from_index(index_key, fallback, data_dir=None):
+    '''Obtain completions from the index, or call the fallback function if there is no index'''
+
+    index = _completion_index(data_dir)
+    if index is None or index_key not in index:
+        return fallback()
+    return index[index_key]
+
+
 def cli_case_insensitive_validator(s1, s2):
     s1 = s1.lower()
     s2 = s2.lower()
@@ -54,30 +79,30 @@ def cli_case_insensitive_validator(s1, s2):
 def cli_bsname_completer(**kwargs):
     # Get the data dir if it has been specified already
     data_dir = _fix_datadir(kwargs['parsed_args'].data_dir)
-    return api.get_all_basis_names(data_dir)
+    return _complete_from_index('basis_names', lambda: api.get_all_basis_names(data_dir), data_dir)
 
 
 def cli_family_completer(**kwargs):
     # Get the data dir if it has been specified already
     data_dir = _fix_datadir(kwargs['parsed_args'].data_dir)
-    return api.get_families(data_dir)
+    return _complete_from_index('families', lambda: api.get_families(data_dir), data_dir)
 
 
 def cli_write_fmt_completer(**kwargs):
-    return writers.get_writer_formats()
+    return _complete_from_index('writer_formats', writers.get_writer_formats)
 
 
 def cli_read_fmt_completer(**kwargs):
-    return readers.get_reader_formats()
+    return _complete_from_index('reader_formats', readers.get_reader_formats)
 
 
 def cli_reffmt_completer(**kwargs):
-    return api.get_reference_formats()
+    return _complete_from_index('reference_formats', api.get_reference_formats)
 
 
 def cli_role_completer(**kwargs):
-    return api.get_roles()
+    return _complete_from_index('roles', api.get_roles)
 
 
 def cli_readerfmt_completer(**kwargs):
-    return readers.get_reader_formats()
+    return _complete_from_index('reader_formats', readers.get_reader_formats)
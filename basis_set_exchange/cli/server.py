@@ -0,0 +1,283 @@
+# Copyright (c) 2017-2022 The Molecular Sciences Software Institute, Virginia Tech
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived
+# from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Warm-cache server mode for the bse command line interface
+
+``bse serve`` starts a long-running process listening on a Unix socket.
+It keeps the metadata, composed basis sets (via the usual memoization)
+and the formatted output of previous requests in memory. When the server
+is running, the ``bse`` command forwards data queries to it rather than
+composing the basis set from scratch in a fresh interpreter.
+
+The location of the socket can be changed with the ``BSE_SERVER_SOCKET``
+environment variable. Forwarding can be disabled by setting ``BSE_NO_SERVER``
+to a non-empty value.
+'''
+
+import argparse
+import collections
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+
+# Subcommands that only query the data directory and write their result to
+# stdout. Anything else (conversion, bundles, auxiliary basis generation) reads or
+# writes files relative to the caller and is always run locally
+forwarded_subcmds = {
+    'list-basis-sets', 'list-families', 'lookup-by-role', 'get-basis', 'get-refs', 'get-info', 'get-notes',
+    'get-family', 'get-versions', 'get-family-notes'
+}
+
+# Exceptions that are re-raised with the same type by the client. Anything
+# else is turned into a RuntimeError
+_known_exceptions = {e.__name__: e for e in (RuntimeError, KeyError, ValueError, TypeError, IndexError)}
+
+# How long the client waits to connect before falling back to running locally (seconds)
+_connect_timeout = 1.0
+
+
+def get_socket_path():
+    '''Obtain the path to the Unix socket used by the server
+
+    This is taken from the ``BSE_SERVER_SOCKET`` environment variable if set.
+    Otherwise, it is a per-user file in ``XDG_RUNTIME_DIR`` (or the temporary directory).
+    '''
+
+    sock_path = os.environ.get('BSE_SERVER_SOCKET')
+    if sock_path:
+        return os.path.expanduser(sock_path)
+
+    run_dir = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(run_dir, 'bse-{}.sock'.format(os.getuid()))
+
+
+def _library_version():
+    from .. import get_version
+    return get_version()
+
+
+def _request_from_args(args):
+    '''Create a JSON-serializable request from parsed command line arguments
+
+    The output file is handled by the client, and the data directory is made
+    absolute since the server may be running in a different directory.
+    '''
+
+    req = {k: v for k, v in vars(args).items() if k != 'output'}
+
+    if req.get('data_dir'):
+        data_dir = os.path.expandvars(os.path.expanduser(req['data_dir']))
+        req['data_dir'] = os.path.abspath(data_dir)
+
+    return req
+
+
+def _send_request(sock_path, request):
+    '''Send a single request to the server and return the decoded response
+
+    Returns None if there is no server listening at `sock_path`
+    '''
+
+    if not os.path.exists(sock_path):
+        return None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(_connect_timeout)
+        try:
+            sock.connect(sock_path)
+        except OSError:
+            return None
+
+        # Some requests (ie, auxiliary basis generation) can take a long time
+        sock.settimeout(None)
+        with sock.makefile('rwb') as f:
+            f.write(json.dumps(request).encode('utf-8') + b'\n')
+            f.flush()
+            response = f.readline()
+
+    if not response:
+        return None
+
+    return json.loads(response.decode('utf-8'))
+
+
+def forward_to_server(args):
+    '''Run a bse subcommand on a running server, if possible
+
+    Returns the output of the subcommand, or None if the subcommand cannot be forwarded
+    (no server running, server from a different version of the library, etc). In that case,
+    the subcommand should be handled locally.
+
+    If the server reports an error, it is raised here.
+    '''
+
+    if os.environ.get('BSE_NO_SERVER') or not hasattr(socket, 'AF_UNIX'):
+        return None
+
+    if args.subcmd not in forwarded_subcmds:
+        return None
+
+    request = {'version': _library_version(), 'args': _request_from_args(args)}
+    response = _send_request(get_socket_path(), request)
+
+    if response is None or response['status'] == 'mismatch':
+        return None
+
+    if response['status'] == 'error':
+        exc_type = _known_exceptions.get(response['type'], RuntimeError)
+        raise exc_type(*response['args'])
+
+    return response['output']
+
+
+class _BSERequestHandler(socketserver.StreamRequestHandler):
+    '''Handles a single request (one JSON line in, one JSON line out)'''
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+
+        try:
+            request = json.loads(line.decode('utf-8'))
+            response = self.server.process_request_data(request)
+        except Exception as ex:
+            response = {'status': 'error', 'type': type(ex).__name__, 'args': [str(x) for x in ex.args]}
+
+        self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+
+
+class BSEServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    '''Server that answers bse subcommands from warm in-memory caches
+
+    Metadata and composed basis sets are kept via the library's memoization
+    (see :mod:`basis_set_exchange.memo`). In addition, the output of the most recent
+    `cache_size` distinct requests is stored and returned directly.
+    '''
+
+    daemon_threads = True
+
+    def __init__(self, sock_path, cache_size=1024):
+        self.sock_path = sock_path
+        self.cache_size = cache_size
+        self.version = _library_version()
+
+        self._output_cache = collections.OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        _remove_stale_socket(sock_path)
+
+        # Only the owner should be able to talk to the server
+        old_umask = os.umask(0o177)
+        try:
+            socketserver.UnixStreamServer.__init__(self, sock_path, _BSERequestHandler)
+        finally:
+            os.umask(old_umask)
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        if os.path.exists(self.sock_path):
+            os.remove(self.sock_path)
+
+    def process_request_data(self, request):
+        '''Process a decoded request, returning the response as a dictionary'''
+
+        # Imported here to avoid a circular import with bse_handlers/check
+        from .bse_handlers import bse_cli_handle_subcmd
+        from .check import cli_check_normalize_args
+
+        if request.get('version') != self.version:
+            return {'status': 'mismatch', 'version': self.version}
+
+        key = json.dumps(request['args'], sort_keys=True)
+        with self._cache_lock:
+            if key in self._output_cache:
+                self._output_cache.move_to_end(key)
+                return {'status': 'ok', 'output': self._output_cache[key]}
+
+        args = cli_check_normalize_args(argparse.Namespace(**request['args']))
+        output = bse_cli_handle_subcmd(args)
+
+        if self.cache_size > 0:
+            with self._cache_lock:
+                self._output_cache[key] = output
+                while len(self._output_cache) > self.cache_size:
+                    self._output_cache.popitem(last=False)
+
+        return {'status': 'ok', 'output': output}
+
+
+def _remove_stale_socket(sock_path):
+    '''Removes a socket file left behind by a server that is no longer running
+
+    If a server is still listening on the socket, an exception is raised
+    '''
+
+    if not os.path.exists(sock_path):
+        return
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(sock_path)
+        except OSError:
+            os.remove(sock_path)
+            return
+
+    raise RuntimeError("A server is already listening on '{}'".format(sock_path))
+
+
+def run_server(sock_path=None, cache_size=1024):
+    '''Run the bse server in the foreground until interrupted
+
+    Parameters
+    ----------
+    sock_path : str
+        Path to the Unix socket to listen on. By default, this is given by :func:`get_socket_path`
+    cache_size : int
+        Maximum number of formatted outputs to keep in memory
+    '''
+
+    if not hasattr(socket, 'AF_UNIX'):
+        raise RuntimeError("The bse server requires Unix domain socket support")
+
+    if sock_path is None:
+        sock_path = get_socket_path()
+
+    with BSEServer(sock_path, cache_size) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+    return "Server on {} stopped".format(sock_path)
@@ -159,3 +159,66 @@ def compose_table_basis(file_relpath, data_dir):
     table_bs['molssi_bse_schema'] = {"schema_type": "complete", "schema_version": "0.1"}
 
     return table_bs
+
+
+def _component_references(file_relpath, data_dir):
+    """
+    Reads the reference information for all elements in a component file
+
+    The returned dictionary maps elements to a single reference entry
+    (containing 'reference_description' and 'reference_keys'), in the same
+    form as is used in :func:`compose_elemental_basis`
+    """
+
+    comp_bs = fileio.read_json_basis(os.path.join(data_dir, file_relpath))
+
+    return {
+        el: {
+            'reference_description': comp_bs['description'],
+            'reference_keys': el_data['references']
+        }
+        for el, el_data in comp_bs['elements'].items()
+    }
+
+
+@memo.BSEMemoize
+def compose_table_references(file_relpath, data_dir):
+    """
+    Obtains only the reference information of a 'table' basis
+
+    This follows the table, elemental, and component files in the same way
+    as :func:`compose_table_basis`, but only the reference keys and descriptions
+    are kept. Electron shells and ECP potentials are never merged or copied.
+
+    Returns a dictionary mapping elements to a list of reference entries. This list
+    is the same as the 'references' entry of the element in the composed basis set.
+    """
+
+    table_bs = fileio.read_json_basis(os.path.join(data_dir, file_relpath))
+
+    # Element and component files are often shared between many elements
+    element_map = {}
+    component_map = {}
+
+    element_refs = {}
+    for k, entry in table_bs['elements'].items():
+        if entry not in element_map:
+            element_map[entry] = fileio.read_json_basis(os.path.join(data_dir, entry))['elements']
+
+        el_data = element_map[entry]
+        if k not in el_data:
+            raise KeyError('File {} does not contain element {}'.format(entry, k))
+
+        refs = []
+        for c in el_data[k]['components']:
+            if c not in component_map:
+                component_map[c] = _component_references(c, data_dir)
+
+            if k not in component_map[c]:
+                raise RuntimeError('File {} does not contain element {}'.format(c, k))
+
+            refs.append(component_map[c][k])
+
+        element_refs[k] = refs
+
+    return element_refs
@@ -31,7 +31,7 @@
 Functions for helping curate BSE basis set data
 '''
 
-from .metadata import create_metadata_file
+from .metadata import create_metadata_file, create_completion_index, create_rendered_references_file
 from .add_basis import add_basis, add_basis_from_dict, add_from_components, add_elements, add_elements_from_dict
 from .compare_report import basis_comparison_report, compare_basis_against_file, compare_basis_files, compare_basis_sets, shells_difference, potentials_difference
 from .compare import (compare_electron_shells, electron_shells_are_subset,
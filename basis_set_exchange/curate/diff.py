@@ -32,16 +32,16 @@
 Computes the difference between basis sets and files
 '''
 
-import copy
 from .compare import compare_electron_shells
-from .. import fileio
+from .. import fileio, misc
 
 
 def subtract_electron_shells(s1, s2, rel_tol=0.0):
     """
     Returns the difference between two lists of electron shells (s1 - s2)
 
-    This will remove any shells from s1 that are also in s2, within a tolerance
+    This will remove any shells from s1 that are also in s2, within a tolerance.
+    The shells in the returned list are those of s1 (they are not copied).
     """
 
     diff_shells = []
@@ -50,7 +50,7 @@ def subtract_electron_shells(s1, s2, rel_tol=0.0):
             if compare_electron_shells(sh1, sh2, rel_tol=rel_tol):
                 break
         else:
-            diff_shells.append(copy.deepcopy(sh1))
+            diff_shells.append(sh1)
 
     return diff_shells
 
@@ -66,7 +66,7 @@ def diff_basis_dict(left_list, right_list):
     This only works on the shell level, and will only subtract entire shells
     that are identical. ECP potentials are not affected.
 
-    The return value contains deep copies of the input data
+    The input is not modified, but the return value shares data (such as shells) with `left_list`
 
     Parameters
     ----------
@@ -83,7 +83,7 @@ def diff_basis_dict(left_list, right_list):
 
     ret = []
     for bs1 in left_list:
-        res = copy.deepcopy(bs1)
+        res = misc.shallow_copy_basis(bs1)
         for bs2 in right_list:
             for el in res['elements'].keys():
                 if el not in bs2['elements']:
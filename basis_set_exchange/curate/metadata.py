@@ -34,11 +34,60 @@ Helpers for handling BSE metadata
 
 import os
 
+from .. import api, readers, writers, refconverters
 from ..compose import compose_table_basis
 from ..fileio import get_all_filelist, read_json_basis, _write_plain_json
 from ..misc import transform_basis_name
 
 
+def create_completion_index(output_path, metadata):
+    '''Creates a COMPLETION.json file from the metadata of all basis sets
+
+    This file contains only what is needed for TAB completion on the command
+    line (basis set names, families, roles, and formats), so that the completers
+    do not have to read the (much larger) METADATA.json file.
+
+    The file is written to output_path
+    '''
+
+    families = set(v['family'] for v in metadata.values())
+
+    # yapf: disable
+    index = { 'basis_names': sorted(v['display_name'] for v in metadata.values()),
+              'families': sorted(families),
+              'roles': api.get_roles(),
+              'writer_formats': writers.get_writer_formats(),
+              'reader_formats': readers.get_reader_formats(),
+              'reference_formats': refconverters.get_reference_formats()
+            }
+    # yapf: enable
+
+    _write_plain_json(output_path, index)
+
+
+def create_rendered_references_file(output_path, data_dir):
+    '''Creates a RENDERED_REFERENCES.json file from a data directory
+
+    This file contains all the references of the data directory, already
+    converted to all the reference formats. If it exists in the data
+    directory, :func:`basis_set_exchange.api.get_references` uses it rather than
+    converting the references again. It is only used with the same version
+    of the library that created it.
+
+    The file is written to output_path
+    '''
+
+    ref_data = api.get_reference_data(data_dir)
+
+    # yapf: disable
+    rendered = { 'library_version': api.version(),
+                 'formats': refconverters.render_all_references(ref_data)
+               }
+    # yapf: enable
+
+    _write_plain_json(output_path, rendered)
+
+
 def create_metadata_file(output_path, data_dir):
     '''Creates a METADATA.json file from a data directory
 
@@ -146,3 +195,7 @@ def create_metadata_file(output_path, data_dir):
     # Write out the metadata
     metadata = dict(sorted(metadata.items()))
     _write_plain_json(output_path, metadata)
+
+    # The completion index always goes next to the metadata file
+    index_path = os.path.join(os.path.dirname(output_path), 'COMPLETION.json')
+    create_completion_index(index_path, metadata)
@@ -38,6 +38,7 @@ import bz2
 import os
 
 from .sort import sort_basis_dict, sort_references_dict
+from . import tracing
 
 # The encoding to use for reading/writing files.
 # For all the files in the project, UTF-8 is used
@@ -70,6 +71,9 @@ def _read_plain_json(file_path, check_bse):
         raise FileNotFoundError('JSON file \'{}\' does not exist, is not '
                                 'readable, or is not a file'.format(file_path))
 
+    if tracing.enabled():
+        tracing.count(files_read=1, bytes_read=os.path.getsize(file_path))
+
     try:
         if file_path.endswith('.bz2'):
             with bz2.open(file_path, 'rt', encoding=_default_encoding) as f:
@@ -170,6 +174,32 @@ def read_metadata(file_path):
     return _read_plain_json(file_path, False)
 
 
+def read_completion_index(file_path):
+    """
+    Reads a file containing the data used for command line completion
+
+    Parameters
+    ----------
+    file_path : str
+        Full path to the file to read
+    """
+
+    return _read_plain_json(file_path, False)
+
+
+def read_rendered_references(file_path):
+    """
+    Reads a file containing precomputed rendered references
+
+    Parameters
+    ----------
+    file_path : str
+        Full path to the file to read
+    """
+
+    return _read_plain_json(file_path, False)
+
+
 def write_json_basis(file_path, bs):
     """
     Write basis set information to a JSON file
@@ -234,7 +264,7 @@ def get_all_filelist(data_dir):
     all_element = []
     all_component = []
 
-    special = ['METADATA.json', 'REFERENCES.json']
+    special = ['METADATA.json', 'REFERENCES.json', 'COMPLETION.json', 'RENDERED_REFERENCES.json']
 
     for root, dirs, files in os.walk(data_dir):
         for basename in files:
@@ -36,15 +36,15 @@ Written by Susi Lehtola, 2020
 
 from math import gamma, sqrt
 
-try:
-    import numpy
-    _use_numpy = True
-except ImportError:
-    _use_numpy = False
+# NumPy is optional. Since it is slow to import, whether it is available
+# is only determined the first time it is needed (see _have_numpy)
+_use_numpy = None
 
 
 def _transform_numpy(C0, P0):
     """Transforms the primitive integrals P into the contracted basis C using NumPy"""
+    import numpy
+
     C = numpy.asarray(C0)
     P = numpy.asarray(P0)
     np_result = numpy.dot(numpy.dot(C, P), C.T)
@@ -101,10 +101,25 @@ def _to_int(M):
         return M.copy()
 
 
+def _have_numpy():
+    """Determines (once) if NumPy is available"""
+
+    global _use_numpy
+
+    if _use_numpy is None:
+        try:
+            import numpy
+            _use_numpy = True
+        except ImportError:
+            _use_numpy = False
+
+    return _use_numpy
+
+
 def _transform(C, P):
     """Transforms the primitive integrals P into the contracted basis C in numpy if it's available"""
 
-    if _use_numpy:
+    if _have_numpy():
         return _transform_numpy(C, P)
     else:
         return _transform_python(C, P)
@@ -219,6 +234,65 @@ def gto_R_contr(exps0, contr0, l):
     return _transform(contr, rmat)
 
 
+def _gto_R_diagonal_numpy(exps, contr, l):
+    """Computes the diagonal of the normalized contracted <r> matrix using NumPy"""
+    import numpy
+
+    a = numpy.asarray(exps)
+    C = numpy.asarray(contr)
+
+    # Primitive overlap and <r> matrices (see _gto_overlap and _gto_R)
+    ab = 0.5 * numpy.add.outer(a, a)
+    prod = numpy.multiply.outer(a, a)
+    sqrtab = numpy.sqrt(prod)
+    ovl = (prod / (ab * ab))**(l / 2 + 3 / 4)
+    prefactor = gamma(l + 2) / (sqrt(2) * gamma(l + 3 / 2))
+    rmat = prefactor * (1.0 / numpy.sqrt(sqrtab) * (sqrtab / ab)**(l + 2))
+
+    # Normalize the contractions, and transform (as in gto_R_contr)
+    normfac = 1.0 / numpy.sqrt(numpy.diagonal(numpy.dot(numpy.dot(C, ovl), C.T)))
+    C = C * normfac[:, numpy.newaxis]
+    return numpy.diagonal(numpy.dot(numpy.dot(C, rmat), C.T)).tolist()
+
+
+def _gto_R_diagonal_python(exps, contr, l):
+    """Computes the diagonal of the normalized contracted <r> matrix in pure Python"""
+
+    rmat = _gto_R(exps, l)
+    ovl = _gto_overlap(exps, l)
+    contr = _normalize_contraction(contr, ovl)
+
+    # Diagonal of C R C^T, summed in the same order as _transform_python
+    nprim = len(exps)
+    ret = []
+    for c in contr:
+        rval = 0.0
+        for k in range(nprim):
+            rc = 0.0
+            for m in range(nprim):
+                rc += rmat[k][m] * c[m]
+            rval += c[k] * rc
+        ret.append(rval)
+    return ret
+
+
+def gto_R_contr_diagonal(exps0, contr0, l):
+    """Computes the diagonal of the r matrix in the contracted basis
+    (see :func:`gto_R_contr`), that is, <r> for each of the normalized
+    contractions. This is cheaper than computing the whole matrix.
+
+    """
+
+    # Convert exponents and contractions to floating point
+    exps = _to_float(exps0)
+    contr = _to_float(contr0)
+
+    if _have_numpy():
+        return _gto_R_diagonal_numpy(exps, contr, l)
+    else:
+        return _gto_R_diagonal_python(exps, contr, l)
+
+
 def _gto_Rsq(exps, l):
     """Computes the r^2 matrix for the given exponents, assuming the basis
     functions are of the normalized spherical form r^l exp(-z r^2).
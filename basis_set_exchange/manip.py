@@ -33,11 +33,18 @@ Common basis set manipulations
 
 This module contains functions for uncontracting and merging basis set
 data, as well as some other small functions.
+
+Functions taking a ``use_copy`` argument do not modify the input basis set if it is
+True. The basis set is not copied as a whole; instead, the returned basis set shares
+any data that was not changed (such as shells that did not need to be modified)
+with the input. The returned data should therefore not be modified in place.
 """
 
+import os
 import copy
+import concurrent.futures
 from . import skel, misc
-from .ints import gto_R_contr
+from .ints import gto_R_contr_diagonal, _have_numpy
 from .lut import function_type_from_am
 from . import compose
 from math import gamma, pi, exp, log
@@ -103,12 +110,30 @@ def merge_element_data(dest, sources, use_copy=True):
     return ret
 
 
+def _freeze_list(lst):
+    '''Converts a (nested) list into a (nested) tuple'''
+    return tuple(_freeze_list(x) if isinstance(x, list) else x for x in lst)
+
+
+def _shell_fingerprint(shell):
+    '''Returns a hashable representation of a shell
+
+    Two shells have the same fingerprint exactly when they compare equal (the exponents
+    and coefficients are compared as strings, as in the shell dictionaries themselves)
+    '''
+
+    return tuple(sorted((k, _freeze_list(v) if isinstance(v, list) else v) for k, v in shell.items()))
+
+
 def prune_shell(shell, use_copy=True):
     """
     Removes exact duplicates of primitives, and condenses duplicate exponents
     into general contractions
 
     Also removes primitives if all coefficients are zero
+
+    If use_copy is True, the input shell is not modified. If nothing needs to be
+    removed, the input shell itself is returned.
     """
 
     new_exponents = []
@@ -120,18 +145,17 @@ def prune_shell(shell, use_copy=True):
     # transpose of the coefficient matrix
     coeff_t = list(map(list, zip(*shell['coefficients'])))
 
-    # Group by exponents
-    ex_groups = []
+    # Group by exponents (as floats), keeping the order of first appearance
+    ex_groups = {}
     for i in range(nprim):
-        for ex in ex_groups:
-            if float(exponents[i]) == float(ex[0]):
-                ex[1].append(coeff_t[i])
-                break
+        fex = float(exponents[i])
+        if fex in ex_groups:
+            ex_groups[fex][1].append(coeff_t[i])
         else:
-            ex_groups.append((exponents[i], [coeff_t[i]]))
+            ex_groups[fex] = (exponents[i], [coeff_t[i]])
 
     # Now collapse within groups
-    for ex in ex_groups:
+    for ex in ex_groups.values():
         if len(ex[1]) == 1:
             # only add if there is a nonzero contraction coefficient
             if not all([float(x) == 0.0 for x in ex[1][0]]):
@@ -168,12 +192,35 @@ def prune_shell(shell, use_copy=True):
     # as the slowest index
     new_coefficients = list(map(list, zip(*new_coefficients)))
 
+    if use_copy:
+        if new_exponents == exponents and new_coefficients == shell['coefficients']:
+            return shell
+        shell = shell.copy()
+
     shell['exponents'] = new_exponents
     shell['coefficients'] = new_coefficients
 
     return shell
 
 
+def _prune_shells(shells):
+    '''Prunes a list of shells of an element (see :func:`prune_basis`)'''
+
+    shells = [prune_shell(sh) for sh in shells]
+
+    # Remove any duplicates
+    new_shells = []
+
+    seen = set()
+    for sh in shells:
+        fingerprint = _shell_fingerprint(sh)
+        if fingerprint not in seen:
+            seen.add(fingerprint)
+            new_shells.append(sh)
+
+    return new_shells
+
+
 def prune_basis(basis, use_copy=True):
     """
     Removes primitives that have a zero coefficient, and
@@ -186,23 +233,52 @@ def prune_basis(basis, use_copy=True):
     """
 
     if use_copy:
-        basis = copy.deepcopy(basis)
+        basis = misc.shallow_copy_basis(basis)
 
     for k, el in basis['elements'].items():
         if 'electron_shells' not in el:
             continue
 
         shells = el.pop('electron_shells')
-        shells = [prune_shell(sh, False) for sh in shells]
+        el['electron_shells'] = _prune_shells(shells)
 
-        # Remove any duplicates
-        el['electron_shells'] = []
+    return basis
 
-        for sh in shells:
-            if sh not in el['electron_shells']:
-                el['electron_shells'].append(sh)
 
-    return basis
+def _uncontract_spdf_shells(shells, max_am):
+    '''Uncontracts sp, spd,... shells of an element (see :func:`uncontract_spdf`)'''
+
+    newshells = []
+
+    for sh in shells:
+
+        # am will be a list
+        am = sh['angular_momentum']
+        coeff = sh['coefficients']
+
+        # if this is an sp, spd,...  orbital
+        if len(am) > 1:
+            newsh = sh.copy()
+            newsh['angular_momentum'] = []
+            newsh['coefficients'] = []
+
+            ngen = len(sh['coefficients'])
+            for g in range(ngen):
+                if am[g] > max_am:
+                    newsh2 = sh.copy()
+                    newsh2['angular_momentum'] = [am[g]]
+                    newsh2['coefficients'] = [coeff[g]]
+                    newshells.append(newsh2)
+                else:
+                    newsh['angular_momentum'].append(am[g])
+                    newsh['coefficients'].append(coeff[g])
+
+            newshells.insert(0, newsh)
+
+        else:
+            newshells.append(sh)
+
+    return newshells
 
 
 def uncontract_spdf(basis, max_am=0, use_copy=True):
@@ -222,45 +298,38 @@ def uncontract_spdf(basis, max_am=0, use_copy=True):
     """
 
     if use_copy:
-        basis = copy.deepcopy(basis)
+        basis = misc.shallow_copy_basis(basis)
 
     for k, el in basis['elements'].items():
 
         if 'electron_shells' not in el:
             continue
-        newshells = []
-
-        for sh in el['electron_shells']:
 
-            # am will be a list
-            am = sh['angular_momentum']
-            coeff = sh['coefficients']
+        el['electron_shells'] = _uncontract_spdf_shells(el['electron_shells'], max_am)
 
-            # if this is an sp, spd,...  orbital
-            if len(am) > 1:
-                newsh = sh.copy()
-                newsh['angular_momentum'] = []
-                newsh['coefficients'] = []
+    return basis
 
-                ngen = len(sh['coefficients'])
-                for g in range(ngen):
-                    if am[g] > max_am:
-                        newsh2 = sh.copy()
-                        newsh2['angular_momentum'] = [am[g]]
-                        newsh2['coefficients'] = [coeff[g]]
-                        newshells.append(newsh2)
-                    else:
-                        newsh['angular_momentum'].append(am[g])
-                        newsh['coefficients'].append(coeff[g])
 
-                newshells.insert(0, newsh)
+def _uncontract_general_shells(shells):
+    '''Uncontracts the general contractions of an element, without pruning (see :func:`uncontract_general`)'''
 
-            else:
-                newshells.append(sh)
+    newshells = []
 
-        el['electron_shells'] = newshells
+    for sh in shells:
+        # See if we actually have to uncontract
+        # Also, don't uncontract sp, spd,.... orbitals
+        #      (leave that to uncontract_spdf)
+        if len(sh['coefficients']) == 1 or len(sh['angular_momentum']) > 1:
+            newshells.append(sh)
+        else:
+            if len(sh['angular_momentum']) == 1:
+                for c in sh['coefficients']:
+                    # copy, them replace 'coefficients'
+                    newsh = sh.copy()
+                    newsh['coefficients'] = [c]
+                    newshells.append(newsh)
 
-    return basis
+    return newshells
 
 
 def uncontract_general(basis, use_copy=True):
@@ -275,33 +344,39 @@ def uncontract_general(basis, use_copy=True):
     """
 
     if use_copy:
-        basis = copy.deepcopy(basis)
+        basis = misc.shallow_copy_basis(basis)
 
     for k, el in basis['elements'].items():
 
         if 'electron_shells' not in el:
             continue
 
-        newshells = []
+        el['electron_shells'] = _uncontract_general_shells(el['electron_shells'])
 
-        for sh in el['electron_shells']:
-            # See if we actually have to uncontract
-            # Also, don't uncontract sp, spd,.... orbitals
-            #      (leave that to uncontract_spdf)
-            if len(sh['coefficients']) == 1 or len(sh['angular_momentum']) > 1:
-                newshells.append(sh)
-            else:
-                if len(sh['angular_momentum']) == 1:
-                    for c in sh['coefficients']:
-                        # copy, them replace 'coefficients'
-                        newsh = sh.copy()
-                        newsh['coefficients'] = [c]
-                        newshells.append(newsh)
+    # If use_copy is True, we already made our copy
+    return prune_basis(basis, False)
 
-        el['electron_shells'] = newshells
 
-    # If use_copy is True, we already made our deep copy
-    return prune_basis(basis, False)
+def _uncontract_segmented_shells(shells):
+    '''Uncontracts the segmented contractions of an element (see :func:`uncontract_segmented`)'''
+
+    newshells = []
+
+    for sh in shells:
+        exponents = sh['exponents']
+        nam = len(sh['angular_momentum'])
+
+        for i in range(len(exponents)):
+            newsh = sh.copy()
+            newsh['exponents'] = [exponents[i]]
+            newsh['coefficients'] = [["1.00000000E+00"] * nam]
+
+            # Remember to transpose the coefficients
+            newsh['coefficients'] = list(map(list, zip(*newsh['coefficients'])))
+
+            newshells.append(newsh)
+
+    return newshells
 
 
 def uncontract_segmented(basis, use_copy=True):
@@ -319,120 +394,113 @@ def uncontract_segmented(basis, use_copy=True):
     """
 
     if use_copy:
-        basis = copy.deepcopy(basis)
+        basis = misc.shallow_copy_basis(basis)
 
     for k, el in basis['elements'].items():
 
         if 'electron_shells' not in el:
             continue
 
-        newshells = []
+        el['electron_shells'] = _uncontract_segmented_shells(el['electron_shells'])
 
-        for sh in el['electron_shells']:
-            exponents = sh['exponents']
-            nam = len(sh['angular_momentum'])
-
-            for i in range(len(exponents)):
-                newsh = sh.copy()
-                newsh['exponents'] = [exponents[i]]
-                newsh['coefficients'] = [["1.00000000E+00"] * nam]
+    return basis
 
-                # Remember to transpose the coefficients
-                newsh['coefficients'] = list(map(list, zip(*newsh['coefficients'])))
 
-                newshells.append(newsh)
+def _make_general_shells(shells):
+    '''Merges the shells of an element into one general contraction per angular momentum
 
-        el['electron_shells'] = newshells
+    sp, spd,... shells are left alone, and the result is not pruned (see :func:`make_general`)
+    '''
 
-    return basis
+    zero = '0.00000000'
 
+    newshells = []
 
-def make_general(basis, skip_spdf=False, use_copy=True):
-    """
-    Makes one large general contraction for each angular momentum
+    # See what we have
+    all_am = []
+    for sh in shells:
+        am = sh['angular_momentum']
 
-    If use_copy is True, the input basis set is not modified.
+        # Skip sp shells
+        if len(am) > 1:
+            newshells.append(sh)
+            continue
 
-    The output of this function is not pretty. If you want to make it nicer,
-    use sort_basis afterwards.
-    """
+        if am not in all_am:
+            all_am.append(am)
 
-    zero = '0.00000000'
+    all_am = sorted(all_am)
 
-    if use_copy:
-        basis = copy.deepcopy(basis)
+    for am in all_am:
+        newsh = {
+            'angular_momentum': am,
+            'exponents': [],
+            'coefficients': [],
+            'region': '',
+            'function_type': None,
+        }
 
-    if not skip_spdf:
-        basis = uncontract_spdf(basis, 0, False)
+        # Do exponents first
+        for sh in shells:
+            if sh['angular_momentum'] == am:
+                newsh['exponents'].extend(sh['exponents'])
 
-    for k, el in basis['elements'].items():
-        if 'electron_shells' not in el:
-            continue
+        # Number of primitives in the new shell
+        nprim = len(newsh['exponents'])
 
-        newshells = []
+        cur_prim = 0
+        for sh in shells:
+            if sh['angular_momentum'] != am:
+                continue
 
-        # See what we have
-        all_am = []
-        for sh in el['electron_shells']:
-            am = sh['angular_momentum']
+            if newsh['function_type'] is None:
+                newsh['function_type'] = sh['function_type']
 
-            # Skip sp shells
-            if len(am) > 1:
-                newshells.append(sh)
-                continue
+            # Make sure the shells we are merging have the same function types
+            ft1 = newsh['function_type']
+            ft2 = sh['function_type']
 
-            if am not in all_am:
-                all_am.append(am)
+            # Check if one function type is the subset of another
+            # (should handle gto/gto_spherical, etc)
+            if ft1 not in ft2 and ft2 not in ft1:
+                raise RuntimeError("Cannot make general contraction of different function types")
 
-        all_am = sorted(all_am)
+            ngen = len(sh['coefficients'])
 
-        for am in all_am:
-            newsh = {
-                'angular_momentum': am,
-                'exponents': [],
-                'coefficients': [],
-                'region': '',
-                'function_type': None,
-            }
+            for g in range(ngen):
+                coef = [zero] * cur_prim
+                coef.extend(sh['coefficients'][g])
+                coef.extend([zero] * (nprim - len(coef)))
+                newsh['coefficients'].append(coef)
 
-            # Do exponents first
-            for sh in el['electron_shells']:
-                if sh['angular_momentum'] == am:
-                    newsh['exponents'].extend(sh['exponents'])
+            cur_prim += len(sh['exponents'])
 
-            # Number of primitives in the new shell
-            nprim = len(newsh['exponents'])
+        newshells.append(newsh)
 
-            cur_prim = 0
-            for sh in el['electron_shells']:
-                if sh['angular_momentum'] != am:
-                    continue
+    return newshells
 
-                if newsh['function_type'] is None:
-                    newsh['function_type'] = sh['function_type']
 
-                # Make sure the shells we are merging have the same function types
-                ft1 = newsh['function_type']
-                ft2 = sh['function_type']
+def make_general(basis, skip_spdf=False, use_copy=True):
+    """
+    Makes one large general contraction for each angular momentum
 
-                # Check if one function type is the subset of another
-                # (should handle gto/gto_spherical, etc)
-                if ft1 not in ft2 and ft2 not in ft1:
-                    raise RuntimeError("Cannot make general contraction of different function types")
+    If use_copy is True, the input basis set is not modified.
 
-                ngen = len(sh['coefficients'])
+    The output of this function is not pretty. If you want to make it nicer,
+    use sort_basis afterwards.
+    """
 
-                for g in range(ngen):
-                    coef = [zero] * cur_prim
-                    coef.extend(sh['coefficients'][g])
-                    coef.extend([zero] * (nprim - len(coef)))
-                    newsh['coefficients'].append(coef)
+    if use_copy:
+        basis = misc.shallow_copy_basis(basis)
 
-                cur_prim += len(sh['exponents'])
+    if not skip_spdf:
+        basis = uncontract_spdf(basis, 0, False)
 
-            newshells.append(newsh)
+    for k, el in basis['elements'].items():
+        if 'electron_shells' not in el:
+            continue
 
-        el['electron_shells'] = newshells
+        el['electron_shells'] = _make_general_shells(el['electron_shells'])
 
     # If the basis was read in from a segmented format, it will have
     # duplicate primitives, and so a pruning is necessary
@@ -462,6 +530,23 @@ def _free_primitives(coeffs):
     return free_prims
 
 
+def _remove_free_primitives_shells(shells):
+    '''Removes the free primitives of an element, without pruning (see :func:`remove_free_primitives`)'''
+
+    newshells = []
+    for sh in shells:
+        # Find contractions
+        coefficients = sh['coefficients']
+        contracted_columns = [idx for idx, c in enumerate(coefficients) if not _is_single_column(c)]
+        if len(contracted_columns) == len(coefficients):
+            newshells.append(sh)
+        elif len(contracted_columns):
+            sh = sh.copy()
+            sh['coefficients'] = [coefficients[c] for c in contracted_columns]
+            newshells.append(sh)
+    return newshells
+
+
 def remove_free_primitives(basis, use_copy=True):
     """
     Removes any free primitives from a basis set as a way to generate a minimal basis
@@ -474,29 +559,80 @@ def remove_free_primitives(basis, use_copy=True):
     """
 
     if use_copy:
-        basis = copy.deepcopy(basis)
+        basis = misc.shallow_copy_basis(basis)
 
     for k, el in basis['elements'].items():
 
         if 'electron_shells' not in el:
             continue
 
-        newshells = []
-        for sh in el['electron_shells']:
-            # Find contractions
-            coefficients = sh['coefficients']
-            contracted_columns = [idx for idx, c in enumerate(coefficients) if not _is_single_column(c)]
-            coefficients = [coefficients[c] for c in contracted_columns]
-            if len(coefficients):
-                sh['coefficients'] = coefficients
-                newshells.append(sh)
-        el['electron_shells'] = newshells
+        el['electron_shells'] = _remove_free_primitives_shells(el['electron_shells'])
 
     # We can now have exponents that aren't contracted so we need to
-    # prune. If use_copy is True, we already made our deep copy
+    # prune. If use_copy is True, we already made our copy
     return prune_basis(basis, False)
 
 
+def _optimize_general_shells(elshells):
+    '''Optimizes the general contractions of the (already general) shells of an element
+
+    Shells that are changed are copied first. See :func:`optimize_general`
+    '''
+
+    newshells = []
+    for sh in elshells:
+        newshells.append(sh)
+
+        exponents = sh['exponents']
+        coefficients = sh['coefficients']
+        nprim = len(exponents)
+        nam = len(sh['angular_momentum'])
+
+        # Skip sp shells and shells with only one general contraction
+        if nam > 1 or len(coefficients) < 2:
+            continue
+
+        # First, find columns (general contractions) with a single non-zero value
+        single_columns = [idx for idx, c in enumerate(coefficients) if _is_single_column(c)]
+
+        # Find the corresponding rows that have a value in one of these columns
+        # Note that at this stage, the row may have coefficients in more than one
+        # column. That is what we are looking for
+
+        # Also, test to see that each row is only represented once. That is, there should be
+        # no rows that are part of single columns (this would represent duplicate shells).
+        # This can happen in poorly-formatted basis sets and is an error
+        row_col_pairs = []
+        all_row_idx = []
+        for col_idx in single_columns:
+            col = coefficients[col_idx]
+            for row_idx in range(nprim):
+                if float(col[row_idx]) != 0.0:
+                    if row_idx in all_row_idx:
+                        raise RuntimeError("Badly-formatted basis. Row {} makes duplicate shells".format(row_idx))
+
+                    # Store the index of the nonzero value in single_columns
+                    row_col_pairs.append((row_idx, col_idx))
+                    all_row_idx.append(row_idx)
+
+        # Now for each row/col pair, zero out the entire row
+        # EXCEPT for the column that has the single value
+        to_zero = [(idx, row_idx) for row_idx, col_idx in row_col_pairs for idx, col in enumerate(coefficients)
+                   if float(col[row_idx]) != 0.0 and col_idx != idx]
+        if not to_zero:
+            continue
+
+        coefficients = [list(col) for col in coefficients]
+        for idx, row_idx in to_zero:
+            coefficients[idx][row_idx] = '0.0000000E+00'
+
+        newsh = sh.copy()
+        newsh['coefficients'] = coefficients
+        newshells[-1] = newsh
+
+    return newshells
+
+
 def optimize_general(basis, use_copy=True):
     """
     Optimizes the general contraction using the method of Hashimoto et al
@@ -509,7 +645,7 @@ def optimize_general(basis, use_copy=True):
     """
 
     if use_copy:
-        basis = copy.deepcopy(basis)
+        basis = misc.shallow_copy_basis(basis)
 
     # Make as generally-contracted as possible first
     basis = make_general(basis, skip_spdf=True, use_copy=False)
@@ -519,46 +655,7 @@ def optimize_general(basis, use_copy=True):
         if 'electron_shells' not in eldata:
             continue
 
-        elshells = eldata['electron_shells']
-        for sh in elshells:
-            exponents = sh['exponents']
-            coefficients = sh['coefficients']
-            nprim = len(exponents)
-            nam = len(sh['angular_momentum'])
-
-            # Skip sp shells and shells with only one general contraction
-            if nam > 1 or len(coefficients) < 2:
-                continue
-
-            # First, find columns (general contractions) with a single non-zero value
-            single_columns = [idx for idx, c in enumerate(coefficients) if _is_single_column(c)]
-
-            # Find the corresponding rows that have a value in one of these columns
-            # Note that at this stage, the row may have coefficients in more than one
-            # column. That is what we are looking for
-
-            # Also, test to see that each row is only represented once. That is, there should be
-            # no rows that are part of single columns (this would represent duplicate shells).
-            # This can happen in poorly-formatted basis sets and is an error
-            row_col_pairs = []
-            all_row_idx = []
-            for col_idx in single_columns:
-                col = coefficients[col_idx]
-                for row_idx in range(nprim):
-                    if float(col[row_idx]) != 0.0:
-                        if row_idx in all_row_idx:
-                            raise RuntimeError("Badly-formatted basis. Row {} makes duplicate shells".format(row_idx))
-
-                        # Store the index of the nonzero value in single_columns
-                        row_col_pairs.append((row_idx, col_idx))
-                        all_row_idx.append(row_idx)
-
-            # Now for each row/col pair, zero out the entire row
-            # EXCEPT for the column that has the single value
-            for row_idx, col_idx in row_col_pairs:
-                for idx, col in enumerate(coefficients):
-                    if float(col[row_idx]) != 0.0 and col_idx != idx:
-                        col[row_idx] = '0.0000000E+00'
+        eldata['electron_shells'] = _optimize_general_shells(eldata['electron_shells'])
 
     return basis
 
@@ -598,7 +695,7 @@ def geometric_augmentation(basis, nadd, use_copy=True, as_component=False, steep
         basis = skel.create_skel('component')
         basis['elements'] = {k: {} for k, v in basis_copy['elements'].items() if 'electron_shells' in v}
     elif use_copy:
-        basis = copy.deepcopy(basis)
+        basis = misc.shallow_copy_basis(basis)
 
     # From Woon & Dunning, Jr
     # J. Chem. Phys. v100, No. 4, p. 2975 (1994)
@@ -685,7 +782,8 @@ def geometric_augmentation(basis, nadd, use_copy=True, as_component=False, steep
         if 'electron_shells' not in basis['elements'][el_z]:
             basis['elements'][el_z]['electron_shells'] = []
 
-        basis['elements'][el_z]['electron_shells'].extend(new_shells)
+        # (the list is replaced rather than extended, as it may be shared with the input)
+        basis['elements'][el_z]['electron_shells'] = basis['elements'][el_z]['electron_shells'] + new_shells
 
     return basis
 
@@ -818,187 +916,342 @@ def truhlar_calendarize(basis, month, use_copy=True):
     return basis
 
 
-def autoaux_basis(basis):
-    '''Create an auxiliary basis set for the given orbital basis set for
-use with the resolution of the identity approximation. This is a
-simplified version of the routine where the electrons potentially
-contained in the ECP are disregarded, leading to slightly larger (but
-more accurate) auxiliary sets.
+def _update_min(array, index, value):
+    '''Updates an array of minimal values'''
+    if array[index] is None or value < array[index]:
+        array[index] = value
 
-    .. seealso :: | G. L. Stoychev, A. A. Auer, and F. Neese
-                  | 'Automatic Generation of Auxiliary Basis Sets'
-                  | J. Chem. Theory Comput. 13, 554 (2017)
-                  | http://doi.org/10.1021/acs.jctc.6b01041
 
+def _update_max(array, index, value):
+    '''Updates an array of maximal values'''
+    if array[index] is None or value > array[index]:
+        array[index] = value
 
-    Parameters
-    ----------
-    basis : dict
-        Orbital basis set dictionary for which to generate the auxiliary basis
+
+def _autoaux_am_ranges_numpy(shell_am, exponents, shell_eff, lmax):
+    '''Reduces the exponents of the shells to their per-am ranges with NumPy (see :func:`_autoaux_exponent_ranges`)'''
+
+    import numpy as np
+
+    shell_am = np.array(shell_am)
+    prim_am = np.repeat(shell_am, [len(x) for x in exponents])
+    prim_exps = np.fromiter((x for expval in exponents for x in expval), dtype=float, count=len(prim_am))
+
+    amin = np.full(lmax + 1, np.inf)
+    amax_prim = np.full(lmax + 1, -np.inf)
+    amax_eff = np.full(lmax + 1, -np.inf)
+    np.minimum.at(amin, prim_am, prim_exps)
+    np.maximum.at(amax_prim, prim_am, prim_exps)
+    np.maximum.at(amax_eff, shell_am, np.array(shell_eff))
+
+    # Angular momenta without shells have no range
+    present = np.zeros(lmax + 1, dtype=bool)
+    present[shell_am] = True
+    present = present.tolist()
+    return tuple([x if p else None for x, p in zip(arr.tolist(), present)] for arr in (amin, amax_prim, amax_eff))
+
+
+def _autoaux_exponent_ranges(elshells):
+    '''Computes the per-am exponent ranges of an element needed by AutoAux
+
+    The shells must be generally contracted, without sp, spd,... shells.
+
+    Returns
+    -------
+    tuple
+        The maximal am, and lists (indexed by am) of the smallest primitive exponent,
+        the largest primitive exponent, and the largest effective exponent
     '''
 
+    shell_am = []
+    for sh in elshells:
+        assert len(sh['angular_momentum']) == 1
+        shell_am.append(sh['angular_momentum'][0])
+    lmax = max(shell_am)
+
+    # Prefactor defined in eq 10 of the paper
+    k_values = [2**(2 * l + 1) * gamma(l + 2)**2 / gamma(2 * l + 3) for l in range(lmax + 1)]
+
+    exponents = [[float(x) for x in sh['exponents']] for sh in elshells]
+
+    # The largest effective exponent of each shell. We compute the spatial extent <r>
+    # for functions (in contracted form), eq (8) in the paper. This gives us the
+    # "quasi-uncontracted" orbital basis with primitive exponents: the effective exponent
+    # from eq 9 must be proportional to the inverse square of the radius, not the inverse
+    # radius. The largest effective exponent corresponds to the smallest radius
+    shell_eff = []
+    for sh, l, expval in zip(elshells, shell_am, exponents):
+        rvec = gto_R_contr_diagonal(expval, sh['coefficients'], l)
+        shell_eff.append(2 * k_values[l]**2 / (pi * min(rvec)**2))
+
+    if _have_numpy():
+        return (lmax, ) + _autoaux_am_ranges_numpy(shell_am, exponents, shell_eff, lmax)
+
+    amin = [None] * (lmax + 1)
+    amax_prim = [None] * (lmax + 1)
+    amax_eff = [None] * (lmax + 1)
+    for l, expval, eff in zip(shell_am, exponents, shell_eff):
+        # Store values of smallest and largest exponent
+        _update_max(amax_prim, l, max(expval))
+        _update_min(amin, l, min(expval))
+        _update_max(amax_eff, l, eff)
+
+    return lmax, amin, amax_prim, amax_eff
+
+
+def _autoaux_element(element_Z, elshells):
+    '''Creates the AutoAux shells for a single element (see :func:`autoaux_basis`)
+
+    The shells must be generally contracted, without sp, spd,... shells.
+    '''
+
+    lmax, amin, amax_prim, amax_eff = _autoaux_exponent_ranges(elshells)
+
+    # Collect the smallest and largest exponents
+    a_minaux = [None] * (2 * lmax + 1)
+    a_maxaux_prim = [None] * (2 * lmax + 1)
+    a_maxaux_eff = [None] * (2 * lmax + 1)
+    for l in range(lmax + 1):
+        for lp in range(l, lmax + 1):
+            # Calculate the values of the exponents
+            minaux = amin[l] + amin[lp]
+            maxauxp = amax_prim[l] + amax_prim[lp]
+            maxauxe = amax_eff[l] + amax_eff[lp]
+
+            # Loop over all possible coupled angular momenta
+            for laux in range(abs(l - lp), l + lp + 1):
+                _update_min(a_minaux, laux, minaux)
+                _update_max(a_maxaux_prim, laux, maxauxp)
+                _update_max(a_maxaux_eff, laux, maxauxe)
+
+    # Form lval: highest occupied momentum of occupied shells for
+    # atom. H and He have lval=0; Li, Be and everything after that
+    # have lval=1; 3d transition metals have lval=2 and
+    # lanthanoids have lval=3.
+    lval = 0
+    Z = int(element_Z)
+    if Z > 2:
+        lval = 1
+    if Z > 20:
+        lval = 2
+    if Z > 56:
+        lval = 3
+
+    # Form linc: 1 up to Ar, 2 for the rest
+    linc = 1
+    if Z > 18:
+        linc = 2
+
+    # Limit maximal angular momentum
+    lmax_aux = min(max(2 * lval, lmax + linc), 2 * lmax)
+
+    # Values from Table I; factor 7.0 for P functions is missing in the paper
+    flaux = [20, 7.0, 4.0, 4.0, 3.5, 2.5, 2.0, 2.0]
+    blaux_big = [1.8, 2.0, 2.2, 2.2, 2.2, 2.3, 3.0, 3.0]
+    b_small = 1.8
+
+    # Form actual upper limit for even-tempered expansion
+    amax_aux = [None] * (lmax_aux + 1)
+    for laux in range(lmax_aux + 1):
+        if laux <= 2 * lval:
+            # There's a typo in the paper, max instead of min
+            amax_aux[laux] = min(flaux[laux] * a_maxaux_eff[laux], a_maxaux_prim[laux])
+        else:
+            amax_aux[laux] = a_maxaux_eff[laux]
+
+    shells = []
+    for laux in range(lmax_aux + 1):
+        # Generate the exponents
+        exponents = []
+        current_exponent = a_minaux[laux]
+        while True:
+            exponents.append('{:.6e}'.format(current_exponent))
+            if current_exponent >= amax_aux[laux]:
+                break
+
+            if laux <= 2 * lval:
+                current_exponent *= b_small
+            else:
+                current_exponent *= blaux_big[min(laux, len(blaux_big) - 1)]
+
+        # Create shells
+        func_type = function_type_from_am([laux], 'gto', 'spherical')
+        for z in exponents:
+            shell = {
+                'function_type': func_type,
+                'region': '',
+                'angular_momentum': [laux],
+                'exponents': [z],
+                'coefficients': [['1.0']]
+            }
+            shells.append(shell)
+
+    return shells
+
+
+def _autoabs_element(element_Z, elshells, lmaxinc=1, fsam=1.5):
+    '''Creates the AutoABS shells for a single element (see :func:`autoabs_basis`)
+
+    The shells must be generally contracted, without sp, spd,... shells.
+    '''
+
+    # Form the list of candidate functions
+    candidates = []
+    for sh in elshells:
+        shell_am = sh['angular_momentum']
+        assert len(shell_am) == 1
+        # We do the doubling here
+        candidates.extend((2.0 * float(x), shell_am[0]) for x in sh['exponents'])
+
+    # Form lval: highest occupied momentum of occupied shells for
+    # atom. H and He have lval=0; Li, Be and everything after that
+    # have lval=1; 3d transition metals have lval=2 and
+    # lanthanoids have lval=3.
+    lval = 0
+    Z = int(element_Z)
+    if Z > 2:
+        lval = 1
+    if Z > 18:
+        lval = 2
+    if Z > 54:
+        lval = 3
+
+    # Maximal candidate am
+    lmax = max(c[1] for c in candidates)
+
+    # Maximal allowed angular momentum
+    lmax_aux = min(max(2 * lval, lmax + lmaxinc), 2 * lmax)
+
+    # Fitting functions
+    fit_functions = []
+    max_fit_am = 0
+
+    # Sort candidates by exponent, once. Candidates are then taken
+    # from the end of the list (largest exponent first)
+    candidates.sort(key=lambda x: x[0])
+    ncand = len(candidates)
+
+    while ncand > 0:
+        # Move top candidate to to trial function set
+        ncand -= 1
+        ref_exponent = candidates[ncand][0]
+        trial_start = ncand
+
+        # trial fitting functions for which the ratio of the
+        # exponent reference value divided by the value of
+        # their exponent is smaller than fsam are moved from
+        # the candidate basis set to the trail function set
+        while ncand > 0 and ref_exponent / candidates[ncand - 1][0] < fsam:
+            ncand -= 1
+
+        trial_functions = candidates[trial_start:ncand - 1 if ncand else None:-1]
+
+        # Calculate geometric average of functions in trial set
+        average_exponent = exp(sum([log(tr[0]) for tr in trial_functions]) / len(trial_functions))
+
+        # The angular moment of this function is set to the
+        # maximum angular moment of any primitive in the current
+        # trial set and the previous ABSs.
+        max_fit_am = max(max_fit_am, max(tr[1] for tr in trial_functions))
+
+        # Add functions (limited to lmax_aux)
+        for fit_am in range(min(max_fit_am, lmax_aux) + 1):
+            fit_functions.append((average_exponent, fit_am))
+
+    # Create shells
+    shells = []
+    for f in fit_functions:
+        func_type = function_type_from_am([f[1]], 'gto', 'spherical')
+        shell = {
+            'function_type': func_type,
+            'region': '',
+            'angular_momentum': [f[1]],
+            'exponents': ['{:.6e}'.format(f[0])],
+            'coefficients': [['1.0']]
+        }
+        shells.append(shell)
+
+    return shells
+
+
+# Functions for creating the shells of an element, name suffix and role for
+# the automatically-generated auxiliary basis sets
+_auto_aux_types = {
+    'autoaux': (_autoaux_element, '_autoaux', 'rifit'),
+    'autoabs': (_autoabs_element, '_autoabs', 'jfit'),
+}
+
+
+def _auto_aux_element_task(task):
+    '''Creates the auxiliary shells for one element (used as a task for worker processes)'''
+
+    aux_type, element_Z, elshells, kwargs = task
+    return _auto_aux_types[aux_type][0](element_Z, elshells, **kwargs)
+
+
+def _auto_aux_tasks(basis, aux_type, kwargs):
+    '''Creates the list of per-element tasks for creating an auxiliary basis set'''
+
     # We want the basis set as generally contracted. Get a copy so
     # that we don't change the input set
     basis = make_general(basis, use_copy=True)
 
-    auxbasis_data = {}
-
+    tasks = []
     for element_Z, eldata in basis['elements'].items():
-
         if 'electron_shells' not in eldata:
             print('No electron shells for {}'.format(element_Z))
             continue
 
-        elshells = eldata['electron_shells']
+        tasks.append((aux_type, element_Z, eldata['electron_shells'], kwargs))
 
-        # What is maximal angular momentum?
-        lmax = max([sh['angular_momentum'][0] for sh in elshells])
+    return tasks
 
-        def update_minimum_array(array, index, value):
-            '''Updates an array of minimal values'''
-            if array[index] is None:
-                array[index] = value
-            else:
-                array[index] = min(array[index], value)
 
-        def update_maximum_array(array, index, value):
-            '''Updates an array of maximal values'''
-            if array[index] is None:
-                array[index] = value
-            else:
-                array[index] = max(array[index], value)
-
-        # Form values of smallest and largest primitive exponent
-        amin = [None for _ in range(lmax + 1)]
-        amax_prim = [None for _ in range(lmax + 1)]
-        amax_eff = [None for _ in range(lmax + 1)]
-        for sh in elshells:
-            exponents = sh['exponents']
-            coefficients = sh['coefficients']
-            ncontr = len(coefficients)
-            shell_am = sh['angular_momentum']
-            assert len(shell_am) == 1
-            l = shell_am[0]
-
-            # Store values of smallest and largest exponent
-            expval = [float(x) for x in exponents]
-            expval.sort(reverse=True)
-            update_maximum_array(amax_prim, l, float(expval[0]))
-            update_minimum_array(amin, l, float(expval[-1]))
-
-            # Now we just compute the spatial extent <r> for functions (in contracted form), eq (8) in the paper
-            rmat = gto_R_contr(exponents, coefficients, shell_am[0])
-            # Extract the diagonal values
-            rvec = [rmat[i][i] for i in range(ncontr)]
-
-            # This gives us the "quasi-uncontracted" orbital basis with primitive exponents
-            # Prefactor defined in eq 10
-            k_value = 2**(2 * l + 1) * gamma(l + 2)**2 / gamma(2 * l + 3)
-
-            # Calculate effective exponent with eq 9, note that it
-            # must be proportional to the inverse square of the
-            # radius, not the inverse radius
-            effective_exponents = [2 * k_value**2 / (pi * rexp**2) for rexp in rvec]
-
-            # Sort list in decreasing order
-            effective_exponents.sort(reverse=True)
-            # Store largest effective exponent
-            update_maximum_array(amax_eff, l, effective_exponents[0])
-
-        # Collect the smallest and largest exponents
-        a_minaux = [None for _ in range(2 * lmax + 1)]
-        a_maxaux_prim = [None for _ in range(2 * lmax + 1)]
-        a_maxaux_eff = [None for _ in range(2 * lmax + 1)]
-        for l in range(lmax + 1):
-            for lp in range(l, lmax + 1):
-                # Calculate the values of the exponents
-                minaux = amin[l] + amin[lp]
-                maxauxp = amax_prim[l] + amax_prim[lp]
-                maxauxe = amax_eff[l] + amax_eff[lp]
-
-                # Loop over all possible coupled angular momenta
-                for laux in range(abs(l - lp), l + lp + 1):
-                    update_minimum_array(a_minaux, laux, minaux)
-                    update_maximum_array(a_maxaux_prim, laux, maxauxp)
-                    update_maximum_array(a_maxaux_eff, laux, maxauxe)
-
-        # Form lval: highest occupied momentum of occupied shells for
-        # atom. H and He have lval=0; Li, Be and everything after that
-        # have lval=1; 3d transition metals have lval=2 and
-        # lanthanoids have lval=3.
-        lval = 0
-        Z = int(element_Z)
-        if Z > 2:
-            lval = 1
-        if Z > 20:
-            lval = 2
-        if Z > 56:
-            lval = 3
-
-        # Form linc: 1 up to Ar, 2 for the rest
-        linc = 1
-        if Z > 18:
-            linc = 2
-
-        # Limit maximal angular momentum
-        lmax_aux = min(max(2 * lval, lmax + linc), 2 * lmax)
-
-        # Values from Table I; factor 7.0 for P functions is missing in the paper
-        flaux = [20, 7.0, 4.0, 4.0, 3.5, 2.5, 2.0, 2.0]
-        blaux_big = [1.8, 2.0, 2.2, 2.2, 2.2, 2.3, 3.0, 3.0]
-        b_small = 1.8
-
-        # Form actual upper limit for even-tempered expansion
-        amax_aux = [None for _ in range(lmax_aux + 1)]
-        for laux in range(lmax_aux + 1):
-            if laux <= 2 * lval:
-                # There's a typo in the paper, max instead of min
-                amax_aux[laux] = min(flaux[laux] * a_maxaux_eff[laux], a_maxaux_prim[laux])
-            else:
-                amax_aux[laux] = a_maxaux_eff[laux]
-
-        # Create aux basis
-        aux_element_data = create_element_data(auxbasis_data, str(element_Z), 'electron_shells')
-
-        for laux in range(lmax_aux + 1):
-            # Generate the exponents
-            exponents = []
-            current_exponent = a_minaux[laux]
-            while True:
-                exponents.append('{:.6e}'.format(current_exponent))
-                if current_exponent >= amax_aux[laux]:
-                    break
-
-                if laux <= 2 * lval:
-                    current_exponent *= b_small
-                else:
-                    current_exponent *= blaux_big[min(laux, len(blaux_big) - 1)]
-
-            # Create shells
-            for z in exponents:
-                func_type = function_type_from_am([laux], 'gto', 'spherical')
-                shell = {
-                    'function_type': func_type,
-                    'region': '',
-                    'angular_momentum': [laux],
-                    'exponents': [z],
-                    'coefficients': [['1.0']]
-                }
-                aux_element_data['electron_shells'].append(shell)
+def _finalize_auto_aux(basis, aux_type, tasks, element_shells):
+    '''Creates the auxiliary basis set dictionary from the shells of each element'''
+
+    auxbasis_data = {}
+    for task, shells in zip(tasks, element_shells):
+        aux_element_data = create_element_data(auxbasis_data, str(task[1]), 'electron_shells')
+        aux_element_data['electron_shells'].extend(shells)
 
     # Finalize basis
     auxbasis_bs = skel.create_skel('component')
     auxbasis_bs['elements'] = auxbasis_data
     auxbasis_bs['function_types'] = compose._whole_basis_types(auxbasis_bs)
 
+    _, suffix, role = _auto_aux_types[aux_type]
     auxbasis_bs['revision_description'] = basis['revision_description']
     auxbasis_bs['version'] = basis['version']
-    auxbasis_bs['name'] = basis['name'] + '_autoaux'
-    auxbasis_bs['role'] = 'rifit'
+    auxbasis_bs['name'] = basis['name'] + suffix
+    auxbasis_bs['role'] = role
 
     return auxbasis_bs
 
 
+def autoaux_basis(basis):
+    '''Create an auxiliary basis set for the given orbital basis set for
+use with the resolution of the identity approximation. This is a
+simplified version of the routine where the electrons potentially
+contained in the ECP are disregarded, leading to slightly larger (but
+more accurate) auxiliary sets.
+
+    .. seealso :: | G. L. Stoychev, A. A. Auer, and F. Neese
+                  | 'Automatic Generation of Auxiliary Basis Sets'
+                  | J. Chem. Theory Comput. 13, 554 (2017)
+                  | http://doi.org/10.1021/acs.jctc.6b01041
+
+
+    Parameters
+    ----------
+    basis : dict
+        Orbital basis set dictionary for which to generate the auxiliary basis
+    '''
+
+    tasks = _auto_aux_tasks(basis, 'autoaux', {})
+    return _finalize_auto_aux(basis, 'autoaux', tasks, [_auto_aux_element_task(t) for t in tasks])
+
+
 def autoabs_basis(basis, lmaxinc=1, fsam=1.5):
     '''Create a Coulomb fitting basis set for the given orbital basis set.
 
@@ -1015,109 +1268,59 @@ def autoabs_basis(basis, lmaxinc=1, fsam=1.5):
 
     '''
 
-    # We want the basis set as generally contracted. Get a copy so
-    # that we don't change the input set
-    basis = make_general(basis, use_copy=True)
-
-    auxbasis_data = {}
+    tasks = _auto_aux_tasks(basis, 'autoabs', {'lmaxinc': lmaxinc, 'fsam': fsam})
+    return _finalize_auto_aux(basis, 'autoabs', tasks, [_auto_aux_element_task(t) for t in tasks])
 
-    for element_Z, eldata in basis['elements'].items():
 
-        if 'electron_shells' not in eldata:
-            print('No electron shells for {}'.format(element_Z))
-            continue
+def auto_aux_bases(bases, aux_type='autoaux', nprocs=None, **kwargs):
+    '''Create automatically-generated auxiliary basis sets for several orbital basis sets
 
-        elshells = eldata['electron_shells']
-
-        # Form the list of candidate functions
-        candidates = []
-        for sh in elshells:
-            exponents = sh['exponents']
-            shell_am = sh['angular_momentum']
-            assert len(shell_am) == 1
-            for x in exponents:
-                # We do the doubling here
-                candidates.append((2.0 * float(x), shell_am[0]))
-
-        # Form lval: highest occupied momentum of occupied shells for
-        # atom. H and He have lval=0; Li, Be and everything after that
-        # have lval=1; 3d transition metals have lval=2 and
-        # lanthanoids have lval=3.
-        lval = 0
-        Z = int(element_Z)
-        if Z > 2:
-            lval = 1
-        if Z > 18:
-            lval = 2
-        if Z > 54:
-            lval = 3
-
-        # Maximal candidate am
-        lmax = max([c[1] for c in candidates])
-
-        # Maximal allowed angular momentum
-        lmax_aux = min(max(2 * lval, lmax + lmaxinc), 2 * lmax)
-
-        # Fitting functions
-        fit_functions = []
-
-        while len(candidates) > 0:
-            # Sort candidates by exponent
-            candidates = sorted(candidates, key=lambda x: x[0])
-
-            # Move top candidate to to trial function set
-            trial_functions = [candidates.pop()]
-            while len(candidates):
-                # trial fitting functions for which the ratio of the
-                # exponent reference value divided by the value of
-                # their exponent is smaller than fsam are moved from
-                # the candidate basis set to the trail function set
-                if trial_functions[0][0] / candidates[-1][0] < fsam:
-                    trial_functions.append(candidates.pop())
-                else:
-                    break
+    The work for all the elements of all the basis sets is distributed over
+    `nprocs` worker processes. The results are the same as calling
+    :func:`autoaux_basis` or :func:`autoabs_basis` on each basis set.
 
-            # Calculate geometric average of functions in trial set
-            average_exponent = exp(sum([log(tr[0]) for tr in trial_functions]) / len(trial_functions))
+    Parameters
+    ----------
+    bases : list of dict
+        Orbital basis set dictionaries for which to generate the auxiliary basis sets
+    aux_type : str
+        Type of auxiliary basis set to create ('autoaux' or 'autoabs')
+    nprocs : int
+        Number of worker processes to use. If None, the number of CPUs is used.
+        If 1, everything is done in the current process.
+    kwargs
+        Additional arguments passed to :func:`autoabs_basis` (lmaxinc and fsam)
+
+    Returns
+    -------
+    list of dict
+        The auxiliary basis sets, in the same order as `bases`
+    '''
 
-            # The angular moment of this function is set to the
-            # maximum angular moment of any primitive in the current
-            # trial set and the previous ABSs.
-            max_fit_am = 0
-            for f in fit_functions:
-                max_fit_am = max(max_fit_am, f[1])
-            for f in trial_functions:
-                max_fit_am = max(max_fit_am, f[1])
-            # Reset to lmax_aux
-            max_fit_am = min(max_fit_am, lmax_aux)
+    if aux_type not in _auto_aux_types:
+        raise RuntimeError("Unknown automatic auxiliary basis type '{}'. Must be one of {}".format(
+            aux_type, ', '.join(_auto_aux_types)))
+    if kwargs and aux_type != 'autoabs':
+        raise RuntimeError("Additional arguments are only allowed for autoabs")
 
-            # Add functions
-            for fit_am in range(max_fit_am + 1):
-                fit_functions.append((average_exponent, fit_am))
+    all_tasks = [_auto_aux_tasks(bs, aux_type, kwargs) for bs in bases]
+    flat_tasks = [t for tasks in all_tasks for t in tasks]
 
-        # Create aux basis
-        aux_element_data = create_element_data(auxbasis_data, str(element_Z), 'electron_shells')
+    if nprocs is None:
+        nprocs = os.cpu_count() or 1
+    nprocs = min(nprocs, len(flat_tasks))
 
-        # Create shells
-        for f in fit_functions:
-            func_type = function_type_from_am([f[1]], 'gto', 'spherical')
-            shell = {
-                'function_type': func_type,
-                'region': '',
-                'angular_momentum': [f[1]],
-                'exponents': ['{:.6e}'.format(f[0])],
-                'coefficients': [['1.0']]
-            }
-            aux_element_data['electron_shells'].append(shell)
-
-    # Finalize basis
-    auxbasis_bs = skel.create_skel('component')
-    auxbasis_bs['elements'] = auxbasis_data
-    auxbasis_bs['function_types'] = compose._whole_basis_types(auxbasis_bs)
+    if nprocs > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=nprocs) as executor:
+            chunksize = max(1, len(flat_tasks) // (4 * nprocs))
+            flat_shells = list(executor.map(_auto_aux_element_task, flat_tasks, chunksize=chunksize))
+    else:
+        flat_shells = [_auto_aux_element_task(t) for t in flat_tasks]
 
-    auxbasis_bs['revision_description'] = basis['revision_description']
-    auxbasis_bs['version'] = basis['version']
-    auxbasis_bs['name'] = basis['name'] + '_autoabs'
-    auxbasis_bs['role'] = 'jfit'
+    ret = []
+    start = 0
+    for bs, tasks in zip(bases, all_tasks):
+        ret.append(_finalize_auto_aux(bs, aux_type, tasks, flat_shells[start:start + len(tasks)]))
+        start += len(tasks)
 
-    return auxbasis_bs
+    return ret
@@ -35,12 +35,20 @@ Class/decorator for memoizing BSE functionality
 import functools
 import pickle
 import inspect
+import threading
+
+from . import tracing
 
 # If set to True, memoization of some internal functions
 # will be used. Generally safe to leave enabled - it
 # won't use that much memory
 memoize_enabled = True
 
+# Number of locks the results of each memoized function are spread over.
+# Calls with different arguments only contend if their keys share a lock,
+# and the locks are never held while the function itself runs.
+lock_stripes = 16
+
 
 def _make_key(args_spec, *args, **kwargs):
     left_args = args_spec.args[len(args):]
@@ -72,10 +80,23 @@ def _make_key(args_spec, *args, **kwargs):
 
 
 class BSEMemoize:
+    '''Memoizes a function, returning a new copy of the result on each call
+
+    This is safe to use from multiple threads. If several threads call the
+    function with the same arguments before the result is stored, only one of
+    them runs the function, and the others wait for its result (single-flight).
+    If that call raises an exception, it is only raised in the thread that ran
+    the function, and one of the waiting threads runs the function again.
+    '''
+
     def __init__(self, f):
         self.__f = f
         self.args_spec = inspect.getfullargspec(f)
         self.__memo = {}
+
+        # Calls in progress (key -> threading.Event set when the call completes)
+        self.__in_flight = {}
+        self.__locks = [threading.Lock() for _ in range(lock_stripes)]
         functools.update_wrapper(self, f)
 
     def __call__(self, *args, **kwargs):
@@ -89,9 +110,45 @@ class BSEMemoize:
             # function to trigger the error
             return self.__f(*args, **kwargs)
 
-        if arg_key in self.__memo:
-            return pickle.loads(self.__memo[arg_key])
+        lock = self.__locks[hash(arg_key) % len(self.__locks)]
+
+        while True:
+            # Looking up a single key is atomic, so stored results are
+            # returned without taking the lock
+            data = self.__memo.get(arg_key)
+            if data is not None:
+                break
 
-        ret = self.__f(*args, **kwargs)
-        self.__memo[arg_key] = pickle.dumps(ret)
+            with lock:
+                data = self.__memo.get(arg_key)
+                done = self.__in_flight.get(arg_key)
+                run_here = data is None and done is None
+                if run_here:
+                    done = self.__in_flight[arg_key] = threading.Event()
+
+            if data is not None:
+                break
+            if run_here:
+                return self.__run(arg_key, lock, done, args, kwargs)
+
+            # Another thread is running the function with these arguments.
+            # Check again once it is done, in case it failed
+            done.wait()
+
+        if tracing.enabled():
+            tracing.count(memo_hits=1)
+        return pickle.loads(data)
+
+    def __run(self, arg_key, lock, done, args, kwargs):
+        '''Runs the function and stores the result, then wakes up the threads waiting for it'''
+
+        if tracing.enabled():
+            tracing.count(memo_misses=1)
+        try:
+            ret = self.__f(*args, **kwargs)
+            self.__memo[arg_key] = pickle.dumps(ret)
+        finally:
+            with lock:
+                del self.__in_flight[arg_key]
+            done.set()
         return ret
@@ -32,7 +32,9 @@
 Miscellaneous helper functions
 '''
 
+import os
 import re
+import importlib
 from . import lut
 
 
@@ -49,6 +51,35 @@ def transpose_matrix(mat):
     return list(map(list, zip(*mat)))
 
 
+def shallow_copy_basis(basis):
+    '''Copies a basis set dictionary, sharing all data below the element level
+
+    The top-level dictionary and the dictionary of each element are copied,
+    so data of the returned basis set (such as the list of electron shells of an element)
+    can be replaced without modifying the input. The shells, potentials, and
+    other data are shared with the input, and must not be modified in place.
+    '''
+
+    ret = basis.copy()
+    if 'elements' in basis:
+        ret['elements'] = {k: v.copy() for k, v in basis['elements'].items()}
+    return ret
+
+
+def cache_dir():
+    '''Directory for files cached by the library (such as precomputed tables)
+
+    This is the ``BSE_CACHE_DIR`` environment variable if set, otherwise
+    ``basis_set_exchange`` in ``XDG_CACHE_HOME`` (or ``~/.cache``).
+    '''
+
+    path = os.environ.get('BSE_CACHE_DIR')
+    if path:
+        return os.path.expanduser(path)
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'basis_set_exchange')
+
+
 def max_am(shells):
     '''Determine the maximum angular momentum of a list of shells or potentials'''
     all_am = [max(x['angular_momentum']) for x in shells]
@@ -273,3 +304,37 @@ def basis_name_from_filename(filename):
     name = name.replace('_sl_', '/')
     name = name.replace('_st_', '*')
     return name
+
+
+class LazyFunction:
+    '''
+    A function that is imported from its module only when first used
+
+    This is used by the reader, writer, and reference converter registries
+    so that importing the library does not import every format module.
+
+    Parameters
+    ----------
+    module_name : str
+        Full (dotted) name of the module containing the function
+    function_name : str
+        Name of the function within the module
+    '''
+
+    def __init__(self, module_name, function_name):
+        self.module_name = module_name
+        self.function_name = function_name
+        self._function = None
+
+    def resolve(self):
+        '''Import the module (if needed) and return the actual function'''
+        if self._function is None:
+            module = importlib.import_module(self.module_name)
+            self._function = getattr(module, self.function_name)
+        return self._function
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        return '<LazyFunction {}.{}>'.format(self.module_name, self.function_name)
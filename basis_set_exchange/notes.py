@@ -32,7 +32,108 @@
 Functionality for handling basis set and family notes
 '''
 
-from . import references
+import functools
+import re
+
+from . import memo
+from . import refconverters
+
+
+def _trie_pattern(words):
+    '''Creates a regular expression pattern matching any of the given words
+
+    The alternatives are nested by common prefixes (like a trie), so that
+    matching does not have to try every word separately.
+    '''
+
+    trie = {}
+    for w in words:
+        node = trie
+        for c in w:
+            node = node.setdefault(c, {})
+        node[''] = None
+
+    def _pattern(node):
+        alts = [re.escape(c) + _pattern(sub) for c, sub in sorted(node.items()) if c]
+        if not alts:
+            return ''
+        if len(alts) == 1 and '' not in node:
+            return alts[0]
+
+        pat = '(?:' + '|'.join(alts) + ')'
+        return pat + '?' if '' in node else pat
+
+    return _pattern(trie)
+
+
+class _ReferenceMatcher:
+    '''Finds all reference keys that appear in a string
+
+    This has the same result as testing each key with `key in string`, but
+    all keys are searched for with a single precompiled regular expression.
+    '''
+
+    def __init__(self, ref_keys):
+        ref_keys = sorted(set(ref_keys))
+
+        # Only the longest key is matched at each position, so also store
+        # the keys that are a prefix of another key
+        self.prefixes = {k: [x for x in ref_keys if x != k and k.startswith(x)] for k in ref_keys}
+
+        # Zero-width lookahead, so that overlapping keys are found, too. Checking
+        # the first character first avoids entering the full pattern at most positions
+        first_chars = ''.join(sorted(set(re.escape(k[0]) for k in ref_keys)))
+        if ref_keys:
+            self.regex = re.compile('(?=[{}])(?=({}))'.format(first_chars, _trie_pattern(ref_keys)))
+        else:
+            self.regex = None
+
+    def find(self, s):
+        '''Returns a set of all keys found in the string'''
+
+        if self.regex is None:
+            return set()
+
+        found = set()
+        for m in self.regex.finditer(s):
+            k = m.group(1)
+            if k not in found:
+                found.add(k)
+                found.update(self.prefixes[k])
+
+        return found
+
+
+@functools.lru_cache(maxsize=8)
+def _reference_matcher(ref_keys):
+    '''Reference matcher for a tuple of reference keys
+
+    There is usually only one set of references (that of the data directory),
+    so only a few matchers are kept.
+    '''
+    return _ReferenceMatcher(ref_keys)
+
+
+@functools.lru_cache(maxsize=1024)
+def _find_references_cached(notes, matcher):
+    '''References found in notes by a matcher (which is compared by identity)'''
+    return frozenset(matcher.find(notes))
+
+
+def _find_references(notes, ref_data):
+    '''Find all reference keys mentioned in the notes
+
+    The matcher is only built once for each set of references, and the result is
+    cached for each notes string (unless memoization is disabled). Both caches are
+    bounded, since the library may be used by a long-running process.
+    '''
+
+    ref_keys = tuple(ref_data.keys())
+
+    if not memo.memoize_enabled:
+        return _ReferenceMatcher(ref_keys).find(notes)
+
+    return _find_references_cached(notes, _reference_matcher(ref_keys))
 
 
 def process_notes(notes, ref_data):
@@ -41,13 +142,7 @@ def process_notes(notes, ref_data):
     `:ref:` tags are removed and the actual reference data is appended
     '''
 
-    ref_keys = ref_data.keys()
-
-    found_refs = set()
-    for k in ref_keys:
-        if k in notes:
-            found_refs.add(k)
-
+    found_refs = _find_references(notes, ref_data)
     # The block to append
     reference_sec = '\n\n'
     reference_sec += '-------------------------------------------------\n'
@@ -60,7 +155,7 @@ def process_notes(notes, ref_data):
         return notes
 
     for r in sorted(found_refs):
-        rtxt = references.reference_text(r, ref_data[r])
+        rtxt = refconverters.render_reference(r, ref_data[r], 'txt')
         reference_sec += rtxt + '\n\n'
 
     return notes + reference_sec
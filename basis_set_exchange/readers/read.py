@@ -35,116 +35,106 @@ Read a basis set file in a given format
 import os
 import bz2
 from ..skel import create_skel
-from ..validator import validate_data
 from ..compose import _whole_basis_types
-from .turbomole import read_turbomole
-from .g94 import read_g94
-from .nwchem import read_nwchem
-from .gbasis import read_gbasis
-from .dalton import read_dalton
-from .molcas import read_molcas
-from .molpro import read_molpro
-from .libmol import read_libmol
-from .genbas import read_genbas
-from .demon2k import read_demon2k
-from .ricdlib import read_ricdlib
-from .gamess_us import read_gamess_us
-from .cp2k import read_cp2k
-from .crystal import read_crystal
-from .veloxchem import read_veloxchem
-from .bsejson import read_json
+from ..misc import LazyFunction
+
+
+def _reader(module_name, function_name):
+    '''Registry entry for a reader function that is imported on first use'''
+    return LazyFunction(__package__ + '.' + module_name, function_name)
+
 
 _reader_map = {
     'turbomole': {
         'display': 'Turbomole',
         'extension': '.tm',
-        'reader': read_turbomole
+        'reader': _reader('turbomole', 'read_turbomole')
     },
     'gaussian94': {
         'display': 'Gaussian94',
         'extension': '.gbs',
-        'reader': read_g94
+        'reader': _reader('g94', 'read_g94')
     },
     'nwchem': {
         'display': 'NWChem',
         'extension': '.nw',
-        'reader': read_nwchem
+        'reader': _reader('nwchem', 'read_nwchem')
     },
     'dalton': {
         'display': 'Dalton',
         'extension': '.mol',
-        'reader': read_dalton
+        'reader': _reader('dalton', 'read_dalton')
     },
     'molcas': {
         'display': 'Molcas',
         'extension': '.molcas',
-        'reader': read_molcas
+        'reader': _reader('molcas', 'read_molcas')
     },
     # for now this is just an alias for molcas, as it seems to work fine
     'molcas_library': {
         'display': 'Molcas basis_library',
         'extension': '.molcas',
-        'reader': read_molcas
+        'reader': _reader('molcas', 'read_molcas')
     },
     'molpro': {
         'display': 'Molpro',
         'extension': '.mpro',
-        'reader': read_molpro
+        'reader': _reader('molpro', 'read_molpro')
     },
     'libmol': {
         'display': 'Molpro system library',
         'extension': '.libmol',
-        'reader': read_libmol
+        'reader': _reader('libmol', 'read_libmol')
     },
     'cfour': {
         'display': 'CFOUR',
         'extension': '.c4bas',
-        'reader': read_genbas
+        'reader': _reader('genbas', 'read_genbas')
     },
     'genbas': {
         'display': 'Genbas',
         'extension': '.genbas',
-        'reader': read_genbas
+        'reader': _reader('genbas', 'read_genbas')
     },
     'gbasis': {
         'display': 'GBasis',
         'extension': '.gbasis',
-        'reader': read_gbasis
+        'reader': _reader('gbasis', 'read_gbasis')
     },
     'demon2k': {
         'display': 'deMon2k',
         'extension': '.d2k',
-        'reader': read_demon2k
+        'reader': _reader('demon2k', 'read_demon2k')
     },
     'ricdlib': {
         'display': 'MolCAS RICDlib',
         'extension': '.RICDLib',
-        'reader': read_ricdlib
+        'reader': _reader('ricdlib', 'read_ricdlib')
     },
     'gamess_us': {
         'display': 'GAMESS US',
         'extension': '.bas',
-        'reader': read_gamess_us
+        'reader': _reader('gamess_us', 'read_gamess_us')
     },
     'cp2k': {
         'display': 'CP2K',
         'extension': '.cp2k',
-        'reader': read_cp2k
+        'reader': _reader('cp2k', 'read_cp2k')
     },
     'crystal': {
         'display': 'Crystal',
         'extension': '.crystal',
-        'reader': read_crystal
+        'reader': _reader('crystal', 'read_crystal')
     },
     'veloxchem': {
         'display': 'VeloxChem',
         'extension': '.vlx',
-        'reader': read_veloxchem
+        'reader': _reader('veloxchem', 'read_veloxchem')
     },
     'json': {
         'display': 'json',
         'extension': '.json',
-        'reader': read_json
+        'reader': _reader('bsejson', 'read_json')
     }
 }
 
@@ -198,6 +188,8 @@ def read_formatted_basis_str(basis_str, basis_fmt, validate=False, as_component=
 
     # Validate if desired
     if validate:
+        # Imported here since the validator requires jsonschema
+        from ..validator import validate_data
         validate_data(bs_type, data)
 
     return data
@@ -32,4 +32,5 @@
 Conversion of references to various formats
 '''
 
-from .convert import convert_references, get_reference_formats, get_format_extension
+from .convert import (convert_references, convert_references_batch, render_reference, render_all_references,
+                      load_rendered_references, get_reference_formats, get_format_extension)
@@ -32,18 +32,22 @@
 Converts basis set data to a specified output format
 '''
 
+import functools
 import textwrap
 import json
 
-from .. import sort, misc
+from .. import sort, misc, memo
 from .common import get_library_citation
-from .bib import write_bib
-from .ris import write_ris
-from .endnote import write_endnote
 
 # For plain text
 from ..references import reference_text
 
+
+def _converter(module_name, function_name):
+    '''Registry entry for a reference converter that is imported on first use'''
+    return misc.LazyFunction(__package__ + '.' + module_name, function_name)
+
+
 _converter_map = {
     'txt': {
         'display': 'Plain Text',
@@ -55,19 +59,19 @@ _converter_map = {
         'display': 'BibTeX',
         'extension': '.bib',
         'comment': '%',
-        'function': write_bib
+        'function': _converter('bib', 'write_bib')
     },
     'ris': {
         'display': 'RIS',
         'extension': '.RIS',
         'comment': '#',
-        'function': write_ris
+        'function': _converter('ris', 'write_ris')
     },
     'endnote': {
         'display': 'EndNote',
         'extension': '.enw',
         'comment': '#',
-        'function': write_endnote
+        'function': _converter('endnote', 'write_endnote')
     },
     'json': {
         'display': 'JSON',
@@ -78,29 +82,154 @@ _converter_map = {
 }
 
 
-def convert_references(ref_data, fmt):
+# Maximum number of rendered references kept in the cache. Many basis sets
+# share the same references, so they only need to be rendered once. This is
+# enough for all the references of the library in all formats, while keeping
+# the cache bounded in long-running processes (such as `bse serve`).
+_render_cache_size = 4096
+
+# Precomputed rendered references (see load_rendered_references).
+# Maps (fmt, key) to a tuple of (reference data, rendered string)
+_precomputed = {}
+
+
+def _render_cache_key(key, ref, fmt):
+    '''Creates a hashable key for the cache of rendered references'''
+    return (fmt, key, tuple((k, tuple(v) if isinstance(v, list) else v) for k, v in ref.items()))
+
+
+def _lookup_precomputed(key, fmt, cache_key):
+    '''Returns a precomputed rendered reference, or None if there is no valid one'''
+
+    pre = _precomputed.get((fmt, key))
+    if pre is None:
+        return None
+
+    # The precomputed string is only used if it was rendered from the same data
+    pre_ref, pre_str = pre
+    if _render_cache_key(key, sort.sort_single_reference(pre_ref), fmt) != cache_key:
+        return None
+    return pre_str
+
+
+@functools.lru_cache(maxsize=_render_cache_size)
+def _render_cached(cache_key):
+    '''Renders a reference given its cache key (see :func:`_render_cache_key`)
+
+    The key includes the reference data itself, so different data under the same
+    reference key is handled properly.
     '''
-    Returns the basis set references as a string representing
-    the data in the specified output format
+
+    fmt, key, items = cache_key
+    ref_str = _lookup_precomputed(key, fmt, cache_key)
+    if ref_str is None:
+        ref = {k: list(v) if isinstance(v, tuple) else v for k, v in items}
+        ref_str = _converter_map[fmt]['function'](key, ref)
+    return ref_str
+
+
+def render_reference(key, ref, fmt):
+    '''
+    Returns a single reference as a string in the specified format
+
+    The result is cached (unless memoization is disabled - see :mod:`basis_set_exchange.memo`),
+    so rendering the same reference again is cheap.
+
+    Parameters
+    ----------
+    key : str
+        Reference key (authorname2009a, etc)
+    ref : dict
+        Information about a single reference
+    fmt : str
+        Reference format. Must be one of the formats that handle single references
+        (ie, not json)
     '''
 
-    # Make fmt case insensitive
     fmt = fmt.lower()
-    if fmt not in _converter_map:
+    if fmt not in _converter_map or _converter_map[fmt]['function'] is None:
         raise RuntimeError('Unknown reference format "{}"'.format(fmt))
 
-    # Shortcut for JSON
-    if fmt == 'json':
-        return json.dumps(ref_data, indent=4, ensure_ascii=False)
+    if not memo.memoize_enabled:
+        return _converter_map[fmt]['function'](key, ref)
+
+    return _render_cached(_render_cache_key(key, ref, fmt))
+
+
+def render_all_references(ref_data, fmts=None):
+    '''
+    Renders all references in the given formats
+
+    This is used for creating a file of precomputed rendered references
+    (see :func:`basis_set_exchange.curate.create_rendered_references_file`).
+    The references are sorted (in the same way as in :func:`convert_references`)
+    before being rendered.
+
+    Parameters
+    ----------
+    ref_data : dict
+        Dictionary containing all reference information (ie, from REFERENCES.json)
+    fmts : list
+        Formats to render. By default, all formats that handle single references are rendered
+
+    Returns
+    -------
+    dict
+        Mapping of format to a dictionary of reference key -> rendered string
+    '''
+
+    if fmts is None:
+        fmts = [k for k, v in _converter_map.items() if v['function'] is not None]
+
+    ret = {}
+    for fmt in fmts:
+        fmt = fmt.lower()
+        ret[fmt] = {
+            k: render_reference(k, sort.sort_single_reference(v), fmt)
+            for k, v in ref_data.items() if k != 'molssi_bse_schema'
+        }
+
+    return ret
+
+
+def load_rendered_references(rendered, ref_data):
+    '''
+    Makes precomputed rendered references available to :func:`render_reference`
+
+    A precomputed string is only used if the reference data passed to
+    :func:`render_reference` matches the data it was rendered from.
+
+    Parameters
+    ----------
+    rendered : dict
+        Rendered references, as returned from :func:`render_all_references`
+    ref_data : dict
+        The reference information that the references were rendered from
+    '''
+
+    for fmt, fmt_refs in rendered.items():
+        for k, ref_str in fmt_refs.items():
+            if k in ref_data:
+                _precomputed[(fmt, k)] = (ref_data[k], ref_str)
+
+    # References rendered before may now have a precomputed string
+    _render_cached.cache_clear()
+
+
+def _sort_reference_data(ref_data):
+    '''Sorts the data of all references of a basis set (in place)'''
 
-    # Sort the data for all references
     for elref in ref_data:
         for rinfo in elref['reference_info']:
             rdata = rinfo['reference_data']
             rinfo['reference_data'] = [(k, sort.sort_single_reference(v)) for k, v in rdata]
 
-    # This function is used to convert a single ref
-    single_ref_func = _converter_map[fmt]['function']
+
+def _format_references(ref_data, fmt, render):
+    '''
+    Formats the (sorted) references of a basis set, rendering each single
+    reference with ``render(key, ref)``
+    '''
 
     # Comment style
     comment = _converter_map[fmt]['comment']
@@ -117,7 +246,7 @@ def convert_references(ref_data, fmt):
     ref_str += comment_line
 
     for k, r in lib_citations.items():
-        ref_str += single_ref_func(k, r) + '\n\n'
+        ref_str += render(k, r) + '\n\n'
 
     ref_str += comment_line
     ref_str += comment + " References for the basis set\n"
@@ -148,11 +277,80 @@ def convert_references(ref_data, fmt):
 
     # Go through them sorted alphabetically by key
     for k, r in sorted(unique_refs.items(), key=lambda x: x[0]):
-        ref_str += '{}\n\n'.format(single_ref_func(k, r))
+        ref_str += '{}\n\n'.format(render(k, r))
 
     return ref_str
 
 
+def convert_references(ref_data, fmt):
+    '''
+    Returns the basis set references as a string representing
+    the data in the specified output format
+    '''
+
+    # Make fmt case insensitive
+    fmt = fmt.lower()
+    if fmt not in _converter_map:
+        raise RuntimeError('Unknown reference format "{}"'.format(fmt))
+
+    # Shortcut for JSON
+    if fmt == 'json':
+        return json.dumps(ref_data, indent=4, ensure_ascii=False)
+
+    _sort_reference_data(ref_data)
+    return _format_references(ref_data, fmt, lambda k, r: render_reference(k, r, fmt))
+
+
+def convert_references_batch(all_ref_data, fmt):
+    '''
+    Converts the references of many basis sets at once
+
+    Each distinct reference (the same key and data) is rendered only once for
+    the whole batch, and then shared by all the basis sets citing it. This does
+    not depend on the cache of :func:`render_reference`, so it also holds with
+    memoization disabled or when the batch has more references than the cache.
+
+    Parameters
+    ----------
+    all_ref_data : dict
+        Mapping of an arbitrary identifier (ie, basis set name) to reference
+        data as returned by :func:`basis_set_exchange.api.get_references`
+        (with `fmt` None)
+    fmt : str
+        Reference format
+
+    Returns
+    -------
+    dict
+        Mapping of the same identifiers to the references as a string, identical
+        to what :func:`convert_references` returns for each of them
+    '''
+
+    fmt = fmt.lower()
+    if fmt not in _converter_map:
+        raise RuntimeError('Unknown reference format "{}"'.format(fmt))
+
+    if fmt == 'json':
+        return {k: json.dumps(v, indent=4, ensure_ascii=False) for k, v in all_ref_data.items()}
+
+    # Rendered strings of this batch, by the same key as the render cache
+    rendered = {}
+
+    def render(k, r):
+        cache_key = _render_cache_key(k, r, fmt)
+        ref_str = rendered.get(cache_key)
+        if ref_str is None:
+            ref_str = render_reference(k, r, fmt)
+            rendered[cache_key] = ref_str
+        return ref_str
+
+    ret = {}
+    for name, ref_data in all_ref_data.items():
+        _sort_reference_data(ref_data)
+        ret[name] = _format_references(ref_data, fmt, render)
+    return ret
+
+
 def get_reference_formats():
     '''Return information about the reference/citation formats available
 
@@ -34,6 +34,145 @@ Some helper functions related to handling of references/citations
 
 import textwrap
 
+# Text wrapping for plain text references (the data, not the key)
+_ref_wrap = textwrap.TextWrapper(initial_indent='', subsequent_indent=' ' * 8)
+
+
+def _freeze(value):
+    """Converts (nested) lists and dicts into hashable tuples
+
+    Dictionaries become tuples of (key, value) pairs sorted by key, so that
+    equal dictionaries give equal results.
+    """
+
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(x) for x in value)
+    return value
+
+
+def reference_signature(elref):
+    """
+    Creates a canonical, hashable representation of the references of an element
+
+    Two elements have the same signature if and only if their reference
+    information (a list of dictionaries, typically containing 'reference_description'
+    and 'reference_keys') compares equal.
+
+    Parameters
+    ----------
+    elref : list
+        The reference information for an element (the 'references' entry of the element data)
+    """
+
+    sig = []
+    for x in elref:
+        # Fast path for the usual entries. This gives the same result as _freeze
+        if len(x) == 2 and 'reference_description' in x and 'reference_keys' in x:
+            sig.append((('reference_description', x['reference_description']),
+                        ('reference_keys', tuple(x['reference_keys']))))
+        else:
+            sig.append(_freeze(x))
+
+    return tuple(sig)
+
+
+def group_references(element_refs, groups=None):
+    """
+    Groups elements by identical reference information
+
+    Elements are grouped in a single pass by their reference signature
+    (see :func:`reference_signature`). Groups are kept in the order that they
+    are first encountered.
+
+    Parameters
+    ----------
+    element_refs : iterable
+        Iterable of (element, reference information) pairs
+    groups : dict
+        Existing grouping (as returned from this function) to add the elements to.
+        This dictionary is modified. If None, a new grouping is created.
+
+    Returns
+    -------
+    dict
+        Mapping of signature to a dictionary with 'reference_info' (the reference
+        information shared by the group) and 'elements' (list of elements in the group)
+    """
+
+    if groups is None:
+        groups = {}
+
+    for el, elref in element_refs:
+        sig = reference_signature(elref)
+        group = groups.get(sig)
+        if group is None:
+            groups[sig] = {'reference_info': elref, 'elements': [el]}
+        else:
+            group['elements'].append(el)
+
+    return groups
+
+
+def filter_reference_groups(groups, elements):
+    """
+    Restricts a grouping of elements (from :func:`group_references`) to some elements
+
+    This gives the same grouping as calling :func:`group_references` on only the given
+    elements (in order of increasing Z), without having to compare the references again.
+    A new dictionary is returned, and `groups` is not modified.
+
+    Parameters
+    ----------
+    groups : dict
+        Grouping of elements as returned from :func:`group_references`
+    elements : iterable
+        Elements (Z numbers as str) to keep
+    """
+
+    elements = set(elements)
+
+    new_groups = []
+    for sig, group in groups.items():
+        group_elements = [el for el in group['elements'] if el in elements]
+        if group_elements:
+            new_groups.append((sig, {'reference_info': group['reference_info'], 'elements': group_elements}))
+
+    # Groups are ordered by their first element
+    new_groups.sort(key=lambda x: int(x[1]['elements'][0]))
+    return dict(new_groups)
+
+
+def expand_reference_groups(groups, ref_data):
+    """
+    Creates the compacted reference list from a grouping of elements
+
+    The reference data for each group is only looked up once. See :func:`compact_references`
+    for a description of the returned data. Neither `groups` nor the reference
+    information it contains is modified.
+
+    Parameters
+    ----------
+    groups : dict
+        Grouping of elements as returned from :func:`group_references`
+    ref_data : dict
+        Dictionary containing all reference information
+    """
+
+    element_refs = []
+    for group in groups.values():
+        # Since we store the keys with the data, we don't need them anymore
+        ref_info = []
+        for elref in group['reference_info']:
+            new_elref = {k: v for k, v in elref.items() if k != 'reference_keys'}
+            new_elref['reference_data'] = [(k, ref_data[k]) for k in elref['reference_keys']]
+            ref_info.append(new_elref)
+
+        element_refs.append({'reference_info': ref_info, 'elements': list(group['elements'])})
+
+    return element_refs
+
 
 def compact_references(basis_dict, ref_data):
     """
@@ -52,34 +191,14 @@ def compact_references(basis_dict, ref_data):
         Dictionary containing all reference information
     """
 
-    element_refs = []
-
     # Create a mapping of elements -> reference information
     # (sort by Z first, keeping in mind Z is a string)
     sorted_el = sorted(basis_dict['elements'].items(), key=lambda x: int(x[0]))
 
-    for el, eldata in sorted_el:
-
-        # elref is a list of dict
-        # dict is { 'reference_description': str, 'reference_keys': [keys] }
-        elref = eldata['references']
-
-        for x in element_refs:
-            if x['reference_info'] == elref:
-                x['elements'].append(el)
-                break
-        else:
-            element_refs.append({'reference_info': elref, 'elements': [el]})
-
-    for item in element_refs:
-        # Loop over a list of dictionaries for this group of elements and add the
-        # actual reference data
-        # Since we store the keys with the data, we don't need it anymore
-        for elref in item['reference_info']:
-            elref['reference_data'] = [(k, ref_data[k]) for k in elref['reference_keys']]
-            elref.pop('reference_keys')
-
-    return element_refs
+    # elref is a list of dict
+    # dict is { 'reference_description': str, 'reference_keys': [keys] }
+    groups = group_references((el, eldata['references']) for el, eldata in sorted_el)
+    return expand_reference_groups(groups, ref_data)
 
 
 def reference_text(key, ref):
@@ -93,40 +212,37 @@ def reference_text(key, ref):
         Information about a single reference
     '''
 
-    # Set up the text wrapping of the data (not the key)
-    ref_wrap = textwrap.TextWrapper(initial_indent='', subsequent_indent=' ' * 8)
-
     s = ''
     if ref['_entry_type'] == 'unpublished':
-        s += ref_wrap.fill(', '.join(ref['authors'])) + '\n'
+        s += _ref_wrap.fill(', '.join(ref['authors'])) + '\n'
         if 'title' in ref:
-            s += ref_wrap.fill(ref['title']) + '\n'
+            s += _ref_wrap.fill(ref['title']) + '\n'
         if 'year' in ref:
             s += ref['year'] + ', '
         s += 'unpublished'
     elif ref['_entry_type'] == 'article':
-        s += ref_wrap.fill(', '.join(ref['authors'])) + '\n'
-        s += ref_wrap.fill(ref['title']) + '\n'
+        s += _ref_wrap.fill(', '.join(ref['authors'])) + '\n'
+        s += _ref_wrap.fill(ref['title']) + '\n'
         s += '{} {}, {} ({})'.format(ref['journal'], ref['volume'], ref['pages'], ref['year'])
         if 'doi' in ref:
             s += '\n' + ref['doi']
     elif ref['_entry_type'] == 'incollection':
-        s += ref_wrap.fill(', '.join(ref['authors']))
-        s += '\n' + ref_wrap.fill('{}'.format(ref['title']))
-        s += '\n' + ref_wrap.fill('in \'{}\''.format(ref['booktitle']))
+        s += _ref_wrap.fill(', '.join(ref['authors']))
+        s += '\n' + _ref_wrap.fill('{}'.format(ref['title']))
+        s += '\n' + _ref_wrap.fill('in \'{}\''.format(ref['booktitle']))
         if 'editors' in ref:
-            s += '\n' + ref_wrap.fill('ed. ' + ', '.join(ref['editors']))
+            s += '\n' + _ref_wrap.fill('ed. ' + ', '.join(ref['editors']))
         if 'series' in ref:
             s += '\n{} {}, {} ({})'.format(ref['series'], ref['volume'], ref['pages'], ref['year'])
         if 'doi' in ref:
             s += '\n' + ref['doi']
     elif ref['_entry_type'] == 'phdthesis':
-        s += ref_wrap.fill(', '.join(ref['authors'])) + '\n'
-        s += ref_wrap.fill(ref['title']) + '\n'
+        s += _ref_wrap.fill(', '.join(ref['authors'])) + '\n'
+        s += _ref_wrap.fill(ref['title']) + '\n'
         s += '{}, {}'.format(ref.get('type', 'Ph.D. Thesis'), ref['school'])
     elif ref['_entry_type'] == 'techreport':
-        s += ref_wrap.fill(', '.join(ref['authors'])) + '\n'
-        s += '\n' + ref_wrap.fill('{}'.format(ref['title']))
+        s += _ref_wrap.fill(', '.join(ref['authors'])) + '\n'
+        s += '\n' + _ref_wrap.fill('{}'.format(ref['title']))
         s += '\n\'{}\''.format(ref['institution'])
         s += '\n' + ref.get('type', 'Technical Report')
         if 'number' in ref:
@@ -135,22 +251,22 @@ def reference_text(key, ref):
         if 'doi' in ref:
             s += '\n' + ref['doi']
     elif ref['_entry_type'] == 'misc':
-        s += ref_wrap.fill(', '.join(ref['authors'])) + '\n'
-        s += ref_wrap.fill(ref['title'])
+        s += _ref_wrap.fill(', '.join(ref['authors'])) + '\n'
+        s += _ref_wrap.fill(ref['title'])
         if 'year' in ref:
             s += '\n' + ref['year']
         if 'doi' in ref:
             s += '\n' + ref['doi']
     elif ref['_entry_type'] == 'dataset':
-        s += ref_wrap.fill(', '.join(ref['authors'])) + '\n'
-        s += ref_wrap.fill(ref['title']) + '\n'
+        s += _ref_wrap.fill(', '.join(ref['authors'])) + '\n'
+        s += _ref_wrap.fill(ref['title']) + '\n'
         s += '{} ({})'.format(ref['publisher'], ref['year'])
         if 'doi' in ref:
             s += '\n' + ref['doi']
     else:
         raise RuntimeError('Cannot handle reference type {}'.format(ref['_entry_type']))
     if 'note' in ref:
-        s += '\n' + ref_wrap.fill(ref['note'])
+        s += '\n' + _ref_wrap.fill(ref['note'])
 
     # The final output has the key on its own line. The rest is indented by 4
     s = '\n'.join(' ' * 4 + x for x in s.splitlines())
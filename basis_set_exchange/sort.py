@@ -33,7 +33,7 @@ Sorting of BSE related dictionaries and data
 '''
 
 import sys
-import copy
+from . import misc
 from .ints import gto_Rsq_contr
 
 # Dictionaries for python 3.6 and above are insertion ordered
@@ -135,12 +135,10 @@ def sort_shell(shell, use_copy=True):
     """
     Sort a basis set shell into a standard order
 
-    If use_copy is True, the input shells are not modified.
+    If use_copy is True, the input shell is not modified. If the shell is already
+    in standard order, the input shell itself is returned.
     """
 
-    if use_copy:
-        shell = copy.deepcopy(shell)
-
     tmp_c = shell['coefficients']
     tmp_z = shell['exponents']
 
@@ -155,6 +153,11 @@ def sort_shell(shell, use_copy=True):
         # so we don't have to sort the contractions.
         cidx = range(len(tmp_c))
 
+    if use_copy:
+        if zidx == list(range(len(tmp_z))) and list(cidx) == list(range(len(tmp_c))):
+            return shell
+        shell = shell.copy()
+
     # Collect the exponents and coefficients
     newexp = [tmp_z[i] for i in zidx]
     newcoef = [[tmp_c[i][j] for j in zidx] for i in cidx]
@@ -174,15 +177,12 @@ def sort_shells(shells, use_copy=True):
     The order of the shell list is in increasing angular momentum, and then
     by decreasing number of primitives, then decreasing value of the largest exponent.
 
-    If use_copy is True, the input shells are not modified.
+    If use_copy is True, the input shells are not modified. Shells that are
+    already in standard order are not copied.
     """
 
-    if use_copy:
-        shells = copy.deepcopy(shells)
-
     # Sort primitives within a shell
-    # (copying already handled above)
-    shells = [sort_shell(sh, False) for sh in shells]
+    shells = [sort_shell(sh, use_copy) for sh in shells]
 
     # Collect minimum spatial extent of the shells
     min_rms = []
@@ -207,12 +207,10 @@ def sort_potentials(potentials, use_copy=True):
     The order of the shell list is in increasing angular momentum, with the largest
     angular momentum being moved to the front.
 
-    If use_copy is True, the input potentials are not modified.
+    The input potentials are never modified (use_copy is kept for
+    consistency with the other sorting functions).
     """
 
-    if use_copy:
-        potentials = copy.deepcopy(potentials)
-
     # Sort by increasing AM, then move the last element to the front
     potentials = sorted(potentials, key=lambda x: x['angular_momentum'])
     potentials.insert(0, potentials.pop())
@@ -223,15 +221,16 @@ def sort_basis(basis, use_copy=True):
     """
     Sorts all the information in a basis set into a standard order
 
-    If use_copy is True, the input basis set is not modified.
+    If use_copy is True, the input basis set is not modified. The returned basis
+    set may share data with the input.
     """
 
     if use_copy:
-        basis = copy.deepcopy(basis)
+        basis = misc.shallow_copy_basis(basis)
 
     for k, el in basis['elements'].items():
         if 'electron_shells' in el:
-            el['electron_shells'] = sort_shells(el['electron_shells'], False)
+            el['electron_shells'] = sort_shells(el['electron_shells'], use_copy)
         if 'ecp_potentials' in el:
             el['ecp_potentials'] = sort_potentials(el['ecp_potentials'], False)
 
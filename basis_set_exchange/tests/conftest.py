@@ -28,6 +28,7 @@
 # ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+import os
 import pytest
 
 
@@ -50,3 +51,15 @@ def pytest_ignore_collect(collection_path, config):
         return False
     else:
         return str(collection_path).endswith('_slow.py')
+
+
+@pytest.fixture(autouse=True, scope='session')
+def _isolated_cache_dir(tmp_path_factory):
+    """Keep the files cached by the library during the tests out of the user's cache directory"""
+    old = os.environ.get('BSE_CACHE_DIR')
+    os.environ['BSE_CACHE_DIR'] = str(tmp_path_factory.mktemp('bse_cache'))
+    yield
+    if old is None:
+        del os.environ['BSE_CACHE_DIR']
+    else:
+        os.environ['BSE_CACHE_DIR'] = old
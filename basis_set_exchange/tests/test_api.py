@@ -148,6 +148,26 @@ def test_get_references_1(basis_name, fmt):
         bse.get_references(basis_name, elements=selected_elements, fmt=fmt, version=ver)
 
 
+@pytest.mark.parametrize('basis_name', bs_names_sample + ['ano-rcc', 'def2-tzvp'])
+def test_get_references_2(basis_name):
+    """ Tests that the references-only path matches the references
+        of the fully-composed basis set
+    """
+    avail_elements = list(bse.get_basis(basis_name)['elements'].keys())
+    selected_elements = random.sample(avail_elements, random.randint(1, len(avail_elements)))
+
+    ref_data = bse.get_reference_data()
+    for elements in [None, selected_elements]:
+        bs = bse.get_basis(basis_name, elements=elements)
+        expected = bse.references.compact_references(bs, ref_data)
+        refs = bse.get_references(basis_name, elements=elements)
+        assert refs == expected
+
+        # Cached data is not shared with the caller
+        refs[0]['elements'].append('999')
+        assert bse.get_references(basis_name, elements=elements) == expected
+
+
 @pytest.mark.parametrize('primary_basis,role,expected', role_tests)
 def test_lookup_by_role(primary_basis, role, expected):
     """Test looking up data by role
@@ -218,3 +238,26 @@ def test_get_formats(fmts):
 def test_get_reader_formats():
     '''Test the get_reader_formats function'''
     bse.get_reference_formats()
+
+
+@pytest.mark.parametrize('get_aux', ['autoaux', 'autoabs'])
+def test_get_aux_bases(get_aux):
+    '''Test generating auxiliary basis sets for several basis sets at once'''
+    names = ['cc-pvdz', 'def2-svp', '6-31g*']
+    ret = bse.get_aux_bases(names, get_aux=get_aux, elements=[1, 6, 16], nprocs=2)
+    assert list(ret) == names
+    for name in names:
+        assert ret[name] == bse.get_basis(name, elements=[1, 6, 16], get_aux=get_aux)
+
+    ret = bse.get_aux_bases(family='pople', get_aux=get_aux, elements=[1, 6], nprocs=1)
+    assert '6-31G*' in ret
+    for name, aux in ret.items():
+        assert aux == bse.get_basis(name, elements=[1, 6], get_aux=get_aux)
+
+
+def test_get_aux_bases_fail():
+    '''Test failures of get_aux_bases'''
+    with pytest.raises(RuntimeError, match=r'Exactly one of'):
+        bse.get_aux_bases(['cc-pvdz'], family='dunning')
+    with pytest.raises(ValueError, match=r"must be 'autoaux' or 'autoabs'"):
+        bse.get_aux_bases(['cc-pvdz'], get_aux='cholesky-small')
@@ -64,6 +64,50 @@ def test_real_gaunt_selection_rules():
     assert real_gaunt(1, 0, 1, 0, 4, 0) == 0.0
 
 
+def test_gaunt_store_matches_backend(tmp_path):
+    """The saved table store and its quadrature assembly reproduce the
+    Gaunt tables of the exact backend."""
+    from basis_set_exchange.auxgen import gaunt
+
+    lmax = 4
+    offsets, size = gaunt._store_layout(lmax)
+    stored = numpy.load(gaunt.build_store(lmax, directory=str(tmp_path)), mmap_mode='r')
+    quadrature = gaunt._assemble_quadrature(lmax)
+    assert stored.shape == quadrature.shape == (size, )
+    for (l1, l2, l3), off in offsets.items():
+        G = gaunt.gaunt_table(l1, l2, l3)
+        for values in (stored, quadrature):
+            slab = values[off:off + G.size].reshape(G.shape)
+            assert numpy.array_equal(slab != 0.0, G != 0.0)
+            assert numpy.allclose(slab, G, rtol=0.0, atol=1.0e-14)
+
+
+def test_gaunt_store_unwritable(tmp_path, monkeypatch):
+    """With an unwritable cache directory the store is assembled once and
+    kept in memory."""
+    from basis_set_exchange.auxgen import gaunt
+
+    # A file where the directory should be
+    not_a_dir = tmp_path / 'file'
+    not_a_dir.write_text('')
+    monkeypatch.setattr(gaunt, 'store_dir', lambda: str(not_a_dir / 'cache'))
+
+    calls = []
+    assemble = gaunt._assemble_store
+    monkeypatch.setattr(gaunt, '_assemble_store', lambda lmax: calls.append(lmax) or assemble(lmax))
+
+    lmax = 3
+    gaunt._load_store.cache_clear()
+    try:
+        values, offsets = gaunt._load_store(lmax)
+    finally:
+        gaunt._load_store.cache_clear()
+
+    assert calls == [lmax]
+    assert not isinstance(values, numpy.memmap)
+    assert values.shape == (gaunt._store_layout(lmax)[1], )
+
+
 def test_coupling_lvals_pp():
     # Two p functions couple to L = 0, 2 (parity)
     assert coupling_lvals(1, 1) == (0, 2)
@@ -109,6 +153,65 @@ def test_radial_symmetric_tuple():
         radial_integral(4, 4, 4, 3.5, 0.2), rel=1e-13)
 
 
+def test_radial_integral_batch_matches_scalar():
+    """The batched kernel over mixed (L, LA, LB) orders and an exponent
+    grid agrees with the scalar path, including selection-rule zeros."""
+    from basis_set_exchange.auxgen.radial import radial_integral_batch
+    rng = numpy.random.default_rng(7)
+    L = rng.integers(0, 5, size=(40, 1))
+    LA = rng.integers(0, 7, size=(40, 1))
+    alpha = rng.uniform(0.05, 50.0, size=(40, 1))
+    beta = rng.uniform(0.05, 50.0, size=(1, 25))
+    batch = radial_integral_batch(L, LA, L, alpha, beta)
+    assert batch.shape == (40, 25)
+    for i in range(40):
+        for j in range(25):
+            expected = radial_integral(int(L[i, 0]), int(LA[i, 0]), int(L[i, 0]), float(alpha[i, 0]),
+                                       float(beta[0, j]))
+            assert batch[i, j] == pytest.approx(expected, rel=1e-13, abs=0.0)
+
+
+def _scalar_radial_batch(L, LA, LB, alpha, beta):
+    """Reference for :func:`radial_integral_batch` evaluating every entry
+    with the scalar :func:`radial_integral`."""
+    arrays = numpy.broadcast_arrays(numpy.asarray(L), numpy.asarray(LA), numpy.asarray(LB),
+                                    numpy.asarray(alpha, dtype=float), numpy.asarray(beta, dtype=float))
+    out = numpy.empty(arrays[0].shape)
+    for idx in numpy.ndindex(out.shape):
+        out[idx] = radial_integral(int(arrays[0][idx]), int(arrays[1][idx]), int(arrays[2][idx]),
+                                   float(arrays[3][idx]), float(arrays[4][idx]))
+    return out
+
+
+def test_orbital_aux_projection_matches_scalar(monkeypatch):
+    """The projection built with the batched radial kernel agrees with the
+    entry-by-entry scalar evaluation."""
+    from basis_set_exchange.auxgen import twoel
+    from basis_set_exchange.auxgen.products import decontract_primitives
+    el = get_basis('cc-pVDZ', elements=[8])['elements']['8']
+    primitives = decontract_primitives(el)
+    aux = list(numpy.geomspace(0.1, 200.0, 12))
+
+    batched = {L: twoel.orbital_aux_projection(L, primitives, aux) for L in range(4)}
+    monkeypatch.setattr(twoel, 'radial_integral_batch', _scalar_radial_batch)
+    for L, (V, J) in batched.items():
+        V_ref, J_ref = twoel.orbital_aux_projection(L, primitives, aux)
+        assert numpy.array_equal(V, V_ref)
+        assert numpy.allclose(J, J_ref, rtol=1e-12, atol=0.0)
+
+
+def test_W_block_matches_scalar(monkeypatch):
+    from basis_set_exchange.auxgen import contract
+    el = get_basis('def2-TZVP', elements=[26])['elements']['26']
+    aos = contract.orbital_aos(el)
+    aux = list(numpy.geomspace(0.1, 2000.0, 15))
+
+    batched = {L: contract._W_block(aos, L, aux) for L in range(5)}
+    monkeypatch.setattr(contract, 'radial_integral_batch', _scalar_radial_batch)
+    for L, W in batched.items():
+        assert numpy.allclose(W, contract._W_block(aos, L, aux), rtol=1e-12, atol=0.0)
+
+
 # ---------------------------------------------------------------------------
 # Higher-L ERI validation via independent numerical quadrature.
 # ---------------------------------------------------------------------------
@@ -293,6 +396,62 @@ def test_reduced_screen_matches_dense_reference_exactly(elem, basis):
          f"{len(set(coupled_sel) ^ set(dense_sel))} entries")
 
 
+@pytest.mark.parametrize('elem,basis', [
+    (6, 'cc-pVTZ'),
+    (30, 'def2-TZVP'),
+])
+def test_reduced_screen_memory_bounded_matches_dense(elem, basis):
+    """The memory-bounded screen (metric columns generated on demand,
+    forced with ``max_memory=0``) must select the same shell-pairs as
+    the dense path."""
+    from basis_set_exchange.auxgen.products import decontract_primitives, orbital_shell_pairs
+    from basis_set_exchange.auxgen.twoel import coupled_shell_pair_screen
+
+    b = get_basis(basis, elements=[elem])
+    shell_pairs = orbital_shell_pairs(decontract_primitives(b['elements'][str(elem)]))
+    for tau in (1.0e-7, 1.0e-5):
+        dense_sel = coupled_shell_pair_screen(shell_pairs, tau, screen_tol=0)
+        bounded_sel = coupled_shell_pair_screen(shell_pairs, tau, screen_tol=0, max_memory=0)
+        assert bounded_sel == dense_sel
+
+
+@pytest.mark.parametrize('elem,basis', [
+    (8, 'cc-pV5Z'),
+    (30, 'def2-QZVPP'),
+])
+def test_reduced_screen_exponent_window_matches_unscreened(elem, basis):
+    """The default exponent-window screening must not change the selected
+    shell-pairs, and the entries a coarse tolerance drops must all be
+    below it relative to their Schwarz bound."""
+    from basis_set_exchange.auxgen.products import decontract_primitives, orbital_shell_pairs
+    from basis_set_exchange.auxgen.twoel import (
+        _ScreenedCoupledMetric, coupled_L_metric, coupled_shell_pair_screen,
+    )
+
+    b = get_basis(basis, elements=[elem])
+    shell_pairs = orbital_shell_pairs(decontract_primitives(b['elements'][str(elem)]))
+    for tau in (1.0e-7, 1.0e-5):
+        exact_sel = coupled_shell_pair_screen(shell_pairs, tau, screen_tol=0)
+        assert coupled_shell_pair_screen(shell_pairs, tau) == exact_sel
+
+    L = 4
+    members = [sp for sp in shell_pairs if L in coupling_lvals(sp[0], sp[3])]
+    metric = _ScreenedCoupledMetric(L, members, screen_tol=1.0e-3)
+    windows = [w for w in metric.windows.values() if w is not None]
+    assert windows and all(w[0] < 1.0 < w[1] for w in windows)
+    exact = coupled_L_metric(L, members) * (2 * L + 1) / (4.0 * numpy.pi)
+    d = numpy.sqrt(numpy.diag(exact))
+    n_dropped = 0
+    for j in range(0, len(members), 7):
+        col = metric._column(j)
+        dropped = (col == 0.0) & (exact[:, j] != 0.0)
+        assert numpy.all(numpy.abs(exact[dropped, j]) <= 1.0e-3 * d[dropped] * d[j])
+        kept = ~dropped
+        assert numpy.allclose(col[kept], exact[kept, j], rtol=1e-12, atol=0)
+        n_dropped += numpy.count_nonzero(dropped)
+    assert n_dropped > 0
+
+
 def test_reduced_screen_carbon_cc_pvtz_per_L_counts():
     """Pin the per-L aux primitive counts for cc-pVTZ carbon at
     ``tau = 1e-7`` (``n_random = 0``, no contraction, no pruning):
@@ -431,6 +590,38 @@ def test_pivoted_cholesky_psd_perturbation():
     assert numpy.linalg.norm(A - L @ L.T) < 1e-10
 
 
+@pytest.mark.parametrize('n,rank', [(60, 60), (300, 40), (400, 250)])
+@pytest.mark.parametrize('block_size', [2, 16, 64])
+def test_pivoted_cholesky_blocked_matches_unblocked(n, rank, block_size):
+    """The blocked kernel picks the same pivots as the unblocked one, and
+    the factors agree to rounding, for both pivot-selection strategies."""
+    from basis_set_exchange.auxgen.pivchol import block_pivoted_cholesky
+
+    rng = numpy.random.default_rng(n + rank)
+    X = rng.standard_normal((n, rank))
+    A = X @ X.T + 1e-3 * numpy.eye(n)
+    d = numpy.sqrt(numpy.diag(A))
+    A = A / numpy.outer(d, d)
+    tol = 1e-6
+
+    p1, L1 = pivoted_cholesky(A, tol=tol, block_size=1)
+    p2, L2 = pivoted_cholesky(A, tol=tol, block_size=block_size)
+    assert p1 == p2
+    assert numpy.abs(L1 - L2).max() < 1e-10
+    assert numpy.abs(A - L2 @ L2.T).max() <= 2 * tol
+
+    block_of = [i // 3 for i in range(n)]
+    p1, L1 = block_pivoted_cholesky(A, block_of, tol=tol, block_size=1)
+    p2, L2 = block_pivoted_cholesky(A, block_of, tol=tol, block_size=block_size)
+    assert p1 == p2
+    assert numpy.abs(L1 - L2).max() < 1e-10
+
+    # max_rank is honoured by both kernels
+    p1, _ = pivoted_cholesky(A, tol=tol, max_rank=7, block_size=1)
+    p2, _ = pivoted_cholesky(A, tol=tol, max_rank=7, block_size=block_size)
+    assert p1 == p2 and len(p2) == 7
+
+
 # ---------------------------------------------------------------------------
 # End-to-end pipeline
 # ---------------------------------------------------------------------------
@@ -461,6 +652,154 @@ def test_end_to_end_contracted():
     assert any(len(s['coefficients']) > 1 for s in shells)
 
 
+def test_W_block_matches_primitive_pair_loop():
+    """The batched W block of the contraction step equals the direct
+    sum over AO pairs and their primitive pairs (generally contracted
+    ANO basis, so AOs share primitives)."""
+    from basis_set_exchange.auxgen.contract import orbital_aos, _W_block
+    from basis_set_exchange.auxgen.gaunt import gaunt_table
+    from basis_set_exchange.auxgen.radial import gto_norm
+
+    aos = orbital_aos(get_basis('ANO-RCC-VDZP', elements=[8])['elements']['8'])
+    alphas = numpy.geomspace(0.1, 100.0, 12)
+    for L in range(5):
+        W_ref = numpy.zeros((alphas.size, alphas.size))
+        for (la, ea, wa) in aos:
+            for (lb, eb, wb) in aos:
+                if L not in coupling_lvals(la, lb):
+                    continue
+                gsq = float(numpy.sum(gaunt_table(la, lb, L)[:, :, L]**2))
+                kern = numpy.zeros(alphas.size)
+                for iP, aP in enumerate(alphas):
+                    for ai, wi in zip(ea, wa):
+                        for aj, wj in zip(eb, wb):
+                            kern[iP] += wi * wj * radial_integral(L, la + lb, L, ai + aj, aP)
+                    kern[iP] *= 4.0 * math.pi / (2 * L + 1) * gto_norm(L, aP)
+                W_ref += gsq * numpy.outer(kern, kern)
+        W = _W_block(aos, L, alphas)
+        assert numpy.allclose(W, W_ref, rtol=1e-12, atol=1e-14 * numpy.abs(W_ref).max())
+
+
+def test_intermediate_cache_reuse(tmp_path, monkeypatch):
+    """Regenerating from the same primitives reuses the cached
+    intermediates (from memory, then from disk) and gives the same
+    basis."""
+    from basis_set_exchange.auxgen import cache
+
+    monkeypatch.setenv('BSE_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(cache, 'disk_cache_enabled', True)
+    monkeypatch.setattr(cache, 'result_cache_enabled', False)
+    b = get_basis('cc-pVDZ', elements=[6])
+
+    cache.clear()
+    ref = generate_auxiliary_basis(b, size='large')
+    stats = cache.statistics()
+    assert stats['pool']['misses'] == 1 and stats['pool']['hits'] == 0
+
+    assert generate_auxiliary_basis(b, size='large') == ref
+    stats = cache.statistics()
+    assert stats['pool']['hits'] == 1
+    assert stats['select']['hits'] == stats['select']['misses']
+    assert stats['contract']['hits'] == stats['contract']['misses']
+
+    cache.clear()
+    assert generate_auxiliary_basis(b, size='large') == ref
+    stats = cache.statistics()
+    assert stats['pool']['disk_hits'] == 1 and stats['pool']['misses'] == 0
+    cache.clear(disk=True)
+
+
+def test_pool_cache_screen_tol(monkeypatch):
+    """The reduced-scheme pool is not reused across screening tolerances."""
+    from basis_set_exchange.auxgen import cache, twoel
+
+    monkeypatch.setattr(cache, 'result_cache_enabled', False)
+    b = get_basis('cc-pVDZ', elements=[6])
+    cache.clear()
+    generate_auxiliary_basis(b, size='large')
+    generate_auxiliary_basis(b, size='large')
+    assert cache.statistics()['pool'] == {'hits': 1, 'disk_hits': 0, 'misses': 1}
+
+    monkeypatch.setattr(twoel, 'metric_screen_tol', 1.0e-6)
+    generate_auxiliary_basis(b, size='large')
+    assert cache.statistics()['pool'] == {'hits': 1, 'disk_hits': 0, 'misses': 2}
+    cache.clear()
+
+
+def test_element_result_cache(tmp_path, monkeypatch):
+    """Whole per-element results are stored on disk and reused by other
+    basis sets with the same shells for that element, and the on-disk
+    cache is kept within its size limit."""
+    from basis_set_exchange.auxgen import cache
+    from basis_set_exchange.auxgen.auxgen import cholesky_aux_basis
+
+    monkeypatch.setenv('BSE_CACHE_DIR', str(tmp_path))
+    cache.clear()
+    ref = cholesky_aux_basis(get_basis('cc-pVDZ', elements=[1, 6]), 'small')
+    assert cache.statistics()['element'] == {'hits': 0, 'disk_hits': 0, 'misses': 2}
+
+    # A new process would only find the results on disk
+    cache.clear()
+    aux = cholesky_aux_basis(get_basis('cc-pVDZ', elements=[1, 6, 8]), 'small')
+    assert cache.statistics()['element'] == {'hits': 0, 'disk_hits': 2, 'misses': 1}
+    assert aux['elements']['1'] == ref['elements']['1']
+    assert aux['elements']['6'] == ref['elements']['6']
+
+    # Eviction keeps the total size below the limit, dropping the least
+    # recently used entries first
+    entries = sorted(cache._disk_entries(cache.cache_dir()))
+    assert len(entries) == 3
+    monkeypatch.setattr(cache, 'max_disk_bytes', sum(e[1] for e in entries[1:]))
+    cache.clear()
+    cholesky_aux_basis(get_basis('cc-pVDZ', elements=[7]), 'small')
+    remaining = {e[2] for e in cache._disk_entries(cache.cache_dir())}
+    assert cache.disk_usage() <= cache.max_disk_bytes
+    assert entries[0][2] not in remaining
+    cache.clear(disk=True)
+
+
+def test_element_result_cache_settings(tmp_path, monkeypatch):
+    """Per-element results are not reused across screening tolerances."""
+    from basis_set_exchange.auxgen import cache, twoel
+    from basis_set_exchange.auxgen.auxgen import cholesky_aux_basis
+
+    monkeypatch.setenv('BSE_CACHE_DIR', str(tmp_path))
+    b = get_basis('cc-pVDZ', elements=[6])
+    cache.clear()
+    cholesky_aux_basis(b, 'small')
+    cholesky_aux_basis(b, 'small')
+    assert cache.statistics()['element'] == {'hits': 1, 'disk_hits': 0, 'misses': 1}
+
+    monkeypatch.setattr(twoel, 'metric_screen_tol', 1.0e-6)
+    cholesky_aux_basis(b, 'small')
+    assert cache.statistics()['element'] == {'hits': 1, 'disk_hits': 0, 'misses': 2}
+    cache.clear(disk=True)
+
+
+def test_profile_records_stages(monkeypatch):
+    """A profile context collects one record per stage, element and L,
+    and passes each to the callback."""
+    from basis_set_exchange.auxgen import cache, profiling
+
+    monkeypatch.setattr(cache, 'result_cache_enabled', False)
+    cache.clear()
+    seen = []
+    b = get_basis('cc-pVDZ', elements=[1, 6])
+    with profiling.profile(callback=seen.append) as report:
+        generate_auxiliary_basis(b, size='large', n_random=0)
+    assert not profiling.enabled()
+    assert seen == report.records
+
+    totals = report.stage_totals()
+    assert totals['element']['calls'] == 2
+    assert totals['screen']['calls'] == totals['pool']['calls'] == 2
+    assert totals['pool']['misses'] == 2
+    selects = [r for r in report.records if r['stage'] == 'select']
+    assert {r['element'] for r in selects} == {1, 6}
+    assert all(0 < r['pivots'] <= r['size'] for r in selects)
+    assert 'contract' in report.format()
+
+
 def test_random_shuffles_no_worse_than_presort():
     # Lehtola 2021 Note Added in Proof: trying random orderings can give
     # a more compact decomposition.  We require only that the random
@@ -490,6 +829,37 @@ def test_random_seed_reproducibility():
         assert s1['exponents'] == s2['exponents']
 
 
+@pytest.mark.parametrize('L', [0, 1, 2])
+def test_most_compact_pivot_matches_exhaustive_search(L):
+    """The threaded, early-terminating search returns exactly what a
+    plain loop over all the orderings (without any cutoff) returns,
+    independent of the number of threads."""
+    from basis_set_exchange.auxgen.auxgen import (
+        _most_compact_pivot, _pivot_with_order, _sort_by_offdiag_norm)
+
+    alphas = list(numpy.geomspace(0.05, 5.0e3, 40))
+    alphas += [a * 1.3 for a in alphas[::3]]
+    S = normalized_metric(L, alphas)
+    n = S.shape[0]
+
+    rng = numpy.random.default_rng(7)
+    orders = [list(range(n)), _sort_by_offdiag_norm(S)]
+    for _ in range(24):
+        perm = list(range(n))
+        rng.shuffle(perm)
+        orders.append(perm)
+
+    ref = None
+    for order in orders:
+        pivots = _pivot_with_order(S, order, 1e-7)
+        if ref is None or len(pivots) < len(ref):
+            ref = pivots
+
+    for nthreads in [1, 3, 8]:
+        sel = _most_compact_pivot(S, 1e-7, n_random=24, seed=7, nthreads=nthreads)
+        assert sel == ref
+
+
 # ---------------------------------------------------------------------------
 # Cholesky selector properties
 # ---------------------------------------------------------------------------
@@ -827,6 +1197,79 @@ def _diag_ri_error_primitive_aux(orbital_elem, aux_elem):
     return err
 
 
+def _contracted_ri_diagonals(element_basis, aux_elem):
+    """RI-fitted Coulomb self-repulsions ``(mu nu|mu nu)_RI`` of the
+    products of the contracted orbital AOs, per L (m = 0 block), for a
+    contracted aux basis, and the exact values over all its primitives.
+    """
+    from basis_set_exchange.auxgen.contract import orbital_aos
+    from basis_set_exchange.auxgen.gaunt import gaunt_table
+    from basis_set_exchange.auxgen.radial import gto_norm_array, radial_integral_batch
+    from basis_set_exchange.auxgen.twoel import primitive_aux_metric
+
+    aos = orbital_aos(element_basis)
+    out = {}
+    for sh in aux_elem['electron_shells']:
+        L = sh['angular_momentum'][0]
+        alphas = numpy.array([float(x) for x in sh['exponents']])
+        V = primitive_aux_metric(L, alphas)
+        pref = 4.0 * math.pi / (2 * L + 1) * gto_norm_array(L, alphas)
+
+        # Projections (mu nu|P) of the AO products, weighted by the Gaunt coefficients
+        rows = []
+        for la, ea, wa in aos:
+            for lb, eb, wb in aos:
+                g = gaunt_table(la, lb, L)[:, :, L] if L in coupling_lvals(la, lb) else numpy.zeros(1)
+                gsq = float(numpy.sum(g * g))
+                if gsq == 0.0:
+                    continue
+                R = radial_integral_batch(L, la + lb, L, (ea[:, None] + eb[None, :])[:, :, None],
+                                          alphas[None, None, :])
+                rows.append(math.sqrt(gsq) * pref * numpy.einsum('i,j,ijp->p', wa, wb, R))
+        K = numpy.array(rows)
+
+        # Contraction coefficients of the Coulomb-normalized primitives
+        # (see contract.contract_aux), converted to the raw primitives of V
+        C = numpy.array([[float(c) for c in gen] for gen in sh['coefficients']]).T
+        C = C / numpy.sqrt(alphas)[:, None] / numpy.sqrt(numpy.diag(V))[:, None]
+        KC = K @ C
+        fitted = numpy.einsum('ij,ji->i', KC, numpy.linalg.solve(C.T @ V @ C, KC.T))
+        exact = numpy.einsum('ij,ji->i', K, numpy.linalg.solve(V, K.T))
+        out[L] = (fitted, exact)
+    return out
+
+
+@pytest.mark.parametrize('basis_name, Z, size', [('cc-pVTZ', 8, 'large'), ('def2-TZVP', 26, 'small')])
+def test_contracted_ri_diagonals_scalar_kernel(basis_name, Z, size, monkeypatch):
+    """The batched radial kernel differs from the scalar one in the last
+    ulp, which moves contraction coefficients within nearly degenerate
+    subspaces.  The exponents and the number of contractions must be
+    unchanged, and the RI-fitted diagonals must agree to 1e-8 of the
+    exact values."""
+    from basis_set_exchange.auxgen import cache, contract, twoel
+    from basis_set_exchange.auxgen.auxgen import generate_auxiliary_basis_for_element, _default_lmax_occ
+    monkeypatch.setattr(cache, 'cache_enabled', False)
+    monkeypatch.setattr(cache, 'result_cache_enabled', False)
+
+    el = get_basis(basis_name, elements=[Z])['elements'][str(Z)]
+    batched = generate_auxiliary_basis_for_element(el, size=size, lmax_occ=_default_lmax_occ(Z))
+    monkeypatch.setattr(twoel, 'radial_integral_batch', _scalar_radial_batch)
+    monkeypatch.setattr(contract, 'radial_integral_batch', _scalar_radial_batch)
+    scalar = generate_auxiliary_basis_for_element(el, size=size, lmax_occ=_default_lmax_occ(Z))
+    monkeypatch.undo()
+
+    for sh_b, sh_s in zip(batched['electron_shells'], scalar['electron_shells'], strict=True):
+        assert sh_b['angular_momentum'] == sh_s['angular_momentum']
+        assert sh_b['exponents'] == sh_s['exponents']
+        assert len(sh_b['coefficients']) == len(sh_s['coefficients'])
+
+    diag_b = _contracted_ri_diagonals(el, batched)
+    diag_s = _contracted_ri_diagonals(el, scalar)
+    for L, (fitted_b, exact) in diag_b.items():
+        fitted_s = diag_s[L][0]
+        assert numpy.all(numpy.abs(fitted_b - fitted_s) <= 1e-8 * exact)
+
+
 @pytest.mark.slow
 def test_generated_aux_diagonal_ri_error_fe_def2_qzvpp():
     """End-to-end selection-quality check on Fe def2-QZVPP: the
@@ -908,9 +1351,11 @@ def test_cli_autogen_aux_smoke(tmp_path):
         contract_threshold=1.0e-5,
         prune_lmax=True,
         linc=1,
+        profile=True,
     )
     msg = _bse_cli_autogen_aux(args)
     assert 'auxgen' in msg.lower()
+    assert 'select' in msg
     assert out_path.exists() and out_path.stat().st_size > 0
     out = readers.read_formatted_basis_file(str(out_path), 'gaussian94')
     assert '1' in out['elements']
@@ -1021,6 +1466,17 @@ def test_sto_radial_coulomb_h_1s_slater():
         assert val == pytest.approx(5.0 * zeta / 8.0, rel=1e-13)
 
 
+def test_sto_radial_coulomb_batch_matches_scalar():
+    from basis_set_exchange.auxgen.sto import sto_radial_coulomb, sto_radial_coulomb_batch
+    n = numpy.array([2, 3, 4, 5])
+    z = numpy.array([0.4, 1.1, 2.5, 7.0])
+    batch = sto_radial_coulomb_batch(n[:, None] + 1, n[None, :] + 1, 1, z[:, None], z[None, :])
+    for i in range(4):
+        for j in range(4):
+            expected = sto_radial_coulomb(int(n[i]) + 1, int(n[j]) + 1, 1, float(z[i]), float(z[j]))
+            assert batch[i, j] == pytest.approx(expected, rel=1e-13)
+
+
 def test_sto_aux_metric_unit_diagonal():
     """Coulomb-normalised aux metric must have (P|P) = 1."""
     from basis_set_exchange.auxgen.sto import sto_aux_metric
@@ -1240,3 +1696,55 @@ def test_sto_main_driver_runs_on_adf_file(tmp_path):
                '--scheme', 'basic', '--no-benchmark'])
     assert rc == 0
     assert out_path.exists() and out_path.stat().st_size > 0
+
+
+def test_sto_one_electron_matrices_match_pair_formulas():
+    """The batched one-electron matrices reproduce the per-pair Pitzer
+    closed forms."""
+    from math import gamma
+    from basis_set_exchange.auxgen.sto import (
+        sto_overlap_matrix, sto_kinetic_matrix, sto_nuclear_attraction_matrix,
+    )
+    items = [(2, 3.1), (2, 1.2), (3, 0.6), (4, 2.2)]
+    L = 1
+    S = sto_overlap_matrix(items)
+    V = sto_nuclear_attraction_matrix(items)
+    T = sto_kinetic_matrix(L, items)
+    for i, (ni, zi) in enumerate(items):
+        for j, (nj, zj) in enumerate(items):
+            z = zi + zj
+            Vn = [gamma(ni + nj - 1 + k) / z**(ni + nj - 1 + k) for k in range(3)]
+            Wi, Wj = (ni - L - 1) / zi, (nj - L - 1) / zj
+            assert S[i, j] == pytest.approx(gamma(ni + nj + 1) / z**(ni + nj + 1), rel=1e-14)
+            assert V[i, j] == pytest.approx(gamma(ni + nj) / z**(ni + nj), rel=1e-14)
+            t = 0.5 * zi * zj * (Wi * Wj * Vn[0] - (Wi + Wj) * Vn[1] + Vn[2])
+            assert T[i, j] == pytest.approx(t, rel=1e-12, abs=1e-14)
+    assert numpy.array_equal(T, T.T)
+
+
+def test_sto_library_driver_processes_directory(tmp_path):
+    """The ADF-library driver regenerates every basis file in a
+    directory (in worker processes) exactly like the per-file path and
+    skips files without BASIS shells."""
+    from basis_set_exchange.auxgen.sto import (
+        generate_sto_auxiliary_basis, generate_sto_auxiliary_library, read_adf_basis,
+    )
+    lib = tmp_path / 'lib'
+    lib.mkdir()
+    (lib / 'H').write_text("Hydrogen (test)\n\nBASIS\n1S 0.76\n1S 1.28\n2P 1.0\nEND\n\n"
+                           "CORE    0  0  0  0\nEND\n\nFIT\n 1S 3.16\nEND\n")
+    (lib / 'He').write_text("Helium (test)\n\nBASIS\n1S 1.5\n1S 2.9\n2S 0.9\nEND\n\n"
+                            "CORE    0  0  0  0\nEND\n")
+    (lib / 'README').write_text("not a basis file\n")
+    out = tmp_path / 'out'
+    kwargs = dict(threshold=1e-8, scheme='basic', n_random=0, prune_lmax=True)
+    results = generate_sto_auxiliary_library(str(lib), output_dir=str(out), nprocs=2, **kwargs)
+    assert sorted(results) == ['H', 'He']
+    assert sorted(p.name for p in out.iterdir()) == ['H', 'He']
+    for name, (parsed, new_fit) in results.items():
+        expected = generate_sto_auxiliary_basis(parsed['orbital'], threshold=1e-8, scheme='basic',
+                                                n_random=0, prune_lmax=True, lmax_occ=0)
+        assert new_fit == expected
+        written = read_adf_basis(str(out / name))
+        assert written['orbital'] == parsed['orbital']
+        assert sorted(written['fit']) == sorted(new_fit)
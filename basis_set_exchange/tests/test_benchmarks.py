@@ -0,0 +1,91 @@
+# Copyright (c) 2017-2022 The Molecular Sciences Software Institute, Virginia Tech
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived
+# from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Smoke tests of the benchmark runner (only available in the source tree)
+'''
+
+import os
+
+import pytest
+
+runner = pytest.importorskip('benchmarks.runner')
+cases = pytest.importorskip('benchmarks.cases')
+
+
+def _results(values):
+    return {'results_version': runner._results_version, 'metadata': {}, 'results': values}
+
+
+def test_measure_and_save(tmp_path, monkeypatch):
+
+    def skipped_setup():
+        raise cases.SkipCase('no input')
+
+    monkeypatch.setitem(cases.benchmark_cases, 'smoke.run', {'setup': lambda: lambda: sum(range(100)), 'slow': False})
+    monkeypatch.setitem(cases.benchmark_cases, 'smoke.skip', {'setup': skipped_setup, 'slow': False})
+
+    seen = []
+    results = runner.run_cases(runner.select_cases(['smoke.*']), repeat=2, callback=lambda n, r: seen.append(n))
+    assert seen == ['smoke.run', 'smoke.skip']
+    assert results['results']['smoke.skip'] == {'skipped': 'no input'}
+    res = results['results']['smoke.run']
+    assert res['repeat'] == 2
+    assert 0.0 <= res['time'] <= res['time_median']
+
+    path = os.path.join(str(tmp_path), 'results.json')
+    runner.save_results(path, results)
+    assert runner.load_results(path) == results
+
+    results['results_version'] += 1
+    runner.save_results(path, results)
+    with pytest.raises(RuntimeError, match='version'):
+        runner.load_results(path)
+
+
+def test_find_regressions():
+    baseline = _results({
+        'a': {'time': 1.0, 'peak_memory': 1000},
+        'b': {'time': 1.0, 'peak_memory': 1000},
+        'c': {'skipped': 'no input'},
+        'd': {'time': 1.0, 'peak_memory': 1000},
+    })
+    results = _results({
+        'a': {'time': 1.2, 'peak_memory': 1050},
+        'b': {'time': 1.3, 'peak_memory': 1200},
+        'c': {'time': 5.0, 'peak_memory': 5000},
+        'd': {'error': 'RuntimeError: failed'},
+        'e': {'time': 5.0, 'peak_memory': 5000},
+    })
+
+    assert runner.find_regressions(results, baseline) == [('b', 'time', 1.0, 1.3), ('b', 'peak_memory', 1000, 1200)]
+    assert runner.find_regressions(results, baseline, time_tolerance=0.1, memory_tolerance=0.5) == \
+        [('a', 'time', 1.0, 1.2), ('b', 'time', 1.0, 1.3)]
+    assert runner.find_regressions(baseline, baseline) == []
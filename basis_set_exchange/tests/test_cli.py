@@ -32,11 +32,14 @@
 Testing of the BSE CLI interface
 '''
 
+import argparse
 import os
 import sys
 import subprocess
 import pytest
 
+from basis_set_exchange import api, readers, writers
+from basis_set_exchange.cli import complete
 from .common_testvars import cli_dir, fake_data_dir
 
 
@@ -86,3 +89,22 @@ def test_cli_createbundle_datadir(tmp_path):
     output = _test_cli_cmd('-d ' + fake_data_dir + ' create-bundle gaussian94 bib ' + bfile_path)
     assert os.path.isfile(bfile_path)
     assert output.startswith(b'Created ')
+
+
+@pytest.mark.parametrize('data_dir', [None, fake_data_dir])
+def test_cli_completers(data_dir, tmp_path):
+    parsed_args = argparse.Namespace(data_dir=data_dir)
+
+    assert complete.cli_bsname_completer(parsed_args=parsed_args) == api.get_all_basis_names(data_dir)
+    assert complete.cli_family_completer(parsed_args=parsed_args) == api.get_families(data_dir)
+    assert complete.cli_role_completer(parsed_args=parsed_args) == api.get_roles()
+    assert complete.cli_write_fmt_completer(parsed_args=parsed_args) == writers.get_writer_formats()
+    assert complete.cli_read_fmt_completer(parsed_args=parsed_args) == readers.get_reader_formats()
+    assert complete.cli_reffmt_completer(parsed_args=parsed_args) == api.get_reference_formats()
+
+
+def test_cli_completers_noindex(monkeypatch):
+    # Without an index, the completers fall back to the metadata
+    monkeypatch.setattr(complete, '_completion_index', lambda data_dir=None: None)
+    parsed_args = argparse.Namespace(data_dir=fake_data_dir)
+    assert complete.cli_bsname_completer(parsed_args=parsed_args) == ['bppfakebasis', 'bppfakebasis-jkfit']
@@ -0,0 +1,122 @@
+# Copyright (c) 2017-2022 The Molecular Sciences Software Institute, Virginia Tech
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived
+# from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Testing of the warm-cache server mode of the BSE CLI
+'''
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+
+import pytest
+
+from basis_set_exchange.cli import server
+from .common_testvars import cli_dir, fake_data_dir
+
+
+@pytest.fixture
+def bse_server():
+    # Unix socket paths are limited in length, so don't use tmp_path
+    tmp_dir = tempfile.mkdtemp(prefix='bse')
+    sock_path = os.path.join(tmp_dir, 's.sock')
+
+    srv = server.BSEServer(sock_path, cache_size=4)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+
+    yield srv
+
+    srv.shutdown()
+    srv.server_close()
+    thread.join()
+    shutil.rmtree(tmp_dir)
+
+
+def _run_cli(cmd, sock_path):
+    env = dict(os.environ)
+    env['BSE_SERVER_SOCKET'] = sock_path
+    cmd = [sys.executable, os.path.join(cli_dir, 'bse_cli.py')] + cmd.split(' ')
+    return subprocess.check_output(cmd, stderr=subprocess.STDOUT, env=env)
+
+
+@pytest.mark.parametrize('bse_cmd', [
+    'get-basis sto-3g nwchem', 'get-basis 6-31g nwchem --elements=1-10 --unc-gen --noheader', 'get-refs 6-31g txt',
+    'get-info def2-tzvp', 'get-notes sto-3g', 'get-versions cc-pvqz', 'list-basis-sets -f ahlrichs'
+])
+def test_server_forward(bse_server, bse_cmd):
+    '''Output through the server is identical to running locally'''
+    local = _run_cli(bse_cmd, os.path.join(os.path.dirname(bse_server.sock_path), 'none.sock'))
+    forwarded = _run_cli(bse_cmd, bse_server.sock_path)
+    assert forwarded == local
+    assert len(bse_server._output_cache) == 1
+
+
+def test_server_forward_datadir(bse_server):
+    output = _run_cli('-d ' + fake_data_dir + ' get-basis bppfakebasis nwchem', bse_server.sock_path)
+    assert b'bppfake' in output
+
+
+def test_server_cache(bse_server):
+    args = argparse.Namespace(subcmd='get-family', basis='def2-tzvp', data_dir=None, output=None)
+    req = {'version': bse_server.version, 'args': server._request_from_args(args)}
+
+    first = bse_server.process_request_data(req)
+    assert len(bse_server._output_cache) == 1
+    assert bse_server.process_request_data(req) == first
+
+    # Cache is bounded
+    for name in ['sto-3g', '6-31g', 'cc-pvdz', 'cc-pvtz', 'def2-svp']:
+        args.basis = name
+        bse_server.process_request_data({'version': bse_server.version, 'args': server._request_from_args(args)})
+    assert len(bse_server._output_cache) == 4
+
+
+def test_server_errors(bse_server, monkeypatch):
+    monkeypatch.setenv('BSE_SERVER_SOCKET', bse_server.sock_path)
+
+    args = argparse.Namespace(subcmd='get-family', basis='not_a_basis', data_dir=None, output=None)
+    with pytest.raises(RuntimeError, match='does not exist'):
+        server.forward_to_server(args)
+
+    # Version mismatch or unsupported subcommands are run locally
+    monkeypatch.setattr(server, '_library_version', lambda: '0.0')
+    assert server.forward_to_server(args) is None
+    args.subcmd = 'convert-basis'
+    assert server.forward_to_server(args) is None
+
+
+def test_server_already_running(bse_server):
+    with pytest.raises(RuntimeError, match='already listening'):
+        server.BSEServer(bse_server.sock_path)
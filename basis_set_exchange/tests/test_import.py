@@ -0,0 +1,93 @@
+# Copyright (c) 2017-2022 The Molecular Sciences Software Institute, Virginia Tech
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived
+# from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Tests for lazy importing of the library
+
+These guard the import time of the library and the command line interface
+by checking that large dependencies and the individual format modules are
+not imported until they are actually used.
+'''
+
+import subprocess
+import sys
+
+import pytest
+
+import basis_set_exchange as bse
+from basis_set_exchange import misc
+
+# Modules that should not be imported by just importing the library or CLI
+_heavy_modules = ['jsonschema', 'numpy', 'tarfile', 'zipfile', 'basis_set_exchange.validator',
+                  'basis_set_exchange.bundle', 'basis_set_exchange.curate', 'basis_set_exchange.auxgen',
+                  'basis_set_exchange.writers.nwchem', 'basis_set_exchange.readers.nwchem',
+                  'basis_set_exchange.refconverters.bib']
+
+
+def _imported_modules(stmt):
+    code = '{}; import sys; print("\\n".join(sys.modules))'.format(stmt)
+    output = subprocess.check_output([sys.executable, '-c', code], encoding='utf-8')
+    return set(output.splitlines())
+
+
+@pytest.mark.parametrize('stmt', [
+    'import basis_set_exchange', 'import basis_set_exchange.cli', 'import basis_set_exchange.cli.bse_cli',
+    'import basis_set_exchange as bse; bse.get_formats(); bse.get_reader_formats()'
+])
+def test_import_lazy(stmt):
+    modules = _imported_modules(stmt)
+    for m in _heavy_modules:
+        assert m not in modules
+
+
+def test_import_lazy_use():
+    # Using a writer only imports that writer
+    modules = _imported_modules('import basis_set_exchange as bse; bse.get_basis("sto-3g", fmt="nwchem")')
+    assert 'basis_set_exchange.writers.nwchem' in modules
+    assert 'basis_set_exchange.writers.g94' not in modules
+    assert 'jsonschema' not in modules
+
+
+def test_lazy_attributes():
+    assert bse.get_basis is bse.api.get_basis
+    assert bse.create_bundle is bse.bundle.create_bundle
+    assert bse.manip.__name__ == 'basis_set_exchange.manip'
+    assert bse.__version__ == bse.get_version()
+    assert 'validate_data' in dir(bse)
+
+    with pytest.raises(AttributeError):
+        bse.not_an_attribute
+
+
+def test_lazy_function():
+    f = misc.LazyFunction('basis_set_exchange.misc', 'compact_elements')
+    assert f._function is None
+    assert f(['1', '2', '3']) == 'H-Li'
+    assert f.resolve() is misc.compact_elements
@@ -147,3 +147,116 @@ def test_manip_remove_free(testdir):
     new_data = manip.remove_free_primitives(base_data)
     new_data = manip.make_general(new_data)
     assert curate.compare_basis(new_data, ref_data)
+
+
+def test_manip_prune_shell():
+    # yapf: disable
+    shell = {'function_type': 'gto', 'region': '', 'angular_momentum': [0],
+             'exponents': ['1.0', '2.0', '1.00', '3.0', '2.0E+00', '4.0'],
+             'coefficients': [['0.5', '0.0', '0.0', '0.0', '0.0', '0.0'],
+                              ['0.0', '0.6', '0.0', '0.7', '0.0', '0.0'],
+                              ['0.0', '0.0', '0.8', '0.0', '0.9', '0.0']]}
+    # yapf: enable
+
+    pruned = manip.prune_shell(copy.deepcopy(shell))
+
+    # Duplicate exponents are merged (keeping the first string), in order of first appearance,
+    # and the exponent with only zero coefficients is removed
+    assert pruned['exponents'] == ['1.0', '2.0', '3.0']
+    assert pruned['coefficients'] == [['0.5', '0.0', '0.0'], ['0.0', '0.6', '0.7'], ['0.8', '0.9', '0.0']]
+
+    shell['coefficients'][0][2] = '0.1'
+    with pytest.raises(RuntimeError, match=r'Exponent 1.0 is duplicated'):
+        manip.prune_shell(shell)
+
+
+@pytest.mark.parametrize('basis', ['ano-rcc', 'cc-pvtz', '6-31g*'])
+def test_manip_prune_basis(basis):
+    bs = manip.uncontract_general(api.get_basis(basis))
+    pruned = manip.prune_basis(bs)
+
+    for k, el in bs['elements'].items():
+        # Remove duplicates the slow way
+        shells = [manip.prune_shell(copy.deepcopy(sh)) for sh in el['electron_shells']]
+        unique_shells = []
+        for sh in shells:
+            if sh not in unique_shells:
+                unique_shells.append(sh)
+
+        assert pruned['elements'][k]['electron_shells'] == unique_shells
+
+    # Fingerprints match exactly when the shells are equal
+    sh1 = pruned['elements']['1']['electron_shells'][0]
+    sh2 = copy.deepcopy(sh1)
+    assert manip._shell_fingerprint(sh1) == manip._shell_fingerprint(sh2)
+    sh2['exponents'][0] += '0'
+    assert manip._shell_fingerprint(sh1) != manip._shell_fingerprint(sh2)
+
+
+# yapf: disable
+_copy_funcs = [
+    lambda bs, use_copy: manip.prune_basis(bs, use_copy),
+    lambda bs, use_copy: manip.uncontract_general(bs, use_copy),
+    lambda bs, use_copy: manip.uncontract_segmented(bs, use_copy),
+    lambda bs, use_copy: manip.uncontract_spdf(bs, 0, use_copy),
+    lambda bs, use_copy: manip.make_general(bs, False, use_copy),
+    lambda bs, use_copy: manip.optimize_general(bs, use_copy),
+    lambda bs, use_copy: manip.remove_free_primitives(bs, use_copy),
+    lambda bs, use_copy: manip.geometric_augmentation(bs, 1, use_copy),
+    lambda bs, use_copy: sort.sort_basis(bs, use_copy)
+]
+# yapf: enable
+
+
+@pytest.mark.parametrize('basis', ['6-31g*', 'cc-pvdz', 'def2-svp'])
+@pytest.mark.parametrize('func', _copy_funcs)
+def test_manip_use_copy(basis, func):
+    # With use_copy, the input is not modified, and the result
+    # is the same as modifying a deep copy
+    bs = api.get_basis(basis)
+    bs_orig = copy.deepcopy(bs)
+
+    result = func(bs, True)
+    assert bs == bs_orig
+    assert result == func(copy.deepcopy(bs), False)
+
+
+def test_manip_shared_data():
+    # Unchanged shells are shared between the input and output
+    bs = api.get_basis('cc-pvdz')
+    result = manip.uncontract_spdf(bs)
+    for k, el in result['elements'].items():
+        assert el is not bs['elements'][k]
+        for sh1, sh2 in zip(el['electron_shells'], bs['elements'][k]['electron_shells']):
+            assert sh1 is sh2
+
+    bs = manip.uncontract_general(bs)
+    result = manip.prune_basis(bs)
+    for k, el in result['elements'].items():
+        for sh1, sh2 in zip(el['electron_shells'], bs['elements'][k]['electron_shells']):
+            assert sh1 is sh2
+
+
+@pytest.mark.parametrize('aux_type', ['autoaux', 'autoabs'])
+@pytest.mark.parametrize('nprocs', [1, 3])
+def test_manip_auto_aux_bases(aux_type, nprocs):
+    bases = [api.get_basis(x) for x in ['cc-pvtz', 'def2-tzvp', '6-31g*']]
+    func = manip.autoaux_basis if aux_type == 'autoaux' else manip.autoabs_basis
+
+    ret = manip.auto_aux_bases(bases, aux_type, nprocs=nprocs)
+    assert ret == [func(bs) for bs in bases]
+
+    if aux_type == 'autoabs':
+        ret = manip.auto_aux_bases(bases, aux_type, nprocs=nprocs, lmaxinc=2, fsam=1.8)
+        assert ret == [func(bs, lmaxinc=2, fsam=1.8) for bs in bases]
+
+
+@pytest.mark.parametrize('basis_name', ['cc-pvtz', 'def2-tzvp', 'ano-rcc-vtzp'])
+def test_manip_autoaux_ranges_python(basis_name, monkeypatch):
+    # The NumPy and pure-Python reductions of the exponent ranges are identical
+    bs = manip.make_general(manip.uncontract_spdf(api.get_basis(basis_name), 0, True), False, True)
+    shells = [el['electron_shells'] for el in bs['elements'].values() if 'electron_shells' in el]
+    with_numpy = [manip._autoaux_exponent_ranges(x) for x in shells]
+
+    monkeypatch.setattr(manip, '_have_numpy', lambda: False)
+    assert [manip._autoaux_exponent_ranges(x) for x in shells] == with_numpy
@@ -32,7 +32,9 @@
 Tests of memoization
 """
 
+import concurrent.futures
 import random
+import threading
 import pytest
 import time
 import basis_set_exchange as bse
@@ -91,3 +93,78 @@ def test_get_basis_memo(basis_name):
 def test_get_family_notes_memo(family):
     """Test memoization of get_family_notes"""
     _test_memo_helper(bse.get_family_notes, family)
+
+
+def test_memo_single_flight():
+    """Test that concurrent calls with the same arguments run the function once"""
+
+    calls = []
+    started = threading.Event()
+
+    @bse.memo.BSEMemoize
+    def slow_func(x, y=1):
+        calls.append(x)
+        started.set()
+        time.sleep(0.2)
+        return {'x': x, 'y': y}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(slow_func, 2) for _ in range(8)]
+        started.wait()
+        futures.append(executor.submit(slow_func, 3, y=4))
+        results = [f.result() for f in futures]
+
+    assert sorted(calls) == [2, 3]
+    assert results[:8] == [{'x': 2, 'y': 1}] * 8
+    assert results[8] == {'x': 3, 'y': 4}
+
+    # Results are still not aliased
+    assert results[0] is not results[1]
+
+
+def test_memo_single_flight_error():
+    """Test that a failed call is not memoized, and is run again"""
+
+    calls = []
+
+    @bse.memo.BSEMemoize
+    def failing_func(x):
+        calls.append(x)
+        if len(calls) == 1:
+            time.sleep(0.2)
+            raise RuntimeError('First call fails')
+        return x
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        first = executor.submit(failing_func, 1)
+        time.sleep(0.05)
+        others = [executor.submit(failing_func, 1) for _ in range(3)]
+
+        with pytest.raises(RuntimeError, match='First call fails'):
+            first.result()
+        assert [f.result() for f in others] == [1, 1, 1]
+
+    assert calls == [1, 1]
+
+
+def test_memo_disabled():
+    """Test that the function is run on every call when memoization is disabled"""
+
+    calls = []
+
+    @bse.memo.BSEMemoize
+    def func(x):
+        calls.append(x)
+        return x
+
+    bse.memo.memoize_enabled = False
+    try:
+        func(1)
+        func(1)
+    finally:
+        bse.memo.memoize_enabled = True
+
+    assert calls == [1, 1]
+    func(1)
+    func(1)
+    assert calls == [1, 1, 1]
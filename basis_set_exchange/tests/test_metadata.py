@@ -61,6 +61,20 @@ def test_metadata_uptodate(tmp_path):
     assert old_metadata == new_metadata
 
 
+def test_completion_index_uptodate(tmp_path):
+    '''Tests that the COMPLETION.json file is up to date'''
+
+    old_path = os.path.join(data_dir, 'COMPLETION.json')
+    new_path = os.path.join(str(tmp_path), 'COMPLETION.json')
+
+    metadata = api.get_metadata(data_dir)
+    curate.create_completion_index(new_path, metadata)
+
+    old_index = fileio.read_completion_index(old_path)
+    new_index = fileio.read_completion_index(new_path)
+    assert old_index == new_index
+
+
 @pytest.mark.parametrize('meta_file_path', all_metadata_files)
 def test_basis_metadata_pair1(meta_file_path):
     '''Test that each metadata file is paired with a table basis
@@ -0,0 +1,94 @@
+# Copyright (c) 2017-2022 The Molecular Sciences Software Institute, Virginia Tech
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived
+# from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Tests for processing basis set and family notes
+'''
+
+import glob
+import os
+import random
+
+import pytest
+
+from basis_set_exchange import api, memo, notes
+from .common_testvars import rand_seed, data_dir
+
+random.seed(rand_seed, version=2)
+
+_all_notes_files = sorted(glob.glob(os.path.join(data_dir, '*.notes')) + glob.glob(os.path.join(data_dir, 'NOTES.*')))
+
+
+def _substring_refs(s, ref_keys):
+    return {k for k in ref_keys if k in s}
+
+
+def test_reference_matcher_overlapping():
+    # Keys that are prefixes of other keys or that overlap in the text
+    ref_keys = ['abc2000a', 'abc2000ab', 'c2000a', 'b2000abx', 'x1999a', 'z.1+2']
+    matcher = notes._ReferenceMatcher(ref_keys)
+
+    tests = [
+        'abc2000ab', 'abc2000a', 'xabc2000abx1999a', 'c2000', 'abc2000abc2000a', 'nothing here', '', 'z.1+2', 'z.112'
+    ]
+    for s in tests:
+        assert matcher.find(s) == _substring_refs(s, ref_keys)
+
+    assert notes._ReferenceMatcher([]).find('abc2000a') == set()
+
+
+@pytest.mark.parametrize('notes_file', random.sample(_all_notes_files, 20))
+def test_process_notes_cache(notes_file):
+    ref_data = api.get_reference_data()
+    with open(notes_file, 'r', encoding='utf-8') as f:
+        notes_str = f.read()
+
+    assert notes._find_references(notes_str, ref_data) == _substring_refs(notes_str, ref_data.keys())
+
+    memo.memoize_enabled = False
+    try:
+        uncached = notes.process_notes(notes_str, ref_data)
+    finally:
+        memo.memoize_enabled = True
+
+    assert notes.process_notes(notes_str, ref_data) == uncached
+    assert notes.process_notes(notes_str, ref_data) == uncached
+
+
+def test_find_references_cache_bounded():
+    ref_data = api.get_reference_data()
+    ref_keys = sorted(ref_data.keys())
+    for i in range(20):
+        # A different set of references each time
+        subset = {k: ref_data[k] for k in ref_keys[i:]}
+        assert notes._find_references(' '.join(ref_keys[:40]), subset) == set(ref_keys[i:40])
+
+    assert notes._reference_matcher.cache_info().currsize <= 8
+    assert notes._find_references_cached.cache_info().maxsize is not None
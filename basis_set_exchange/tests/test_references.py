@@ -0,0 +1,211 @@
+# Copyright (c) 2017-2022 The Molecular Sciences Software Institute, Virginia Tech
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived
+# from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Tests for grouping and compacting of basis set references
+'''
+
+import copy
+import json
+import os
+import random
+import shutil
+
+import pytest
+
+from basis_set_exchange import api, references, refconverters, memo, curate
+from basis_set_exchange.refconverters import convert
+from .common_testvars import rand_seed, bs_names_sample, fake_data_dir
+
+random.seed(rand_seed, version=2)
+
+
+def _elref(desc, keys):
+    return {'reference_description': desc, 'reference_keys': keys}
+
+
+def test_reference_signature():
+    r1 = [_elref('desc', ['a', 'b'])]
+    r2 = [{'reference_keys': ['a', 'b'], 'reference_description': 'desc'}]
+    r3 = [_elref('desc', ['b', 'a'])]
+    r4 = [{'reference_description': 'desc', 'reference_keys': ['a', 'b'], 'other': [{'x': 1}]}]
+
+    assert references.reference_signature(r1) == references.reference_signature(r2)
+    assert references.reference_signature(r1) != references.reference_signature(r3)
+    assert references.reference_signature(r1) != references.reference_signature(r4)
+    assert len({references.reference_signature(x) for x in (r1, r2, r3, r4, [])}) == 4
+
+
+def test_compact_references_groups():
+    ref_data = {k: {'key': k} for k in 'abcd'}
+    descs = ['desc1', 'desc2']
+    basis_dict = {'elements': {}}
+    for z in range(1, 119):
+        elref = [_elref(random.choice(descs), random.sample('abcd', random.randint(0, 2)))]
+        basis_dict['elements'][str(z)] = {'references': elref}
+
+    orig = copy.deepcopy(basis_dict)
+    compacted = references.compact_references(basis_dict, ref_data)
+    assert basis_dict == orig
+
+    all_elements = []
+    for group in compacted:
+        all_elements.extend(group['elements'])
+        for el in group['elements']:
+            elref = basis_dict['elements'][el]['references']
+            assert [x['reference_description'] for x in group['reference_info']] == \
+                   [x['reference_description'] for x in elref]
+            assert [[k for k, v in x['reference_data']] for x in group['reference_info']] == \
+                   [x['reference_keys'] for x in elref]
+
+    assert sorted(all_elements, key=int) == [str(z) for z in range(1, 119)]
+
+    # Groups are ordered by first element
+    first = [int(x['elements'][0]) for x in compacted]
+    assert first == sorted(first)
+
+
+@pytest.mark.parametrize('basis_name', bs_names_sample)
+def test_filter_reference_groups(basis_name):
+    bs = api.get_basis(basis_name)
+    ref_data = api.get_reference_data()
+    avail_elements = list(bs['elements'].keys())
+    selected_elements = random.sample(avail_elements, random.randint(1, len(avail_elements)))
+
+    sorted_el = sorted(bs['elements'].items(), key=lambda x: int(x[0]))
+    element_refs = [(el, x['references']) for el, x in sorted_el]
+    groups = references.group_references(element_refs)
+    filtered = references.filter_reference_groups(groups, selected_elements)
+
+    bs_sub = {'elements': {el: bs['elements'][el] for el in selected_elements}}
+    assert references.expand_reference_groups(filtered, ref_data) == references.compact_references(bs_sub, ref_data)
+
+    # Incremental addition gives the same groups
+    half = len(element_refs) // 2
+    partial = references.group_references(element_refs[:half])
+    references.group_references(element_refs[half:], partial)
+    assert partial == groups
+
+
+@pytest.mark.parametrize('fmt', ['txt', 'bib', 'ris', 'endnote'])
+def test_render_reference_cache(fmt):
+    # Cached and uncached rendering give the same result
+    ref_data = api.get_reference_data()
+    for k in random.sample(sorted(ref_data.keys() - {'molssi_bse_schema'}), 10):
+        memo.memoize_enabled = False
+        try:
+            uncached = refconverters.render_reference(k, ref_data[k], fmt)
+        finally:
+            memo.memoize_enabled = True
+
+        assert refconverters.render_reference(k, ref_data[k], fmt) == uncached
+        assert refconverters.render_reference(k, ref_data[k], fmt) == uncached
+
+        # Different data under the same key is not taken from the cache
+        modified = copy.deepcopy(ref_data[k])
+        modified['year'] = '1066'
+        assert refconverters.render_reference(k, modified, fmt) != uncached
+
+    # The cache is bounded, but holds all the references of the library
+    cache_info = convert._render_cached.cache_info()
+    assert cache_info.maxsize is not None
+    assert cache_info.maxsize >= 4 * len(ref_data)
+
+
+@pytest.mark.parametrize('fmt', ['txt', 'bib', 'json'])
+def test_convert_references_batch(fmt):
+    all_refs = {x: api.get_references(x) for x in bs_names_sample}
+    batch = refconverters.convert_references_batch(all_refs, fmt)
+    assert batch.keys() == all_refs.keys()
+    for k, v in batch.items():
+        assert v == api.get_references(k, fmt=fmt)
+
+
+def test_convert_references_batch_shared(monkeypatch):
+    # Shared references are rendered once per batch, even without the cache
+    names = ['cc-pvdz', 'cc-pvtz', 'aug-cc-pvdz', 'aug-cc-pvtz']
+    all_refs = {x: api.get_references(x) for x in names}
+    expected = {x: api.get_references(x, fmt='txt') for x in names}
+
+    rendered = []
+
+    def count_render(key, ref):
+        rendered.append(key)
+        return references.reference_text(key, ref)
+
+    monkeypatch.setitem(convert._converter_map['txt'], 'function', count_render)
+    monkeypatch.setattr(memo, 'memoize_enabled', False)
+    for x in names:
+        refconverters.convert_references(copy.deepcopy(all_refs[x]), 'txt')
+    n_separate = len(rendered)
+
+    rendered.clear()
+    assert refconverters.convert_references_batch(all_refs, 'txt') == expected
+    assert len(rendered) == len(set(rendered))
+    assert len(rendered) < n_separate
+
+
+def test_rendered_references_file(tmp_path):
+    data_dir = os.path.join(str(tmp_path), 'data')
+    shutil.copytree(fake_data_dir, data_dir)
+    rendered_path = os.path.join(data_dir, 'RENDERED_REFERENCES.json')
+
+    memo.memoize_enabled = False
+    try:
+        ref_orig = refconverters.convert_references(api.get_references('bppfakebasis', data_dir=data_dir), 'bib')
+    finally:
+        memo.memoize_enabled = True
+
+    curate.create_rendered_references_file(rendered_path, data_dir)
+    with open(rendered_path, 'r') as f:
+        rendered = json.load(f)
+    assert rendered['library_version'] == api.version()
+    bib_orig = rendered['formats']['bib']['fakeref2019a']
+    assert bib_orig in ref_orig
+
+    # Replace the precomputed strings, so we can see that they are used
+    rendered['formats']['bib']['fakeref2019a'] = '@article{fakeref2019a, precomputed}'
+    rendered['formats']['txt']['fakeref2019a'] = 'precomputed'
+    with open(rendered_path, 'w') as f:
+        json.dump(rendered, f)
+
+    convert._render_cached.cache_clear()
+    try:
+        ref_new = api.get_references('bppfakebasis', fmt='bib', data_dir=data_dir)
+        assert ref_new == ref_orig.replace(bib_orig, '@article{fakeref2019a, precomputed}')
+        assert ref_new != ref_orig
+
+        # but not for different data under the same key
+        ref_data = copy.deepcopy(api.get_reference_data(data_dir)['fakeref2019a'])
+        ref_data['year'] = '1066'
+        assert 'precomputed' not in refconverters.render_reference('fakeref2019a', ref_data, 'txt')
+    finally:
+        convert._precomputed.clear()
+        convert._render_cached.cache_clear()
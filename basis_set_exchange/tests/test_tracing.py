@@ -0,0 +1,140 @@
+# Copyright (c) 2017-2022 The Molecular Sciences Software Institute, Virginia Tech
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived
+# from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Tests of tracing the stages of get_basis and get_references
+"""
+
+import pytest
+import basis_set_exchange as bse
+from basis_set_exchange import tracing
+
+
+def _stage_names(record):
+    return [x['stage'] for x in record['stages']]
+
+
+def test_trace_get_basis():
+    records = []
+    with tracing.trace(callback=records.append) as report:
+        bs_str = bse.get_basis('def2-TZVP', elements='H-Ne', fmt='nwchem', uncontract_general=True)
+
+    assert report.records == records
+    assert len(records) == 1
+    record = records[0]
+    assert record['stage'] == 'get_basis'
+    assert record['basis'] == 'def2-TZVP'
+    assert record['fmt'] == 'nwchem'
+    assert _stage_names(record) == ['metadata', 'compose_table_basis', 'transform', 'header', 'write']
+
+    transform = record['stages'][2]
+    assert 'uncontract_general' in _stage_names(transform)
+    assert record['stages'][-1]['chars'] == len(bs_str)
+
+    # Stages are contained in the call
+    assert sum(x['seconds'] for x in record['stages']) <= record['seconds']
+    assert report.stage_totals()['get_basis']['calls'] == 1
+    assert 'compose_table_basis' in report.format()
+
+
+def test_trace_files_read():
+    bse.memo.memoize_enabled = False
+    try:
+        with tracing.trace() as report:
+            bse.get_basis('cc-pVTZ', elements='C')
+    finally:
+        bse.memo.memoize_enabled = True
+
+    record = report.records[0]
+    compose = record['stages'][1]
+    assert compose['stage'] == 'compose_table_basis'
+    assert compose['files_read'] > 0
+    assert compose['bytes_read'] > 0
+
+    # Counters include the stages within
+    assert record['files_read'] == sum(x.get('files_read', 0) for x in record['stages'])
+
+
+@pytest.mark.parametrize('kwargs, stages', [
+    ({'augment_diffuse': 1, 'make_general': True}, ['augment_diffuse', 'make_general']),
+    ({'augment_steep': 1}, ['augment_steep', 'sort']),
+    ({'get_aux': 'autoaux'}, ['aux']),
+])
+def test_trace_get_basis_stages(kwargs, stages):
+    with tracing.trace() as report:
+        bse.get_basis('cc-pVTZ', elements='H-Ne', **kwargs)
+
+    names = _stage_names(report.records[0])
+    for stage in stages:
+        assert stage in names
+
+
+def test_trace_get_basis_auxgen(monkeypatch):
+    from basis_set_exchange.auxgen import cache, profiling
+    monkeypatch.setattr(cache, 'result_cache_enabled', False)
+
+    with tracing.trace() as trace_report, profiling.profile() as profile_report:
+        bse.get_basis('cc-pVDZ', elements='H,C', get_aux='cholesky-small')
+
+    # The auxgen stages are within the aux stage of the trace
+    aux = [x for x in trace_report.records[0]['stages'] if x['stage'] == 'aux']
+    assert len(aux) == 1
+    elements = aux[0]['stages']
+    assert _stage_names(aux[0]) == ['element', 'element']
+    assert [x['element'] for x in elements] == [1, 6]
+    selects = [x for x in elements[1]['stages'] if x['stage'] == 'select']
+    assert selects and all(x['L'] is not None for x in selects)
+
+    # and the profile has the same records, one per stage
+    assert profile_report.records[-1] is elements[-1]
+    totals = trace_report.stage_totals()
+    for stage, t in profile_report.stage_totals().items():
+        assert totals[stage]['calls'] == t['calls']
+
+
+def test_trace_get_references_memory():
+    with tracing.trace(memory=True) as report:
+        bse.get_references('def2-TZVP', fmt='bib')
+
+    record = report.records[0]
+    assert record['stage'] == 'get_references'
+    assert _stage_names(record) == ['metadata', 'compose_table_references', 'convert_references']
+    for r in [record] + record['stages']:
+        assert r['peak_bytes'] >= r['allocated_bytes']
+
+
+def test_trace_disabled():
+    assert not tracing.enabled()
+    with tracing.stage('get_basis') as record:
+        assert record is None
+
+    with tracing.trace():
+        assert tracing.enabled()
+    assert not tracing.enabled()
@@ -0,0 +1,111 @@
+# Copyright (c) 2017-2022 The Molecular Sciences Software Institute, Virginia Tech
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived
+# from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Tests for transformation plans (transform)
+"""
+
+import itertools
+
+import pytest
+
+from basis_set_exchange import api, manip, sort, transform, writers
+
+_opts = ['remove_free_primitives', 'optimize_general', 'uncontract_general', 'uncontract_spdf', 'uncontract_segmented', 'make_general']
+
+
+def _apply_unfused(basis, plan):
+    '''Applies a plan by calling the manip/sort functions one after another'''
+
+    for step in plan:
+        name, args = step[0], step[1:]
+        if name == 'prune':
+            basis = manip.prune_basis(basis, True)
+        elif name == 'sort':
+            basis = sort.sort_basis(basis, True)
+        elif name == 'uncontract_spdf':
+            basis = manip.uncontract_spdf(basis, args[0], True)
+        elif name == 'make_general':
+            basis = manip.make_general(basis, args[0], True)
+        else:
+            basis = getattr(manip, name)(basis, True)
+
+    return basis
+
+
+@pytest.mark.parametrize('basis_name, elements', [('6-31g*', [1, 6, 8, 20]), ('cc-pvdz', [1, 6]), ('def2-svp', [1, 8, 50])])
+def test_transform_plan(basis_name, elements):
+    bs = api.get_basis(basis_name, elements=elements)
+
+    # All the different plans of the writers
+    writer_plans = {tuple(writers.get_writer_plan(x)) for x in writers.get_writer_formats()}
+
+    for combo in itertools.product([False, True], repeat=len(_opts)):
+        plan = transform.create_plan(**dict(zip(_opts, combo)))
+        ref = _apply_unfused(bs, plan)
+        assert transform.apply_plan(bs, plan) == ref
+
+        for writer_plan in writer_plans:
+            writer_plan = list(writer_plan)
+            ref2 = _apply_unfused(ref, writer_plan)
+            new = transform.apply_plan(bs, plan + writer_plan)
+            assert new == ref2
+
+            # Including the order of the keys
+            assert repr(new) == repr(ref2)
+
+
+def test_transform_compile():
+    # Redundant steps are skipped
+    plan = transform.create_plan(uncontract_general=True) + writers.get_writer_plan('gaussian94')
+    compiled = transform.compile_plan(plan)
+    assert compiled == [('uncontract_general', ()), ('prune', ()), ('uncontract_spdf', (1, )), ('sort', ())]
+
+    plan = transform.create_plan(make_general=True, uncontract_spdf=True) + writers.get_writer_plan('molpro')
+    compiled = transform.compile_plan(plan)
+    assert compiled == [('uncontract_spdf', (0, )), ('make_general', ()), ('prune', ()), ('sort', ())]
+
+    with pytest.raises(RuntimeError, match=r'only allowed as the last step'):
+        transform.compile_plan([('sort', ), ('prune', )])
+
+    with pytest.raises(RuntimeError, match=r'Unknown step'):
+        transform.compile_plan([('not_a_step', )])
+
+
+def test_transform_nocopy():
+    bs = api.get_basis('6-31g*', elements=[1, 6])
+    bs_copy = api.get_basis('6-31g*', elements=[1, 6])
+    plan = writers.get_writer_plan('gaussian94')
+
+    # Input is not modified with use_copy=True
+    transform.apply_plan(bs, plan)
+    assert bs == bs_copy
+
+    assert transform.apply_plan(bs, []) is bs
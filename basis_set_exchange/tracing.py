@@ -0,0 +1,288 @@
+# Copyright (c) 2017-2022 The Molecular Sciences Software Institute, Virginia Tech
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived
+# from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Opt-in tracing of the stages of :func:`basis_set_exchange.api.get_basis`
+and :func:`basis_set_exchange.api.get_references`
+
+Tracing is off unless a :func:`trace` context is active::
+
+    from basis_set_exchange import tracing
+
+    with tracing.trace() as report:
+        bse.get_basis('def2-TZVP', fmt='nwchem')
+    print(report.format())
+
+Each traced call adds a record (a dict) to the report. A record has the name
+of the ``'stage'``, its wall time in ``'seconds'``, stage-specific counters,
+and the records of the stages run within it under ``'stages'``. The record
+of a :func:`~basis_set_exchange.api.get_basis` call has the ``'basis'`` and
+``'fmt'`` requested, and contains the stages
+
+    * ``'metadata'`` -- looking up the basis set and version
+    * ``'compose_table_basis'`` -- reading and composing the data files
+    * ``'transform'`` -- each pass of manipulations, with the time of each
+      manipulation step (such as ``'uncontract_general'``) as a stage within it
+    * ``'augment_diffuse'``, ``'augment_steep'``, ``'sort'``, ``'make_general'``
+    * ``'aux'`` -- generating an auxiliary basis set
+    * ``'header'`` -- building the header of the output
+    * ``'write'`` -- :func:`~basis_set_exchange.writers.write_formatted_basis_str`
+
+Stages that read data files count them in ``'files_read'`` and
+``'bytes_read'`` (the size on disk), and memoized functions count
+``'memo_hits'`` and ``'memo_misses'``. These counters include the files read
+and memoized calls of all the stages within.
+
+If ``memory=True`` is passed to :func:`trace`, allocations are traced with
+:mod:`tracemalloc` and each record also has ``'allocated_bytes'`` (memory
+still allocated at the end of the stage) and ``'peak_bytes'`` (peak memory
+allocated during the stage). The steps of a transformation pass are applied
+together to each element, so only their times are available.
+
+A ``callback`` passed to :func:`trace` is called with the record of each
+traced call (for example, to export metrics) when the call completes.
+
+The stages and reports defined here are also the core of
+:mod:`basis_set_exchange.auxgen.profiling`, whose per-element and per-L
+records of the auxiliary basis generation appear as stages within
+``'aux'``.
+'''
+
+import contextlib
+import contextvars
+import time
+import tracemalloc
+
+# Reports collecting the stages, innermost last
+_reports = contextvars.ContextVar('bse_trace_reports', default=())
+_open_stage = contextvars.ContextVar('bse_trace_stage', default=None)
+
+
+class _OpenStage:
+    '''A stage that has not completed yet'''
+
+    def __init__(self, record, parent, reports):
+        self.record = record
+        self.parent = parent
+        self.reports = reports
+        self.memory = any(r.memory for r in reports)
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            self.start_memory = current
+            self.peak_memory = current
+            # The peak of the parent stage so far must be kept before the
+            # peak is reset for this stage
+            if parent is not None and parent.memory:
+                parent.peak_memory = max(parent.peak_memory, peak)
+            tracemalloc.reset_peak()
+
+    def finish_memory(self):
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(self.peak_memory, peak)
+        self.record['allocated_bytes'] = current - self.start_memory
+        self.record['peak_bytes'] = peak - self.start_memory
+        tracemalloc.reset_peak()
+        if self.parent is not None and self.parent.memory:
+            self.parent.peak_memory = max(self.parent.peak_memory, peak)
+
+
+class TraceReport:
+    '''Records of the calls traced while a :func:`trace` context was active'''
+
+    def __init__(self, callback=None, memory=False):
+        self.records = []
+        self.callback = callback
+        self.memory = memory
+
+    def add(self, record):
+        self.records.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    def finish(self, record, parent):
+        '''Called with the record of each stage when it completes, and the
+        open stage containing it (or ``None``)
+
+        Records of stages not contained in another stage traced by this
+        report are added to it.
+        '''
+        if parent is None or self not in parent.reports:
+            self.add(record)
+
+    def stage_totals(self):
+        '''Totals per stage over all the traced calls
+
+        Returns
+        -------
+        dict
+            ``{stage: {'calls': int, 'seconds': float}}``
+        '''
+        totals = {}
+
+        def _add(records):
+            for r in records:
+                t = totals.setdefault(r['stage'], {'calls': 0, 'seconds': 0.0})
+                t['calls'] += 1
+                t['seconds'] += r['seconds']
+                _add(r['stages'])
+
+        _add(self.records)
+        return totals
+
+    def format(self):
+        '''Human-readable summary, with the stages of each call indented under it'''
+        lines = []
+
+        def _add(records, depth):
+            for r in records:
+                counters = ', '.join('{}={}'.format(k, v) for k, v in r.items()
+                                     if k not in ('stage', 'seconds', 'stages') and v is not None)
+                lines.append('{:30} {:11.4f}  {}'.format('  ' * depth + r['stage'], r['seconds'], counters).rstrip())
+                _add(r['stages'], depth + 1)
+
+        _add(self.records, 0)
+        return '\n'.join(lines)
+
+
+@contextlib.contextmanager
+def trace(callback=None, memory=False):
+    '''Collect the records of the calls traced in the enclosed block
+
+    Parameters
+    ----------
+    callback : callable, optional
+        Called with the record (a dict) of each traced call when it completes
+    memory : bool
+        Also trace the memory allocated by each stage (slows down the calls)
+
+    Yields
+    ------
+    TraceReport
+        The report the records are added to
+    '''
+    with collect(TraceReport(callback, memory)) as report:
+        yield report
+
+
+@contextlib.contextmanager
+def collect(report):
+    '''Pass the stages traced in the enclosed block to ``report``
+
+    ``report`` is a :class:`TraceReport` (or a subclass, which can override
+    :meth:`TraceReport.finish` to select the records it keeps).
+
+    Yields
+    ------
+    TraceReport
+        ``report``
+    '''
+    start_tracemalloc = report.memory and not tracemalloc.is_tracing()
+    if start_tracemalloc:
+        tracemalloc.start()
+
+    token = _reports.set(_reports.get() + (report, ))
+    try:
+        yield report
+    finally:
+        _reports.reset(token)
+        if start_tracemalloc:
+            tracemalloc.stop()
+
+
+def enabled():
+    '''Whether a :func:`trace` (or :func:`collect`) context is active'''
+    return bool(_reports.get())
+
+
+def active_reports():
+    '''The reports of the active :func:`trace` and :func:`collect` contexts, innermost last'''
+    return _reports.get()
+
+
+@contextlib.contextmanager
+def stage(name, **counters):
+    '''Time the enclosed block as stage ``name``
+
+    Yields the record being built (a dict, or ``None`` when tracing is off),
+    so counters known only at the end of the stage can be added to it.
+    '''
+    reports = _reports.get()
+    if not reports:
+        yield None
+        return
+
+    parent = _open_stage.get()
+    record = {'stage': name}
+    record.update(counters)
+    record['stages'] = []
+    open_stage = _OpenStage(record, parent, reports)
+    token = _open_stage.set(open_stage)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['seconds'] = time.perf_counter() - start
+        _open_stage.reset(token)
+        if open_stage.memory:
+            open_stage.finish_memory()
+        if parent is not None:
+            parent.record['stages'].append(record)
+        for report in reports:
+            report.finish(record, parent)
+
+
+def add_stage(name, seconds, **counters):
+    '''Add a stage that was timed separately to the innermost open stage'''
+    open_stage = _open_stage.get()
+    if open_stage is None:
+        return
+
+    record = {'stage': name}
+    record.update(counters)
+    record['stages'] = []
+    record['seconds'] = seconds
+    open_stage.record['stages'].append(record)
+
+
+def annotate(**values):
+    '''Set values in the record of the innermost open stage'''
+    open_stage = _open_stage.get()
+    if open_stage is not None:
+        open_stage.record.update(values)
+
+
+def count(**counters):
+    '''Add to counters of the innermost open stage and all the stages containing it'''
+    open_stage = _open_stage.get()
+    while open_stage is not None:
+        record = open_stage.record
+        for k, v in counters.items():
+            record[k] = record.get(k, 0) + v
+        open_stage = open_stage.parent
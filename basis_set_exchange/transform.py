@@ -0,0 +1,309 @@
+# Copyright (c) 2017-2022 The Molecular Sciences Software Institute, Virginia Tech
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived
+# from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Transformation plans for basis set manipulations
+
+A plan is a sequence of manipulation steps (uncontracting, making general
+contractions, pruning, sorting, ...). Rather than applying each manipulation
+to the whole basis set in turn, :func:`apply_plan` applies all the steps to
+one element at a time, in a single pass over the basis set. Steps that
+cannot change the basis set (such as pruning a basis set that has already
+been pruned) are skipped. The basis set is never copied as a whole: the
+steps create new shells only where the shells change, and other data
+is shared with the input.
+
+The result is the same as calling the corresponding functions from
+:mod:`basis_set_exchange.manip` and :mod:`basis_set_exchange.sort` in order.
+
+The steps of a plan are tuples of the step name and its arguments:
+
+    * ``('remove_free_primitives',)`` -- :func:`manip.remove_free_primitives`
+    * ``('optimize_general',)`` -- :func:`manip.optimize_general`
+    * ``('uncontract_segmented',)`` -- :func:`manip.uncontract_segmented`
+    * ``('uncontract_general',)`` -- :func:`manip.uncontract_general`
+    * ``('uncontract_spdf', max_am)`` -- :func:`manip.uncontract_spdf`
+    * ``('make_general', skip_spdf)`` -- :func:`manip.make_general`
+    * ``('prune',)`` -- :func:`manip.prune_basis`
+    * ``('sort',)`` -- :func:`sort.sort_basis` (only allowed as the last step)
+"""
+
+import time
+
+from . import manip, misc, sort, tracing
+
+# Steps that can be applied to the shells of each element. These correspond
+# to the functions in manip, but without the pruning that those functions do.
+# Each entry contains the function, the properties of the shells that the
+# step establishes, and the properties it keeps.
+#
+# Properties:
+#   pruned     - prune_basis has been applied
+#   sorted     - sort_basis has been applied
+#   no_general - no single-am shell has more than one general contraction
+#   no_spdf    - there are no sp, spd,... shells
+#   general    - one general contraction for each am (make_general)
+# yapf: disable
+_element_steps = {
+    'remove_free_primitives': {
+        'function': manip._remove_free_primitives_shells,
+        'sets': set(),
+        'keeps': {'no_general', 'no_spdf'}
+    },
+    'optimize_general': {
+        'function': manip._optimize_general_shells,
+        'sets': set(),
+        'keeps': {'no_spdf'}
+    },
+    'uncontract_segmented': {
+        'function': manip._uncontract_segmented_shells,
+        'sets': {'no_general'},
+        'keeps': {'no_spdf'}
+    },
+    'uncontract_general': {
+        'function': manip._uncontract_general_shells,
+        'sets': {'no_general'},
+        'keeps': {'no_spdf'}
+    },
+    'uncontract_spdf': {
+        'function': manip._uncontract_spdf_shells,
+        'sets': set(),
+        'keeps': {'no_general'}
+    },
+    'make_general': {
+        'function': manip._make_general_shells,
+        'sets': {'general'},
+        'keeps': {'no_spdf'}
+    },
+    'prune': {
+        'function': manip._prune_shells,
+        'sets': {'pruned'},
+        'keeps': {'no_general', 'no_spdf', 'general'}
+    },
+    'sort': {
+        'function': sort.sort_shells,
+        'sets': {'sorted'},
+        'keeps': {'pruned', 'no_general', 'no_spdf', 'general'}
+    },
+}
+# yapf: enable
+
+
+def _expand_step(step):
+    '''Expands a step of a plan into the element steps that make it up
+
+    This mirrors what the corresponding functions in manip do
+    '''
+
+    name, args = step[0], tuple(step[1:])
+
+    if name == 'remove_free_primitives':
+        return [('remove_free_primitives', ), ('prune', )]
+    elif name == 'optimize_general':
+        return [('make_general', ), ('prune', ), ('optimize_general', )]
+    elif name == 'uncontract_segmented':
+        return [('uncontract_segmented', )]
+    elif name == 'uncontract_general':
+        return [('uncontract_general', ), ('prune', )]
+    elif name == 'uncontract_spdf':
+        return [('uncontract_spdf', ) + args]
+    elif name == 'make_general':
+        skip_spdf = args[0] if args else False
+        pre = [] if skip_spdf else [('uncontract_spdf', 0)]
+        return pre + [('make_general', ), ('prune', )]
+    elif name == 'prune':
+        return [('prune', )]
+    elif name == 'sort':
+        return [('sort', )]
+    else:
+        raise RuntimeError('Unknown step in transformation plan: {}'.format(name))
+
+
+def _is_noop(step, props):
+    '''Determines if an element step cannot change shells with the given properties'''
+
+    name = step[0]
+    if name == 'prune':
+        return 'pruned' in props
+    if name == 'sort':
+        return 'sorted' in props
+    if name == 'uncontract_general':
+        return 'no_general' in props
+    if name == 'uncontract_spdf':
+        return 'no_spdf' in props
+    if name == 'make_general':
+        return 'general' in props and 'pruned' in props
+    return False
+
+
+def compile_plan(plan):
+    '''Compiles a plan into the list of element steps to be applied
+
+    Steps that cannot change the basis set are removed.
+
+    Parameters
+    ----------
+    plan : list
+        Steps of the plan (see the module documentation)
+
+    Returns
+    -------
+    list
+        Element steps, as tuples of (name, arguments)
+    '''
+
+    plan = list(plan)
+    for step in plan[:-1]:
+        if step[0] == 'sort':
+            raise RuntimeError('Sorting is only allowed as the last step of a transformation plan')
+
+    props = set()
+    compiled = []
+    for step in plan:
+        for elstep in _expand_step(step):
+            if _is_noop(elstep, props):
+                continue
+
+            name = elstep[0]
+            props = (props & _element_steps[name]['keeps']) | _element_steps[name]['sets']
+
+            # Uncontracting spdf to s only leaves no sp, spd,... shells
+            if name == 'uncontract_spdf' and elstep[1] == 0:
+                props.add('no_spdf')
+
+            compiled.append((name, tuple(elstep[1:])))
+
+    return compiled
+
+
+def create_plan(remove_free_primitives=False,
+                optimize_general=False,
+                uncontract_general=False,
+                uncontract_spdf=False,
+                uncontract_segmented=False,
+                make_general=False):
+    '''Creates a plan for the manipulations that may be requested from get_basis
+
+    The arguments are the same as those of :func:`basis_set_exchange.api.get_basis`,
+    and the steps are in the same order as they are done there. If any manipulation
+    is requested, the basis set is pruned at the end.
+    '''
+
+    plan = []
+
+    if remove_free_primitives:
+        plan.append(('remove_free_primitives', ))
+
+    if optimize_general:
+        plan.append(('optimize_general', ))
+
+    # uncontract_segmented implies uncontract_general
+    if uncontract_segmented:
+        plan.append(('uncontract_segmented', ))
+    elif uncontract_general:
+        plan.append(('uncontract_general', ))
+
+    if uncontract_spdf:
+        plan.append(('uncontract_spdf', 0))
+
+    if make_general:
+        plan.append(('make_general', False))
+
+    # Remove dead and duplicate shells
+    if plan:
+        plan.append(('prune', ))
+
+    return plan
+
+
+def apply_plan(basis, plan, use_copy=True):
+    '''Applies a transformation plan to a basis set
+
+    All the steps are applied to each element in turn.
+
+    Parameters
+    ----------
+    basis : dict
+        Basis set to transform
+    plan : list
+        Steps of the plan (see the module documentation)
+    use_copy : bool
+        If True, the input basis set is not modified. The returned basis set
+        may share data with the input.
+
+    Returns
+    -------
+    dict
+        The transformed basis set
+    '''
+
+    compiled = compile_plan(plan)
+    if not compiled:
+        return basis
+
+    if use_copy:
+        basis = misc.shallow_copy_basis(basis)
+
+    step_names = [x[0] for x in compiled]
+    do_sort = 'sort' in step_names
+
+    # prune_basis moves the shells to the end of the element data
+    do_prune = 'prune' in step_names
+
+    # Time of each step, summed over the elements (only when tracing)
+    step_seconds = [0.0] * len(compiled) if tracing.enabled() else None
+
+    for el in basis['elements'].values():
+        if 'electron_shells' in el:
+            shells = el['electron_shells']
+            if step_seconds is None:
+                for name, args in compiled:
+                    shells = _element_steps[name]['function'](shells, *args)
+            else:
+                for i, (name, args) in enumerate(compiled):
+                    start = time.perf_counter()
+                    shells = _element_steps[name]['function'](shells, *args)
+                    step_seconds[i] += time.perf_counter() - start
+
+            if do_prune:
+                del el['electron_shells']
+            el['electron_shells'] = shells
+
+        if do_sort and 'ecp_potentials' in el:
+            el['ecp_potentials'] = sort.sort_potentials(el['ecp_potentials'], False)
+
+    if do_sort:
+        basis = sort.sort_basis_dict(basis)
+
+    if step_seconds is not None:
+        for (name, _), seconds in zip(compiled, step_seconds):
+            tracing.add_stage(name, seconds)
+
+    return basis
@@ -32,4 +32,4 @@
 Conversion of basis sets to various formats
 '''
 
-from .write import write_formatted_basis_file, write_formatted_basis_str, get_writer_formats, get_format_extension
+from .write import write_formatted_basis_file, write_formatted_basis_str, get_writer_formats, get_writer_plan, get_format_extension
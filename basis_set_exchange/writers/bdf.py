@@ -32,16 +32,13 @@
 Conversion of basis sets to BDF format
 '''
 
-from .. import lut, manip, printing, sort, misc
+from .. import lut, printing, misc
 
 
 def write_bdf(basis):
     '''Converts a basis set to BDF format
     '''
 
-    basis = manip.make_general(basis, False, True)
-    basis = sort.sort_basis(basis, False)
-
     s = ''
 
     # Elements for which we have electron basis
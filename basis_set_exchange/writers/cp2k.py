@@ -32,7 +32,7 @@
 Conversion of basis sets to cp2k format
 '''
 
-from .. import lut, sort, misc, printing
+from .. import lut, misc, printing
 
 
 def write_cp2k(basis):
@@ -40,7 +40,6 @@ def write_cp2k(basis):
     '''
 
     s = ''
-    basis = sort.sort_basis(basis, True)
 
     # Elements for which we have electron basis
     electron_elements = [k for k, v in basis['elements'].items() if 'electron_shells' in v]
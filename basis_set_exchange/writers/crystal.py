@@ -35,17 +35,13 @@ Conversion of basis sets to Crystal format
 Written by Susi Lehtola, 2020-2025
 '''
 
-from .. import manip, sort, printing
+from .. import printing
 
 
 def write_crystal(basis):
     '''Converts a basis set to Crystal format
     '''
 
-    basis = manip.uncontract_general(basis, True)
-    basis = manip.uncontract_spdf(basis, 1, False)
-    basis = sort.sort_basis(basis, False)
-
     # Elements for which we have electron basis
     electron_elements = [k for k, v in basis['elements'].items() if 'electron_shells' in v]
 
@@ -32,7 +32,7 @@
 Conversion of basis sets to Dalton format
 '''
 
-from .. import lut, manip, sort, misc, printing
+from .. import lut, misc, printing
 
 
 def write_dalton(basis):
@@ -41,9 +41,6 @@ def write_dalton(basis):
 
     s = '! Basis = {}\n\n'.format(basis['name'])
 
-    basis = manip.make_general(basis, False, True)
-    basis = sort.sort_basis(basis, False)
-
     # Elements for which we have electron basis
     electron_elements = [k for k, v in basis['elements'].items() if 'electron_shells' in v]
 
@@ -32,7 +32,7 @@
 Conversion of basis sets to deMon2K format
 '''
 
-from .. import lut, manip, sort, misc, printing
+from .. import lut, misc, printing
 
 
 def write_demon2k(basis):
@@ -44,10 +44,6 @@ def write_demon2k(basis):
     else:
         s = '# This basis set uses cartesian components\n\n'
 
-    basis = manip.uncontract_spdf(basis, 0, True)
-    basis = manip.uncontract_general(basis, False)
-    basis = sort.sort_basis(basis, False)
-
     # Elements for which we have electron basis
     electron_elements = [k for k, v in basis['elements'].items() if 'electron_shells' in v]
 
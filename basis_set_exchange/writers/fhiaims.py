@@ -34,7 +34,7 @@ Conversion of basis sets to FHI-aims format
 2021-07-05 Susi Lehtola
 '''
 
-from .. import lut, manip, sort, printing
+from .. import lut, printing
 
 
 def write_fhiaims(basis):
@@ -47,9 +47,6 @@ def write_fhiaims(basis):
 
     # Set up
     s = ''
-    basis = manip.uncontract_general(basis, True)
-    basis = manip.uncontract_spdf(basis, 0, False)
-    basis = sort.sort_basis(basis, False)
 
     # Elements for which we have electron basis
     electron_elements = [k for k, v in basis['elements'].items() if 'electron_shells' in v]
@@ -32,7 +32,7 @@
 Conversion of basis sets to Gaussian format
 '''
 
-from .. import lut, manip, sort, printing
+from .. import lut, printing
 
 
 def _write_g94_common(basis, add_harm_type, psi4_am, system_library):
@@ -41,10 +41,6 @@ def _write_g94_common(basis, add_harm_type, psi4_am, system_library):
 
     s = ''
 
-    basis = manip.uncontract_general(basis, True)
-    basis = manip.uncontract_spdf(basis, 1, False)
-    basis = sort.sort_basis(basis, False)
-
     # Elements for which we have electron basis
     electron_elements = [k for k, v in basis['elements'].items() if 'electron_shells' in v]
 
@@ -32,7 +32,7 @@
 Conversion of basis sets to GAMESS-UK format
 '''
 
-from .. import lut, manip, sort, printing
+from .. import lut, printing
 
 
 def write_gamess_uk(basis):
@@ -41,11 +41,6 @@ def write_gamess_uk(basis):
 
     s = ''
 
-    # Uncontract all but SP
-    basis = manip.uncontract_general(basis, True)
-    basis = manip.uncontract_spdf(basis, 1, False)
-    basis = sort.sort_basis(basis, False)
-
     # Elements for which we have electron basis
     electron_elements = [k for k, v in basis['elements'].items() if 'electron_shells' in v]
 
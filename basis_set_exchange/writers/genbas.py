@@ -33,7 +33,7 @@ Conversion of basis sets to cfour/aces2/genbas format
 '''
 
 import math
-from .. import lut, manip, sort, printing
+from .. import lut, printing
 
 
 def _cfour_exp(e):
@@ -87,10 +87,6 @@ def _print_columns(data, ncol):
 
 
 def _write_genbas_internal(basis, exp_formatter, coef_formatter):
-    # Uncontract all, then make general
-    basis = manip.make_general(basis, False, True)
-    basis = sort.sort_basis(basis, False)
-
     # Elements for which we have electron basis
     electron_elements = [k for k, v in basis['elements'].items() if 'electron_shells' in v]
 
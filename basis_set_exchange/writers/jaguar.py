@@ -34,17 +34,13 @@ Conversion of basis sets to Jaguar format
 2021-12-20 Susi Lehtola
 '''
 
-from .. import lut, manip, sort, printing
+from .. import lut, printing
 
 
 def write_jaguar(basis):
     '''Converts a basis set to Jaguar format
     '''
 
-    basis = manip.uncontract_general(basis, True)
-    basis = manip.uncontract_spdf(basis, 1, False)
-    basis = sort.sort_basis(basis, False)
-
     # Elements for which we have electron basis
     electron_elements = [k for k, v in basis['elements'].items() if 'electron_shells' in v]
 
@@ -35,7 +35,7 @@ Written by Susi Lehtola, 2020
 (based on Ben Pritchard's Molpro input code)
 '''
 
-from .. import lut, manip, misc, sort
+from .. import lut, misc
 from .common import find_range, reshape
 
 
@@ -43,10 +43,6 @@ def write_libmol(basis):
     '''Converts a basis set to Molpro system library format
     '''
 
-    # Uncontract all, and make as generally-contracted as possible
-    basis = manip.make_general(basis, False, True)
-    basis = sort.sort_basis(basis, True)
-
     # Start out with angular momentum type
     types = basis['function_types']
     harm_type = 'cartesian' if 'gto_cartesian' in types else 'spherical'
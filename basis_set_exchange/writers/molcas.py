@@ -32,16 +32,13 @@
 Conversion of basis sets to Molcas format
 '''
 
-from .. import lut, manip, printing, misc, sort
+from .. import lut, printing, misc
 
 
 def write_molcas(basis):
     '''Converts a basis set to Molcas format
     '''
 
-    basis = manip.make_general(basis, False, True)
-    basis = sort.sort_basis(basis, False)
-
     s = ''
 
     for z, data in basis['elements'].items():
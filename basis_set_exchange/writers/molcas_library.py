@@ -2,7 +2,7 @@
 Conversion of basis sets to Molcas basis_library format
 '''
 
-from .. import lut, manip, printing, misc, sort, api
+from .. import lut, printing, misc, api
 import unidecode
 
 
@@ -10,9 +10,6 @@ def write_molcas_library(basis):
     '''Converts a basis set to Molcas basis_library format
     '''
 
-    basis = manip.make_general(basis, False, True)
-    basis = sort.sort_basis(basis, False)
-
     s = ''
 
     ref_data = api.get_reference_data(None)
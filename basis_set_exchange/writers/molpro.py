@@ -32,7 +32,7 @@
 Conversion of basis sets to Molpro format
 '''
 
-from .. import lut, manip, misc, sort
+from .. import lut, misc
 from .common import find_range
 
 
@@ -40,10 +40,6 @@ def write_molpro(basis):
     '''Converts a basis set to Molpro format
     '''
 
-    # Uncontract all, and make as generally-contracted as possible
-    basis = manip.make_general(basis, False, True)
-    basis = sort.sort_basis(basis, True)
-
     # Start out with angular momentum type
     types = basis['function_types']
     harm_type = 'cartesian' if 'gto_cartesian' in types else 'spherical'
@@ -32,17 +32,13 @@
 Conversion of basis sets to NWChem format
 '''
 
-from .. import lut, manip, printing, misc, sort
+from .. import lut, printing, misc
 
 
 def write_nwchem(basis):
     '''Converts a basis set to NWChem format
     '''
 
-    # Uncontract all but SP
-    basis = manip.uncontract_spdf(basis, 1, True)
-    basis = sort.sort_basis(basis, False)
-
     s = ''
 
     # Elements for which we have electron basis
@@ -32,7 +32,7 @@
 Conversion of basis sets to PQS format
 '''
 
-from .. import lut, manip, sort, printing
+from .. import lut, printing
 from .gamess_us import write_gamess_us_ecp_basis
 
 
@@ -69,9 +69,6 @@ def write_pqs(basis):
 
     s = ''
 
-    basis = manip.make_general(basis, True)
-    basis = sort.sort_basis(basis, False)
-
     # Elements for which we have electron basis
     electron_elements = [k for k, v in basis['elements'].items() if 'electron_shells' in v]
 
@@ -32,7 +32,7 @@
 Conversion of basis sets to Q-Chem format
 '''
 
-from .. import lut, manip, sort, printing
+from .. import lut, printing
 
 
 def _determine_pure(basis):
@@ -66,9 +66,6 @@ def write_qchem(basis):
     '''
 
     s = ''
-    basis = manip.uncontract_general(basis, True)
-    basis = manip.uncontract_spdf(basis, 1, False)
-    basis = sort.sort_basis(basis, False)
 
     # Elements for which we have electron basis
     electron_elements = [k for k, v in basis['elements'].items() if 'electron_shells' in v]
@@ -33,7 +33,7 @@ Conversion of basis sets to QCSchema JSON format
 '''
 
 import json
-from .. import manip, sort, lut
+from .. import lut
 
 
 def write_qcschema(basis):
@@ -42,10 +42,6 @@ def write_qcschema(basis):
     Note that the output is a string
     '''
 
-    # Uncontract all but SP
-    basis = manip.uncontract_spdf(basis, 1, True)
-    basis = sort.sort_basis(basis, True)
-
     basis_name = basis.get('name', 'unknown_basis')
     basis_desc = basis.get('description', '<no description>')
     new_basis = {'schema_name': 'qcschema_basis', 'schema_version': 1, 'name': basis_name, 'description': basis_desc}
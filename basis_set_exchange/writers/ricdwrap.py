@@ -32,16 +32,13 @@
 This is a wrapper for generating acCD basis sets with OpenMolcas
 '''
 
-from .. import lut, manip, printing, misc, sort
+from .. import lut, printing, misc
 
 
 def write_ricdwrap(basis):
     '''Generates an input file for OpenMolcas that generates the acCD basis
     '''
 
-    basis = manip.make_general(basis, False, True)
-    basis = sort.sort_basis(basis, False)
-
     s = '''
 &GATEWAY
   ricd
@@ -32,7 +32,7 @@
 Conversion of basis sets to Turbomole format
 '''
 
-from .. import lut, manip, sort, printing
+from .. import lut, printing
 
 
 def write_turbomole(basis):
@@ -53,11 +53,6 @@ def write_turbomole(basis):
 
     s += '*\n'
 
-    # TM basis sets are completely uncontracted
-    basis = manip.uncontract_general(basis, True)
-    basis = manip.uncontract_spdf(basis, 0, False)
-    basis = sort.sort_basis(basis, False)
-
     # Elements for which we have electron basis
     electron_elements = [k for k, v in basis['elements'].items() if 'electron_shells' in v]
 
@@ -33,7 +33,7 @@ Conversion of basis sets to VeloxChem format
 
 from hashlib import md5
 
-from .. import lut, manip, misc, printing, sort
+from .. import lut, misc, printing
 
 
 def write_veloxchem(basis):
@@ -42,10 +42,6 @@ def write_veloxchem(basis):
 
     s = f'@BASIS_SET {basis["name"]}\n'
 
-    basis = manip.uncontract_general(basis, False)
-    basis = manip.uncontract_spdf(basis, 0, False)
-    basis = sort.sort_basis(basis, False)
-
     # Elements for which we have electron basis
     electron_elements = [k for k, v in basis['elements'].items() if 'electron_shells' in v]
 
@@ -33,31 +33,24 @@ Driver for converting basis set data to a specified output format
 '''
 
 import bz2
-from .bsejson import write_json
-from .nwchem import write_nwchem
-from .g94 import write_g94, write_g94lib, write_xtron, write_psi4
-from .gamess_us import write_gamess_us
-from .gamess_uk import write_gamess_uk
-from .qchem import write_qchem
-from .orca import write_orca
-from .turbomole import write_turbomole
-from .molpro import write_molpro
-from .libmol import write_libmol
-from .molcas import write_molcas
-from .molcas_library import write_molcas_library
-from .genbas import write_cfour, write_aces2
-from .dalton import write_dalton
-from .qcschema import write_qcschema
-from .demon2k import write_demon2k
-from .pqs import write_pqs
-from .cp2k import write_cp2k
-from .bsedebug import write_bsedebug
-from .bdf import write_bdf
-from .ricdwrap import write_ricdwrap
-from .fhiaims import write_fhiaims
-from .jaguar import write_jaguar
-from .crystal import write_crystal
-from .veloxchem import write_veloxchem
+from .. import transform
+from ..misc import LazyFunction
+
+
+def _writer(module_name, function_name):
+    '''Registry entry for a writer function that is imported on first use'''
+    return LazyFunction(__package__ + '.' + module_name, function_name)
+
+
+# Manipulations done to the basis set before it is written in a given format
+# (see basis_set_exchange.transform)
+_plan_sort = (('sort', ), )
+_plan_spdf1 = (('uncontract_spdf', 1), ('sort', ))
+_plan_uncontract = (('uncontract_general', ), ('uncontract_spdf', 1), ('sort', ))
+_plan_uncontract_all = (('uncontract_general', ), ('uncontract_spdf', 0), ('sort', ))
+_plan_demon2k = (('uncontract_spdf', 0), ('uncontract_general', ), ('sort', ))
+_plan_general = (('make_general', False), ('sort', ))
+_plan_general_spdf = (('make_general', True), ('sort', ))
 
 _writer_map = {
     'nwchem': {
@@ -65,211 +58,245 @@ _writer_map = {
         'extension': '.nw',
         'comment': '#',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_nwchem
+        'function': _writer('nwchem', 'write_nwchem'),
+        'normalize': _plan_spdf1
     },
     'gaussian94': {
         'display': 'Gaussian',
         'extension': '.gbs',
         'comment': '!',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_g94
+        'function': _writer('g94', 'write_g94'),
+        'normalize': _plan_uncontract
     },
     'gaussian94lib': {
         'display': 'Gaussian, system library',
         'extension': '.gbs',
         'comment': '!',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_g94lib
+        'function': _writer('g94', 'write_g94lib'),
+        'normalize': _plan_uncontract
     },
     'psi4': {
         'display': 'Psi4',
         'extension': '.gbs',
         'comment': '!',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_psi4
+        'function': _writer('g94', 'write_psi4'),
+        'normalize': _plan_uncontract
     },
     'molcas': {
         'display': 'Molcas',
         'extension': '.molcas',
         'comment': '*',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_molcas
+        'function': _writer('molcas', 'write_molcas'),
+        'normalize': _plan_general
     },
     'molcas_library': {
         'display': 'Molcas basis_library',
         'extension': '.molcas',
         'comment': '*',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_molcas_library
+        'function': _writer('molcas_library', 'write_molcas_library'),
+        'normalize': _plan_general
     },
     'qchem': {
         'display': 'Q-Chem',
         'extension': '.qchem',
         'comment': '!',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_qchem
+        'function': _writer('qchem', 'write_qchem'),
+        'normalize': _plan_uncontract
     },
     'orca': {
         'display': 'ORCA',
         'extension': '.orca',
         'comment': '!',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_orca
+        'function': _writer('orca', 'write_orca'),
+        'normalize': _plan_uncontract
     },
     'dalton': {
         'display': 'Dalton',
         'extension': '.dalton',
         'comment': '!',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_dalton
+        'function': _writer('dalton', 'write_dalton'),
+        'normalize': _plan_general
     },
     'qcschema': {
         'display': 'QCSchema',
         'extension': '.json',
         'comment': None,
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_qcschema
+        'function': _writer('qcschema', 'write_qcschema'),
+        'normalize': _plan_spdf1
     },
     'cp2k': {
         'display': 'CP2K',
         'extension': '.cp2k',
         'comment': '#',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_cp2k
+        'function': _writer('cp2k', 'write_cp2k'),
+        'normalize': _plan_sort
     },
     'pqs': {
         'display': 'PQS',
         'extension': '.pqs',
         'comment': '!',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_pqs
+        'function': _writer('pqs', 'write_pqs'),
+        'normalize': _plan_general_spdf
     },
     'demon2k': {
         'display': 'deMon2K',
         'extension': '.d2k',
         'comment': '#',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_demon2k
+        'function': _writer('demon2k', 'write_demon2k'),
+        'normalize': _plan_demon2k
     },
     'gamess_us': {
         'display': 'GAMESS US',
         'extension': '.bas',
         'comment': '!',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_gamess_us
+        'function': _writer('gamess_us', 'write_gamess_us'),
+        'normalize': _plan_uncontract
     },
     'turbomole': {
         'display': 'Turbomole',
         'extension': '.tm',
         'comment': '#',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_turbomole
+        'function': _writer('turbomole', 'write_turbomole'),
+        'normalize': _plan_uncontract_all
     },
     'gamess_uk': {
         'display': 'GAMESS UK',
         'extension': '.bas',
         'comment': '#',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_gamess_uk
+        'function': _writer('gamess_uk', 'write_gamess_uk'),
+        'normalize': _plan_uncontract
     },
     'molpro': {
         'display': 'Molpro',
         'extension': '.mpro',
         'comment': '!',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_molpro
+        'function': _writer('molpro', 'write_molpro'),
+        'normalize': _plan_general
     },
     'libmol': {
         'display': 'Molpro system library',
         'extension': '.libmol',
         'comment': '!',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_libmol
+        'function': _writer('libmol', 'write_libmol'),
+        'normalize': _plan_general
     },
     'cfour': {
         'display': 'CFOUR',
         'extension': '.c4bas',
         'comment': '!',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_cfour
+        'function': _writer('genbas', 'write_cfour'),
+        'normalize': _plan_general
     },
     'acesii': {
         'display': 'ACES II',
         'extension': '.acesii',
         'comment': '!',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_aces2
+        'function': _writer('genbas', 'write_aces2'),
+        'normalize': _plan_general
     },
     'xtron': {
         'display': 'xTron',
         'extension': '.gbs',
         'comment': '!',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_xtron
+        'function': _writer('g94', 'write_xtron'),
+        'normalize': _plan_uncontract
     },
     'bsedebug': {
         'display': 'BSE Debug',
         'extension': '.bse',
         'comment': '!',
         'valid': None,
-        'function': write_bsedebug
+        'function': _writer('bsedebug', 'write_bsedebug'),
+        'normalize': None
     },
     'json': {
         'display': 'JSON',
         'extension': '.json',
         'comment': None,
         'valid': None,
-        'function': write_json
+        'function': _writer('bsejson', 'write_json'),
+        'normalize': None
     },
     'bdf': {
         'display': 'BDF',
         'extension': '.bdf',
         'comment': '*',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_bdf
+        'function': _writer('bdf', 'write_bdf'),
+        'normalize': _plan_general
     },
     'ricdwrap': {
         'display': 'Wrapper for generating acCD auxiliary basis sets with OpenMolcas',
         'extension': '.ricdwrap',
         'comment': '*',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_ricdwrap
+        'function': _writer('ricdwrap', 'write_ricdwrap'),
+        'normalize': _plan_general
     },
     'fhiaims': {
         'display': 'FHI-aims',
         'extension': '.fhiaims',
         'comment': '#',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical'},
-        'function': write_fhiaims
+        'function': _writer('fhiaims', 'write_fhiaims'),
+        'normalize': _plan_uncontract_all
     },
     'jaguar': {
         'display': 'Jaguar',
         'extension': '.jaguar',
         'comment': '#',
         'valid': {'gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp'},
-        'function': write_jaguar
+        'function': _writer('jaguar', 'write_jaguar'),
+        'normalize': _plan_uncontract
     },
     'crystal': {
         'display': 'Crystal',
         'extension': '.crystal',
         'comment': '*',
         'valid': set(['gto', 'gto_cartesian', 'gto_spherical', 'scalar_ecp']),
-        'function': write_crystal
+        'function': _writer('crystal', 'write_crystal'),
+        'normalize': _plan_uncontract
     },
     'veloxchem': {
         'display': 'VeloxChem',
         'extension': '.vlx',
         'comment': '!',
         'valid': {'gto', 'gto_spherical'},
-        'function': write_veloxchem
+        'function': _writer('veloxchem', 'write_veloxchem'),
+        'normalize': _plan_uncontract_all
     }
 }
 
 
-def write_formatted_basis_str(basis_dict, fmt, header=None):
+def write_formatted_basis_str(basis_dict, fmt, header=None, normalized=False):
     '''
     Returns the basis set data as a string representing
     the data in the specified output format
+
+    Before writing, the basis set is transformed into the form needed
+    by the format (see :func:`get_writer_plan`). The input basis set is not
+    modified. If normalized is True, the basis set must already have been
+    transformed with that plan, and it is written as is.
     '''
 
     # make writers case insensitive
@@ -285,6 +312,9 @@ def write_formatted_basis_str(basis_dict, fmt, header=None):
         if not ftypes <= writer['valid']:
             raise RuntimeError('Converter {} does not support all function types: {}'.format(fmt, str(ftypes)))
 
+    if not normalized and writer['normalize']:
+        basis_dict = transform.apply_plan(basis_dict, writer['normalize'], use_copy=True)
+
     # Actually do the conversion
     ret_str = writer['function'](basis_dict)
 
@@ -359,6 +389,20 @@ def get_writer_formats(function_types=None):
     return ret
 
 
+def get_writer_plan(fmt):
+    '''
+    Returns the transformation plan for the basis set that a format needs before writing
+
+    See :mod:`basis_set_exchange.transform`
+    '''
+
+    fmt = fmt.lower()
+    if fmt not in _writer_map:
+        raise RuntimeError('Unknown basis set format "{}"'.format(fmt))
+
+    return list(_writer_map[fmt]['normalize'] or [])
+
+
 def get_format_extension(fmt):
     '''
     Returns the recommended extension for a given format
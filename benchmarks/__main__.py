@@ -0,0 +1,96 @@
+# Copyright (c) 2017-2022 The Molecular Sciences Software Institute, Virginia Tech
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived
+# from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Command line interface of the benchmarks (``python -m benchmarks``)
+'''
+
+import argparse
+import sys
+
+from . import runner
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Measure the time and peak memory of the hot paths of the '
+                                     'basis set exchange library, and compare them against a saved baseline')
+    parser.add_argument('patterns', nargs='*', help='Only run cases matching these shell-style patterns')
+    parser.add_argument('--list', action='store_true', help='List the selected cases and exit')
+    parser.add_argument('--slow', action='store_true', help='Also run the slow cases (using the full data directory)')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of timed runs of each case (default 5)')
+    parser.add_argument('--save', metavar='FILE', help='Save the results to this JSON file')
+    parser.add_argument('--compare', metavar='FILE', help='Compare the results against this saved baseline')
+    parser.add_argument('--time-tolerance',
+                        type=float,
+                        default=0.25,
+                        help='Relative increase of the time reported as a regression (default 0.25)')
+    parser.add_argument('--memory-tolerance',
+                        type=float,
+                        default=0.10,
+                        help='Relative increase of the peak memory reported as a regression (default 0.10)')
+    args = parser.parse_args(argv)
+
+    names = runner.select_cases(args.patterns, slow=args.slow)
+    if args.list:
+        print('\n'.join(names))
+        return 0
+    if not names:
+        print('No benchmark cases selected', file=sys.stderr)
+        return 1
+
+    baseline = runner.load_results(args.compare) if args.compare else None
+
+    def report(name, res):
+        base = baseline['results'].get(name) if baseline else None
+        print(runner.format_result(name, res, base), flush=True)
+
+    print(runner.format_header())
+    results = runner.run_cases(names, repeat=args.repeat, callback=report)
+
+    if args.save:
+        runner.save_results(args.save, results)
+
+    if baseline is None:
+        return 0
+
+    regressions = runner.find_regressions(results, baseline, args.time_tolerance, args.memory_tolerance)
+    if not regressions:
+        print('\nNo regressions against {}'.format(args.compare))
+        return 0
+
+    print('\nRegressions against {}:'.format(args.compare))
+    for name, quantity, old, new in regressions:
+        print('    {:40} {:12} {:14.6g} -> {:14.6g} (x{:.2f})'.format(name, quantity, old, new, new / old))
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
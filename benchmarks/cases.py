@@ -0,0 +1,284 @@
+# Copyright (c) 2017-2022 The Molecular Sciences Software Institute, Virginia Tech
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived
+# from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Benchmark cases
+
+Each case is registered with a setup function. The setup function does all
+the preparation that should not be measured, and returns the function
+(called without arguments) that is measured.
+'''
+
+import bz2
+import os
+import tempfile
+
+import basis_set_exchange as bse
+from basis_set_exchange import api, bundle, compose, fileio, manip, memo, readers, validator, writers
+
+
+class SkipCase(Exception):
+    '''Raised by the setup function of a case whose input is not available'''
+
+
+# Name of the case -> {'setup': setup function, 'slow': bool}
+# Slow cases are only run when requested
+benchmark_cases = {}
+
+# Basis set (and elements) used for the get_basis, writer and reader cases
+_basis_name = 'def2-TZVP'
+_basis_elements = '1-36'
+
+# Small data directory shipped with the tests
+_fake_data_dir = os.path.join(os.path.dirname(bse.__file__), 'tests', 'fakedata')
+
+# Manipulations of get_basis that are benchmarked (name -> keyword arguments)
+_get_basis_flags = {
+    'none': {},
+    'uncontract_general': {'uncontract_general': True},
+    'uncontract_spdf': {'uncontract_spdf': True},
+    'uncontract_segmented': {'uncontract_segmented': True},
+    'remove_free_primitives': {'remove_free_primitives': True},
+    'make_general': {'make_general': True},
+    'optimize_general': {'optimize_general': True},
+    'augment_diffuse': {'augment_diffuse': 1},
+    'augment_steep': {'augment_steep': 1},
+    'get_aux_autoaux': {'get_aux': 'autoaux'},
+    'get_aux_autoabs': {'get_aux': 'autoabs'},
+}
+
+# Heavily (generally) contracted basis set, whose uncontraction creates many
+# duplicate primitives to be pruned
+_ano_basis_name = 'ANO-RCC'
+
+# Uncontractions of the ANO basis set that are benchmarked (name -> keyword arguments)
+_ano_flags = {
+    'uncontract_general': {'uncontract_general': True},
+    'uncontract_segmented': {'uncontract_segmented': True},
+    'uncontract_all': {'uncontract_general': True, 'uncontract_spdf': True, 'uncontract_segmented': True},
+}
+
+# Readers whose input is not written by the writer of the same name
+_reader_sources = {
+    'molcas': 'molcas_library',
+    'genbas': 'cfour',
+}
+
+# Readers for which no writer produces input, and which read a file of the
+# reader tests instead
+_reader_test_files = {
+    'gbasis': 'aug-cc-pvtz.good.1.gbasis.bz2',
+}
+
+# Size presets of the Cholesky auxiliary basis generator
+_cholesky_sizes = ('small', 'large', 'verylarge')
+
+
+def _add_case(name, setup, slow=False):
+    benchmark_cases[name] = {'setup': setup, 'slow': slow}
+
+
+def _table_relpath(name):
+    '''Path (relative to the data directory) of the table file of the latest version of a basis set'''
+    bs_data, version = api._get_basis_version(name, None, api.get_data_dir())
+    return bs_data['versions'][version]['file_relpath']
+
+
+def _setup_compose_cold():
+    relpath = _table_relpath(_basis_name)
+    data_dir = api.get_data_dir()
+
+    def run():
+        memo.memoize_enabled = False
+        try:
+            compose.compose_table_basis(relpath, data_dir)
+        finally:
+            memo.memoize_enabled = True
+
+    return run
+
+
+def _setup_compose_warm():
+    relpath = _table_relpath(_basis_name)
+    data_dir = api.get_data_dir()
+    compose.compose_table_basis(relpath, data_dir)
+    return lambda: compose.compose_table_basis(relpath, data_dir)
+
+
+def _get_basis_setup(kwargs):
+
+    def setup():
+        api.get_basis(_basis_name, elements=_basis_elements)
+        return lambda: api.get_basis(_basis_name, elements=_basis_elements, **kwargs)
+
+    return setup
+
+
+def _ano_setup(kwargs):
+
+    def setup():
+        api.get_basis(_ano_basis_name)
+        return lambda: api.get_basis(_ano_basis_name, **kwargs)
+
+    return setup
+
+
+def _ano_prune_setup():
+    # Uncontracting the general contractions without pruning leaves every
+    # primitive duplicated in each of the general contractions
+    basis = api.get_basis(_ano_basis_name)
+    for el in basis['elements'].values():
+        if 'electron_shells' in el:
+            el['electron_shells'] = manip._uncontract_general_shells(el['electron_shells'])
+    return lambda: manip.prune_basis(basis)
+
+
+def _writer_setup(fmt):
+
+    def setup():
+        basis = api.get_basis(_basis_name, elements=_basis_elements)
+        return lambda: writers.write_formatted_basis_str(basis, fmt)
+
+    return setup
+
+
+def _reader_setup(fmt):
+
+    def setup():
+        source = _reader_sources.get(fmt, fmt)
+        if fmt in _reader_test_files:
+            test_file = os.path.join(os.path.dirname(bse.__file__), 'tests', 'reader_test_data', fmt,
+                                     _reader_test_files[fmt])
+            with bz2.open(test_file, 'rt') as f:
+                basis_str = f.read()
+        elif source in writers.get_writer_formats():
+            basis_str = api.get_basis(_basis_name, elements=_basis_elements, fmt=source)
+        else:
+            raise SkipCase('No writer or test file provides input for reader {}'.format(fmt))
+
+        # Make sure the input is actually readable before measuring
+        try:
+            readers.read_formatted_basis_str(basis_str, fmt)
+        except Exception as e:
+            raise SkipCase('Reader {} cannot read the output of writer {}: {}'.format(fmt, source, e))
+        return lambda: readers.read_formatted_basis_str(basis_str, fmt)
+
+    return setup
+
+
+def _bundle_setup(fmt, archive_type, data_dir):
+
+    def setup():
+        outfile = os.path.join(tempfile.gettempdir(),
+                               'bse_benchmark_{}{}'.format(os.getpid(), bundle.get_archive_types()[archive_type]['extension']))
+
+        def run():
+            try:
+                bundle.create_bundle(outfile, fmt, 'bib', archive_type, data_dir)
+            finally:
+                if os.path.exists(outfile):
+                    os.remove(outfile)
+
+        return run
+
+    return setup
+
+
+def _validate_basis_setup():
+    '''Validates all the files (table, element and component) making up the benchmark basis set'''
+
+    data_dir = api.get_data_dir()
+    table_relpath = _table_relpath(_basis_name)
+    table_data = fileio.read_json_basis(os.path.join(data_dir, table_relpath))
+
+    element_relpaths = sorted(set(table_data['elements'].values()))
+    component_relpaths = set()
+    for relpath in element_relpaths:
+        element_data = fileio.read_json_basis(os.path.join(data_dir, relpath))
+        for el in element_data['elements'].values():
+            component_relpaths.update(el['components'])
+
+    files = [('table', table_relpath)]
+    files.extend(('element', x) for x in element_relpaths)
+    files.extend(('component', x) for x in sorted(component_relpaths))
+
+    def run():
+        for file_type, relpath in files:
+            validator.validate_file(file_type, os.path.join(data_dir, relpath))
+
+    return run
+
+
+def _cholesky_setup(size):
+
+    def setup():
+        # Imported here since auxgen needs numpy
+        from basis_set_exchange.auxgen import cache
+        from basis_set_exchange.auxgen.auxgen import cholesky_aux_basis
+        basis = api.get_basis('cc-pVTZ', elements=[1, 6, 8])
+
+        def run():
+            # Measure the generation itself, not the cache lookups
+            cache.cache_enabled = False
+            try:
+                cholesky_aux_basis(basis, size)
+            finally:
+                cache.cache_enabled = True
+
+        return run
+
+    return setup
+
+
+_add_case('compose_table_basis.cold', _setup_compose_cold)
+_add_case('compose_table_basis.warm', _setup_compose_warm)
+
+for _flag, _kwargs in _get_basis_flags.items():
+    _add_case('get_basis.' + _flag, _get_basis_setup(_kwargs))
+
+for _flag, _kwargs in _ano_flags.items():
+    _add_case('get_basis.ano.' + _flag, _ano_setup(_kwargs))
+_add_case('prune_basis.ano', _ano_prune_setup)
+
+for _fmt in writers.get_writer_formats():
+    _add_case('write.' + _fmt, _writer_setup(_fmt))
+
+for _fmt in readers.get_reader_formats():
+    _add_case('read.' + _fmt, _reader_setup(_fmt))
+
+for _archive_type in bundle.get_archive_types():
+    _add_case('create_bundle.fake.' + _archive_type, _bundle_setup('nwchem', _archive_type, _fake_data_dir))
+    _add_case('create_bundle.full.' + _archive_type, _bundle_setup('nwchem', _archive_type, None), slow=True)
+
+_add_case('validate_file.basis', _validate_basis_setup)
+_add_case('validate_data_dir.full', lambda: lambda: validator.validate_data_dir(api.get_data_dir()), slow=True)
+
+for _size in _cholesky_sizes:
+    _add_case('cholesky_aux_basis.' + _size, _cholesky_setup(_size))
@@ -0,0 +1,212 @@
+# Copyright (c) 2017-2022 The Molecular Sciences Software Institute, Virginia Tech
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived
+# from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+'''
+Running benchmark cases, and saving and comparing their results
+'''
+
+import datetime
+import fnmatch
+import gc
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+
+import basis_set_exchange as bse
+from .cases import SkipCase, benchmark_cases
+
+# Version of the format of the results files
+_results_version = 1
+
+
+def select_cases(patterns=None, slow=False):
+    '''Names of the benchmark cases to run
+
+    Parameters
+    ----------
+    patterns : list of str
+        Shell-style patterns (such as ``'write.*'``). If given, only cases
+        matching at least one of them are selected
+    slow : bool
+        Whether to also select the slow cases
+    '''
+
+    names = [name for name, case in benchmark_cases.items() if slow or not case['slow']]
+    if patterns:
+        names = [name for name in names if any(fnmatch.fnmatchcase(name, p) for p in patterns)]
+    return names
+
+
+def measure(name, repeat=5):
+    '''Measure the time and peak memory of a benchmark case
+
+    The case is run once without measuring (so that imports and lazy loading
+    are not counted), then `repeat` times to measure the time, and once more
+    with :mod:`tracemalloc` to measure the peak memory allocated while
+    running it. Slow cases are run once for the time and once for the
+    memory.
+
+    Returns
+    -------
+    dict
+        The minimum and median time (in seconds), the number of timed runs,
+        and the peak memory (in bytes). If the case cannot be set up because
+        its input is not available, the dictionary only contains the reason
+        under ``'skipped'``.
+    '''
+
+    case = benchmark_cases[name]
+    try:
+        run = case['setup']()
+    except SkipCase as e:
+        return {'skipped': str(e)}
+
+    if case['slow']:
+        repeat = 1
+    else:
+        run()
+
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'time': min(times), 'time_median': statistics.median(times), 'repeat': repeat, 'peak_memory': peak}
+
+
+def run_cases(names, repeat=5, callback=None):
+    '''Measure several benchmark cases (see :func:`measure`)
+
+    Exceptions raised by a case are recorded under ``'error'`` in its result
+    rather than stopping the run. If given, `callback` is called with the
+    name and result of each case as it finishes.
+
+    Returns
+    -------
+    dict
+        Results file contents, with the results under ``'results'``
+    '''
+
+    results = {}
+    for name in names:
+        try:
+            res = measure(name, repeat)
+        except Exception as e:
+            res = {'error': '{}: {}'.format(type(e).__name__, e)}
+        results[name] = res
+        if callback is not None:
+            callback(name, res)
+
+    metadata = {
+        'bse_version': bse.version(),
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+    }
+    return {'results_version': _results_version, 'metadata': metadata, 'results': results}
+
+
+def save_results(path, results):
+    '''Write results (as returned by :func:`run_cases`) to a JSON file'''
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load_results(path):
+    '''Read results saved with :func:`save_results`'''
+    with open(path, 'r', encoding='utf-8') as f:
+        results = json.load(f)
+    if results.get('results_version') != _results_version:
+        raise RuntimeError('Benchmark results in {} have version {}, expected {}'.format(
+            path, results.get('results_version'), _results_version))
+    return results
+
+
+def find_regressions(results, baseline, time_tolerance=0.25, memory_tolerance=0.10):
+    '''Compare results against a baseline
+
+    A case has regressed if its minimum time is larger than the baseline by
+    more than the fraction `time_tolerance`, or its peak memory by more than
+    `memory_tolerance`. Cases missing from either set of results, or that
+    were skipped or failed in either, are not compared.
+
+    Returns
+    -------
+    list of tuple
+        ``(name, quantity, baseline value, new value)`` of each regression,
+        where ``quantity`` is ``'time'`` or ``'peak_memory'``
+    '''
+
+    tolerances = {'time': time_tolerance, 'peak_memory': memory_tolerance}
+    regressions = []
+    for name, res in results['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        for quantity, tol in tolerances.items():
+            if quantity not in res or quantity not in base:
+                continue
+            if res[quantity] > base[quantity] * (1.0 + tol):
+                regressions.append((name, quantity, base[quantity], res[quantity]))
+    return regressions
+
+
+def format_result(name, res, base=None):
+    '''One line describing the result of a case, and its ratio to a baseline result'''
+
+    if 'skipped' in res:
+        return '{:40} skipped: {}'.format(name, res['skipped'])
+    if 'error' in res:
+        return '{:40} ERROR: {}'.format(name, res['error'])
+
+    s = '{:40} {:12.3f} ms {:12.3f} ms {:10.2f} MiB'.format(name, 1000 * res['time'], 1000 * res['time_median'],
+                                                           res['peak_memory'] / 1024**2)
+    if base is not None and 'time' in base:
+        s += '   x{:.2f} time  x{:.2f} memory'.format(res['time'] / base['time'],
+                                                     res['peak_memory'] / max(base['peak_memory'], 1))
+    return s
+
+
+def format_header():
+    '''Column headings matching :func:`format_result`'''
+    return '{:40} {:>15} {:>15} {:>14}'.format('case', 'min time', 'median time', 'peak memory')